@@ -0,0 +1,130 @@
+"""Benchmark system hydration against a local mock server."""
+
+import asyncio
+import json
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Any
+
+from aiohttp import ClientSession, web
+from aresponses import ResponsesMockServer
+
+from simplipy import API
+
+_LOGGER = logging.getLogger()
+
+FIXTURES_PATH = Path(__file__).parent.parent / "tests" / "fixtures"
+SIMULATED_LATENCY = 0.05
+SYSTEM_COUNTS = (1, 5, 10, 25)
+
+
+def load_fixture(filename: str) -> Any:
+    """Load a JSON fixture from the test suite.
+
+    Args:
+        filename: The filename of the fixture to load.
+
+    Returns:
+        The parsed fixture.
+    """
+    return json.loads((FIXTURES_PATH / filename).read_text(encoding="utf-8"))
+
+
+def delayed_json_response(payload: Any) -> Any:
+    """Return an aresponses handler that responds after a simulated latency.
+
+    Args:
+        payload: The JSON payload to respond with.
+
+    Returns:
+        An aresponses handler.
+    """
+
+    async def handler(_: web.Request) -> web.Response:
+        """Respond after a delay.
+
+        Returns:
+            A JSON response.
+        """
+        await asyncio.sleep(SIMULATED_LATENCY)
+        return web.json_response(payload)
+
+    return handler
+
+
+async def async_time_get_systems(system_count: int, max_concurrency: int) -> float:
+    """Time how long it takes to hydrate a number of systems.
+
+    Args:
+        system_count: The number of systems on the mocked account.
+        max_concurrency: The maximum number of systems to update at once.
+
+    Returns:
+        The elapsed time (in seconds).
+    """
+    subscriptions_response = load_fixture("subscriptions_response.json")
+    subscription = subscriptions_response["subscriptions"][0]
+    subscriptions_response["subscriptions"] = [
+        {**subscription, "sid": sid} for sid in range(1, system_count + 1)
+    ]
+    auth_check_response = load_fixture("auth_check_response.json")
+
+    async with ResponsesMockServer() as server:
+        server.add(
+            "auth.simplisafe.com",
+            "/oauth/token",
+            "post",
+            response=web.json_response(load_fixture("api_token_response.json")),
+        )
+        server.add(
+            "api.simplisafe.com",
+            "/v1/api/authCheck",
+            "get",
+            response=web.json_response(auth_check_response),
+        )
+        server.add(
+            "api.simplisafe.com",
+            f"/v1/users/{auth_check_response['userId']}/subscriptions",
+            "get",
+            response=delayed_json_response(subscriptions_response),
+        )
+        server.add(
+            "api.simplisafe.com",
+            re.compile(r"/v1/ss3/subscriptions/\d+/settings/normal"),
+            "get",
+            response=delayed_json_response(load_fixture("v3_settings_response.json")),
+            repeat=system_count,
+        )
+        server.add(
+            "api.simplisafe.com",
+            re.compile(r"/v1/ss3/subscriptions/\d+/sensors"),
+            "get",
+            response=delayed_json_response(load_fixture("v3_sensors_response.json")),
+            repeat=system_count,
+        )
+
+        async with ClientSession() as session:
+            simplisafe = await API.async_from_auth("code", "verifier", session=session)
+            start = time.perf_counter()
+            await simplisafe.async_get_systems(max_concurrency=max_concurrency)
+            return time.perf_counter() - start
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    logging.basicConfig(level=logging.INFO)
+
+    for system_count in SYSTEM_COUNTS:
+        sequential = await async_time_get_systems(system_count, 1)
+        concurrent = await async_time_get_systems(system_count, system_count)
+        _LOGGER.info(
+            "%s systems: sequential %.3fs, concurrent %.3fs",
+            system_count,
+            sequential,
+            concurrent,
+        )
+
+
+asyncio.run(main())
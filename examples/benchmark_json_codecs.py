@@ -0,0 +1,44 @@
+"""Benchmark the available JSON codecs against the test fixtures."""
+
+import logging
+import timeit
+from functools import partial
+from pathlib import Path
+
+from simplipy.util.codec import get_codec
+
+_LOGGER = logging.getLogger()
+
+CODEC_NAMES = ("json", "msgspec", "orjson")
+FIXTURES_PATH = Path(__file__).parent.parent / "tests" / "fixtures"
+ITERATIONS = 2000
+
+
+def main() -> None:
+    """Run the benchmark."""
+    logging.basicConfig(level=logging.INFO)
+
+    codecs = []
+    for name in CODEC_NAMES:
+        try:
+            codecs.append(get_codec(name))
+        except ValueError:
+            _LOGGER.info("Skipping %s (not installed)", name)
+
+    for fixture in sorted(FIXTURES_PATH.glob("*.json")):
+        raw = fixture.read_bytes()
+        for codec in codecs:
+            data = codec.loads(raw)
+            loads = timeit.timeit(partial(codec.loads, raw), number=ITERATIONS)
+            dumps = timeit.timeit(partial(codec.dumps, data), number=ITERATIONS)
+            _LOGGER.info(
+                "%s (%s bytes) %s: loads %.1fµs, dumps %.1fµs",
+                fixture.name,
+                len(raw),
+                codec.name,
+                loads / ITERATIONS * 1e6,
+                dumps / ITERATIONS * 1e6,
+            )
+
+
+main()
@@ -0,0 +1,89 @@
+"""Benchmark property access and as_dict() with and without typed decoding."""
+
+import asyncio
+import copy
+import json
+import logging
+import timeit
+from pathlib import Path
+from typing import Any, cast
+
+from aiohttp import ClientSession
+
+from simplipy import API
+from simplipy.device.sensor.v3 import SensorV3
+from simplipy.system.v3 import SystemV3
+
+_LOGGER = logging.getLogger()
+
+FIXTURES_PATH = Path(__file__).parent.parent / "tests" / "fixtures"
+ITERATIONS = 200
+SENSOR_COUNT = 200
+
+
+def load_fixture(filename: str) -> Any:
+    """Load a JSON fixture from the test suite.
+
+    Args:
+        filename: The filename of the fixture to load.
+
+    Returns:
+        The parsed fixture.
+    """
+    return json.loads((FIXTURES_PATH / filename).read_text(encoding="utf-8"))
+
+
+def read_properties(system: SystemV3) -> None:
+    """Read a representative set of system and device properties.
+
+    Args:
+        system: The system to read.
+    """
+    _ = (system.temperature, system.wifi_strength, system.alarm_volume)
+    for sensor in cast(dict[str, SensorV3], system.sensors).values():
+        _ = (sensor.name, sensor.low_battery, sensor.offline, sensor.triggered)
+    for lock in system.locks.values():
+        _ = (lock.state, lock.disabled)
+
+
+async def main() -> None:
+    """Run the benchmark."""
+    logging.basicConfig(level=logging.INFO)
+    # The fixtures include devices that the library logs errors about:
+    logging.getLogger("simplipy").setLevel(logging.CRITICAL)
+
+    subscriptions_response = load_fixture("subscriptions_response.json")
+    sensors = load_fixture("v3_sensors_response.json")["sensors"]
+
+    async with ClientSession() as session:
+        simplisafe = API(session=session)
+        simplisafe.subscription_data = {
+            subscription["sid"]: subscription
+            for subscription in subscriptions_response["subscriptions"]
+        }
+        system = SystemV3(simplisafe, subscriptions_response["subscriptions"][0]["sid"])
+        system.settings_data = load_fixture("v3_settings_response.json")
+        system.sensor_data = {}
+        for idx in range(SENSOR_COUNT):
+            sensor = copy.deepcopy(sensors[idx % len(sensors)])
+            sensor["serial"] = f"{sensor['serial']}-{idx}"
+            system.sensor_data[sensor["serial"]] = sensor
+
+        for typed_decoding in (False, True):
+            simplisafe.typed_decoding = typed_decoding
+
+            hydrate = timeit.timeit(system.generate_device_objects, number=ITERATIONS)
+            access = timeit.timeit(lambda: read_properties(system), number=ITERATIONS)
+            as_dict = timeit.timeit(system.as_dict, number=ITERATIONS)
+            _LOGGER.info(
+                "%s sensors, typed decoding %s: hydrate %.1fµs, properties %.1fµs, "
+                "as_dict %.1fµs",
+                SENSOR_COUNT,
+                "on" if typed_decoding else "off",
+                hydrate / ITERATIONS * 1e6,
+                access / ITERATIONS * 1e6,
+                as_dict / ITERATIONS * 1e6,
+            )
+
+
+asyncio.run(main())
@@ -3,14 +3,15 @@
 from __future__ import annotations
 
 import asyncio
-import sys
-from collections.abc import Awaitable, Callable
+import random
+from collections.abc import Awaitable, Callable, Hashable
+from contextlib import nullcontext
+from dataclasses import replace
 from datetime import datetime
-from json.decoder import JSONDecodeError
+from time import monotonic
 from typing import Any, cast
 
-import backoff
-from aiohttp import ClientSession
+from aiohttp import ClientSession, ClientTimeout
 from aiohttp.client_exceptions import ClientResponseError
 
 from simplipy.const import DEFAULT_USER_AGENT, LOGGER
@@ -18,30 +19,64 @@ from simplipy.errors import (
     InvalidCredentialsError,
     RequestError,
     SimplipyError,
+    WebsocketError,
     raise_on_data_error,
 )
 from simplipy.system.v2 import SystemV2
 from simplipy.system.v3 import SystemV3
-from simplipy.util import execute_callback
 from simplipy.util.auth import (
     AUTH_URL_BASE,
     AUTH_URL_HOSTNAME,
     DEFAULT_CLIENT_ID,
     DEFAULT_REDIRECT_URI,
 )
+from simplipy.util.cache import ResponseCache
+from simplipy.util.callbacks import CallbackExecutor
+from simplipy.util.changes import ChangeTracker
+from simplipy.util.circuit_breaker import CircuitBreaker
+from simplipy.util.coalesce import RequestCoalescer, get_request_key
+from simplipy.util.codec import JsonCodec, get_codec
 from simplipy.util.dt import utcnow
+from simplipy.util.endpoint import (
+    ENDPOINT_FAMILY_MEDIA,
+    get_endpoint_family,
+    get_system_id,
+)
+from simplipy.util.index import DeviceIndex
+from simplipy.util.rate_limit import RateLimiter
+from simplipy.util.retry import (
+    DEFAULT_MEDIA_RETRY_CODES,
+    RetryPolicy,
+    async_run_with_retries,
+    async_run_with_timeout,
+    is_fatal_error,
+)
+from simplipy.util.scheduler import (
+    RequestPriority,
+    RequestScheduler,
+    get_request_priority,
+    request_priority,
+)
+from simplipy.util.updates import SystemUpdatesMixin
 from simplipy.websocket import WebsocketClient
 
 API_URL_HOSTNAME = "api.simplisafe.com"
 API_URL_BASE = f"https://{API_URL_HOSTNAME}/v1"
 
 DEFAULT_REQUEST_RETRIES = 4
+DEFAULT_SUBSCRIPTION_MAX_AGE = 0
+DEFAULT_SYSTEM_UPDATE_CONCURRENCY = 5
 DEFAULT_MEDIA_RETRIES = 4
 DEFAULT_TIMEOUT = 10
 DEFAULT_TOKEN_EXPIRATION_WINDOW = 5
+DEFAULT_TOKEN_REFRESH_JITTER = 30
+DEFAULT_TOKEN_REFRESH_LEAD_TIME = 60
 
+# Media files can be large, so a media attempt limits connecting and each read only:
+DEFAULT_MEDIA_TIMEOUT = ClientTimeout(connect=DEFAULT_TIMEOUT, sock_read=30)
 
-class API:  # pylint: disable=too-many-instance-attributes
+
+class API(SystemUpdatesMixin):  # pylint: disable=too-many-instance-attributes
     """An API object to interact with the SimpliSafe cloud.
 
     Note that this class shouldn't be instantiated directly; instead, the
@@ -51,58 +86,166 @@ class API:  # pylint: disable=too-many-instance-attributes
     Args:
         session: session: An optional ``aiohttp`` ``ClientSession``.
         request_retries: The default number of request retries to use.
-        media_retries: The default number of request retries to use to
-            fetch media files.
+        media_retries: The default number of retries to use to fetch media files.
+        json_codec: The JSON codec to use for REST and websocket payloads.
     """
 
+    is_fatal_error = staticmethod(is_fatal_error)
+
     def __init__(
         self,
         *,
         request_retries: int = DEFAULT_REQUEST_RETRIES,
         media_retries: int = DEFAULT_MEDIA_RETRIES,
         session: ClientSession,
+        json_codec: JsonCodec | None = None,
     ) -> None:
         """Initialize.
 
         Args:
             session: An optional ``aiohttp`` ``ClientSession``.
             request_retries: The default number of request retries to use.
+            media_retries: The default number of retries to use to fetch media files.
+            json_codec: The JSON codec to use for REST and websocket payloads
+                (defaults to the fastest one installed).
         """
         self._refresh_token_callbacks: list[
             Callable[[str], Awaitable[None] | None]
         ] = []
-        self._request_retries = request_retries
-        self._media_retries = media_retries
+        self.callback_executor = CallbackExecutor()
+        self.json_codec = json_codec or get_codec()
         self.session: ClientSession = session
 
         # These will get filled in after initial authentication:
         self._backoff_refresh_lock = asyncio.Lock()
+        self._token_expires_at: float | None = None
         self._token_last_refreshed: datetime | None = None
+        self._token_refresh_task: asyncio.Task[None] | None = None
+        self._token_refresh_timer: asyncio.TimerHandle | None = None
         self.access_token: str | None = None
         self.refresh_token: str | None = None
-        self.subscription_data: dict[int, Any] = {}
+        self._subscription_data: dict[int, Any] = {}
+        self._systems: dict[int, SystemV2 | SystemV3] = {}
+        self.subscription_data_dt: datetime | None = None
+        self.subscription_epoch = 0
+        self.subscription_max_age: float = DEFAULT_SUBSCRIPTION_MAX_AGE
+        self.system_errors: dict[int, BaseException] = {}
         self.user_id: int | None = None
         self.websocket: WebsocketClient | None = None
 
-        self.async_request = self._wrap_request_method(
-            request_retries=self._request_retries,
-            retry_codes=[401, 409],
-            request_func=self._async_api_request,
-        )
-        self._async_media_data = self._wrap_request_method(
-            request_retries=self._media_retries,
-            retry_codes=[401, 404, 409],
-            request_func=self._async_media_request,
+        # Opt-in features are turned on by assigning the corresponding utility (and
+        # turned off again by assigning None):
+        self.change_tracker: ChangeTracker | None = None
+        self.circuit_breaker: CircuitBreaker | None = None
+        self.device_index = DeviceIndex()
+        self.rate_limiter: RateLimiter | None = None
+        self.request_coalescer: RequestCoalescer[dict[str, Any]] = RequestCoalescer()
+        self.request_scheduler: RequestScheduler | None = None
+        self.response_cache: ResponseCache | None = None
+
+        self._proactive_token_refresh = False
+        self._retries_enabled = True
+        self._typed_decoding = False
+        self._retry_policy = RetryPolicy(max_tries=request_retries)
+        self._media_retry_policy = RetryPolicy(
+            max_tries=media_retries, retry_codes=DEFAULT_MEDIA_RETRY_CODES
         )
 
+    @property
+    def subscription_data(self) -> dict[int, Any]:
+        """Return the latest subscription data (keyed by subscription ID).
+
+        Every time new subscription data is stored, ``subscription_epoch`` is
+        incremented and ``subscription_data_dt`` is set to when the data was fetched
+        (which, for a cached response, can be a while ago); this allows systems to tell
+        whether they have already seen a particular snapshot, and how recent it is. If
+        ``subscription_max_age`` is set, a snapshot younger than that (in seconds) is
+        reused by system updates rather than fetched again; any write request resets
+        ``subscription_data_dt`` (since the write may have changed the snapshot).
+
+        Returns:
+            A dictionary of subscription ID to subscription data.
+        """
+        return self._subscription_data
+
+    @subscription_data.setter
+    def subscription_data(self, value: dict[int, Any]) -> None:
+        """Store new subscription data.
+
+        Args:
+            value: A dictionary of subscription ID to subscription data.
+        """
+        self._subscription_data = value
+        self.subscription_data_dt = utcnow()
+        self.subscription_epoch += 1
+
+    @property
+    def systems(self) -> dict[int, SystemV2 | SystemV3]:
+        """Return the systems returned by the latest ``async_get_systems`` call.
+
+        Returns:
+            A dictionary of system IDs to System objects.
+        """
+        return self._systems
+
+    @property
+    def proactive_token_refresh(self) -> bool:
+        """Return whether the access token is refreshed shortly before it expires.
+
+        This is off by default. Turning it on schedules a refresh of the current
+        access token right away; turning it off cancels any scheduled refresh.
+
+        Returns:
+            Whether proactive token refreshes are enabled.
+        """
+        return self._proactive_token_refresh
+
+    @proactive_token_refresh.setter
+    def proactive_token_refresh(self, enabled: bool) -> None:
+        """Turn proactive token refreshes on or off.
+
+        Args:
+            enabled: Whether proactive token refreshes should be enabled.
+        """
+        self._proactive_token_refresh = enabled
+        if not enabled:
+            self._cancel_token_refresh_timer()
+        elif self._token_expires_at is not None and not self._token_refresh_timer:
+            self._schedule_token_refresh(self._token_expires_at - monotonic())
+
+    @property
+    def typed_decoding(self) -> bool:
+        """Return whether system and device payloads are decoded into typed records.
+
+        When enabled, the payloads of each system (and its sensors and locks) are
+        decoded once per update into ``__slots__`` records that properties read;
+        changing this decodes (or drops) every known system's records right away.
+
+        Returns:
+            Whether typed decoding is enabled.
+        """
+        return self._typed_decoding
+
+    @typed_decoding.setter
+    def typed_decoding(self, enabled: bool) -> None:
+        """Turn typed decoding on or off for this and every known system.
+
+        Args:
+            enabled: Whether typed decoding should be enabled.
+        """
+        self._typed_decoding = enabled
+        for system in self._systems.values():
+            system._update_records()  # pylint: disable=protected-access
+
     @classmethod
-    async def async_from_auth(
+    async def async_from_auth(  # pylint: disable=too-many-arguments
         cls,
         authorization_code: str,
         code_verifier: str,
         *,
         request_retries: int = DEFAULT_REQUEST_RETRIES,
         session: ClientSession,
+        json_codec: JsonCodec | None = None,
     ) -> API:
         """Get an authenticated API object from an Authorization Code and Code Verifier.
 
@@ -111,6 +254,8 @@ class API:  # pylint: disable=too-many-instance-attributes
             code_verifier: The Code Verifier.
             request_retries: The default number of request retries to use.
             session: An optional ``aiohttp`` ``ClientSession``.
+            json_codec: The JSON codec to use for REST and websocket payloads
+                (defaults to the fastest one installed).
 
         Returns:
             An authenticated API object.
@@ -120,7 +265,9 @@ class API:  # pylint: disable=too-many-instance-attributes
             RequestError: Raised on general HTTP error.
             SimplipyError: Raised on an unknown error.
         """
-        api = cls(session=session, request_retries=request_retries)
+        api = cls(
+            session=session, request_retries=request_retries, json_codec=json_codec
+        )
 
         try:
             token_data = await api._async_api_request(
@@ -154,6 +301,7 @@ class API:  # pylint: disable=too-many-instance-attributes
         *,
         request_retries: int = DEFAULT_REQUEST_RETRIES,
         session: ClientSession,
+        json_codec: JsonCodec | None = None,
     ) -> API:
         """Get an authenticated API object from a refresh token.
 
@@ -161,23 +309,26 @@ class API:  # pylint: disable=too-many-instance-attributes
             refresh_token: A refresh token.
             request_retries: The default number of request retries to use.
             session: An optional ``aiohttp`` ``ClientSession``.
+            json_codec: The JSON codec to use for REST and websocket payloads
+                (defaults to the fastest one installed).
 
         Returns:
             An authenticated API object.
         """
-        api = cls(session=session, request_retries=request_retries)
+        api = cls(
+            session=session, request_retries=request_retries, json_codec=json_codec
+        )
         api.refresh_token = refresh_token
         await api.async_refresh_access_token()
         await api._async_post_init()
         return api
 
-    async def _async_handle_on_backoff(self, _: dict[str, Any]) -> None:
-        """Handle a backoff retry."""
-        err_info = sys.exc_info()
-        err: ClientResponseError = err_info[1].with_traceback(  # type: ignore
-            err_info[2]
-        )
+    async def _async_handle_on_retry(self, err: ClientResponseError) -> None:
+        """Handle a failed request attempt that is about to be retried.
 
+        Args:
+            err: The error raised by the attempt.
+        """
         LOGGER.debug("Error during request attempt: %s", err)
 
         if err.status == 401 and self._token_last_refreshed:
@@ -223,77 +374,263 @@ class API:  # pylint: disable=too-many-instance-attributes
         kwargs["headers"]["User-Agent"] = DEFAULT_USER_AGENT
         if self.access_token:
             kwargs["headers"]["Authorization"] = f"Bearer {self.access_token}"
+        kwargs.setdefault("timeout", ClientTimeout(total=DEFAULT_TIMEOUT))
+
+        breaker = self.circuit_breaker
+        data: Any = {}
+        scheduler = self.request_scheduler
+        scheduled = False
 
-        data: dict[str, Any] | str = {}
-        async with self.session.request(
-            method, f"{url_base}/{endpoint}", **kwargs
-        ) as resp:
+        # Queue for the rate limiter and scheduler inside the guarded block, so that a
+        # half-open probe canceled while it waits doesn't stay in flight forever:
+        with breaker.guard(get_endpoint_family(endpoint)) if breaker else nullcontext():
             try:
-                data = await resp.json(content_type=None)
-            except JSONDecodeError:
-                message = await resp.text()
-                data = {"type": "DataParsingError", "message": message}
-
-            if isinstance(data, str):
-                # In some cases, the SimpliSafe API will return a quoted string
-                # in its response body (e.g., "\"Unauthorized\""), which is
-                # technically valid JSON. Additionally, SimpliSafe sets that
-                # response's Content-Type header to application/json (#smh).
-                # Together, these factors will allow a non-true-JSON  payload to
-                # escape the try/except above. So, if we get here, we use the
-                # string value (with quotes removed) to raise an error:
-                message = data.replace('"', "")
-                data = {"error": message}
-
-            LOGGER.debug("Data received from /%s: %s", endpoint, data)
-
-            raise_on_data_error(data)
-            resp.raise_for_status()
+                if self.rate_limiter:
+                    await self.rate_limiter.async_acquire(endpoint)
+
+                if scheduler:
+                    await scheduler.async_acquire(get_request_priority(method))
+                    scheduled = True
+
+                async with self.session.request(
+                    method, f"{url_base}/{endpoint}", **kwargs
+                ) as resp:
+                    # Read the body once and decode it from the raw bytes:
+                    body = await resp.read()
+                    try:
+                        data = self.json_codec.loads(body) if body.strip() else None
+                    except ValueError:
+                        message = body.decode(resp.get_encoding(), errors="replace")
+                        data = {"type": "DataParsingError", "message": message}
+
+                    if isinstance(data, str):
+                        # In some cases, the SimpliSafe API will return a quoted
+                        # string in its response body (e.g., "\"Unauthorized\""),
+                        # which is technically valid JSON. Additionally, SimpliSafe
+                        # sets that response's Content-Type header to application/json
+                        # (#smh). Together, these factors will allow a non-true-JSON
+                        # payload to escape the try/except above. So, if we get here,
+                        # we use the string value (with quotes removed) to raise an
+                        # error:
+                        message = data.replace('"', "")
+                        data = {"error": message}
+
+                    LOGGER.debug("Data received from /%s: %s", endpoint, data)
+
+                    raise_on_data_error(data)
+                    resp.raise_for_status()
+            finally:
+                if scheduler and scheduled:
+                    scheduler.release()
+
+        return cast(dict[str, Any], data)
+
+    def _get_retry_policy(
+        self,
+        retry_policy: RetryPolicy | None,
+        default_policy: RetryPolicy,
+        timeout: float | None,
+    ) -> RetryPolicy:
+        """Get the retry policy to use for a single request.
+
+        Args:
+            retry_policy: A retry policy passed by the caller (if any).
+            default_policy: The default policy for the type of request.
+            timeout: The request's total time budget (if any).
+
+        Returns:
+            A retry policy.
+        """
+        if retry_policy is None and not self._retries_enabled:
+            retry_policy = replace(default_policy, max_tries=1)
+        return (retry_policy or default_policy).limit_to(timeout)
+
+    async def async_request(
+        self,
+        method: str,
+        endpoint: str,
+        *,
+        retry_policy: RetryPolicy | None = None,
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Make an API request (with retries).
+
+        Concurrent, identical ``GET`` requests (same endpoint and parameters, and the
+        same retry policy, time budget, and priority) share a single in-flight request
+        and all receive its parsed result. If the response cache is enabled, ``GET``
+        requests are served from it when possible and any other request invalidates
+        the cached data it could affect.
+
+        Each attempt is limited to ``DEFAULT_TIMEOUT`` seconds; ``timeout`` limits the
+        entire call (including queueing, retries, and access token refreshes).
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            retry_policy: A retry policy to use instead of the default one.
+            timeout: The total time budget (in seconds) for the request.
+            **kwargs: Additional kwargs to send with the request.
+
+        Returns:
+            An API response payload.
+        """
+        return await async_run_with_timeout(
+            self._async_dispatch_request(
+                method,
+                endpoint,
+                self._get_retry_policy(retry_policy, self._retry_policy, timeout),
+                **kwargs,
+            ),
+            timeout,
+        )
+
+    async def _async_dispatch_request(
+        self, method: str, endpoint: str, retry_policy: RetryPolicy, **kwargs: Any
+    ) -> dict[str, Any]:
+        """Send an API request through the coalescer and response cache.
+
+        Args:
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            retry_policy: The retry policy to follow.
+            **kwargs: Additional kwargs to send with the request.
+
+        Returns:
+            An API response payload.
+        """
+        if (key := get_request_key(method, endpoint, kwargs)) is None:
+            try:
+                return await async_run_with_retries(
+                    retry_policy,
+                    self._async_api_request,
+                    method,
+                    endpoint,
+                    on_retry=self._async_handle_on_retry,
+                    **kwargs,
+                )
+            finally:
+                if method.lower() != "get":
+                    self.subscription_data_dt = None
+                    if self.response_cache:
+                        self.response_cache.invalidate(
+                            system_id=get_system_id(endpoint)
+                        )
+
+        if (
+            self.response_cache
+            and self.response_cache.can_serve(endpoint, kwargs.get("params"))
+            and (data := self.response_cache.get(key)) is not None
+        ):
+            return data
+
+        # The shared request runs under the retry policy (which carries the time
+        # budget) and priority of whichever caller starts it, so only callers that
+        # agree on those can join it:
+        return await self.request_coalescer.async_run(
+            (key, retry_policy, get_request_priority(method)),
+            lambda: self._async_cacheable_request(
+                key, retry_policy, method, endpoint, **kwargs
+            ),
+        )
+
+    async def _async_cacheable_request(
+        self,
+        key: Hashable,
+        retry_policy: RetryPolicy,
+        method: str,
+        endpoint: str,
+        **kwargs: Any,
+    ) -> dict[str, Any]:
+        """Make an API request (with retries) and cache the response if appropriate.
+
+        Args:
+            key: The cache key for the request.
+            retry_policy: The retry policy to follow.
+            method: An HTTP method.
+            endpoint: A relative API endpoint.
+            **kwargs: Additional kwargs to send with the request.
+
+        Returns:
+            An API response payload.
+        """
+        cache = self.response_cache
+        generation = cache.generation if cache else 0
+        fetched_dt = utcnow()
+
+        data = await async_run_with_retries(
+            retry_policy,
+            self._async_api_request,
+            method,
+            endpoint,
+            on_retry=self._async_handle_on_retry,
+            **kwargs,
+        )
+
+        # If a write invalidated the cache while this request was in flight, the
+        # response might already be stale, so we don't cache it:
+        if cache and cache.generation == generation:
+            cache.set(key, endpoint, data, fetched_dt)
 
         return data
 
-    async def async_media(self, url: str) -> bytes | None:
+    async def async_media(
+        self,
+        url: str,
+        *,
+        retry_policy: RetryPolicy | None = None,
+        timeout: float | None = None,
+        attempt_timeout: ClientTimeout | None = None,
+    ) -> bytes | None:
         """Fetch a media file and return raw bytes to caller.
 
         Args:
             url: An absolute url for the media file.
+            retry_policy: A retry policy to use instead of the default one.
+            timeout: The total time budget (in seconds) for the request.
+            attempt_timeout: The ``aiohttp`` timeout for each attempt (defaults to
+                ``DEFAULT_MEDIA_TIMEOUT``).
 
         Returns:
             The raw bytes of the media file.
         """
-        data = await self._async_media_data(url)
+        data = await async_run_with_timeout(
+            async_run_with_retries(
+                self._get_retry_policy(retry_policy, self._media_retry_policy, timeout),
+                self._async_media_request,
+                url,
+                attempt_timeout or DEFAULT_MEDIA_TIMEOUT,
+                on_retry=self._async_handle_on_retry,
+            ),
+            timeout,
+        )
         return cast(bytes, data["bytes"])
 
-    async def _async_media_request(self, url: str) -> dict[str, Any]:
+    async def _async_media_request(
+        self, url: str, attempt_timeout: ClientTimeout
+    ) -> dict[str, Any]:
         """Fetch a media file.
 
         Args:
             url: An absolute url for the media file.
+            attempt_timeout: The ``aiohttp`` timeout for the attempt.
 
         Returns:
             A dict that looks like { "bytes": <raw-bytes> }.
         """
-        async with self.session.request(
-            "get",
-            url,
-            headers={
-                "User-Agent": DEFAULT_USER_AGENT,
-                "Authorization": f"Bearer {self.access_token}",
-            },
-        ) as resp:
-            resp.raise_for_status()
-            return {"bytes": await resp.read()}
-
-    @staticmethod
-    def _handle_on_giveup(_: dict[str, Any]) -> None:
-        """Handle a give up after retries are exhausted.
-
-        Raises:
-            RequestError: Raised upon an underlying HTTP error.
-        """
-        err_info = sys.exc_info()
-        err = err_info[1].with_traceback(err_info[2])  # type: ignore
-        raise RequestError(err) from err
+        breaker = self.circuit_breaker
+        with breaker.guard(ENDPOINT_FAMILY_MEDIA) if breaker else nullcontext():
+            async with self.session.request(
+                "get",
+                url,
+                headers={
+                    "User-Agent": DEFAULT_USER_AGENT,
+                    "Authorization": f"Bearer {self.access_token}",
+                },
+                timeout=attempt_timeout,
+            ) as resp:
+                resp.raise_for_status()
+                return {"bytes": await resp.read()}
 
     def _save_token_data_from_response(self, token_data: dict[str, Any]) -> None:
         """Save token data from a token response.
@@ -305,102 +642,84 @@ class API:  # pylint: disable=too-many-instance-attributes
         self.access_token = token_data["access_token"]
         if refresh_token := token_data.get("refresh_token"):
             self.refresh_token = refresh_token
+        if expires_in := token_data.get("expires_in"):
+            self._token_expires_at = monotonic() + expires_in
+            self._schedule_token_refresh(expires_in)
 
-    @staticmethod
-    def is_fatal_error(
-        retriable_error_codes: list[int],
-    ) -> Callable[[ClientResponseError], bool]:
-        """Determine whether a ClientResponseError is fatal and shouldn't be retried.
+    def _schedule_token_refresh(self, expires_in: float) -> None:
+        """Schedule a proactive access token refresh shortly before it expires.
 
-        When sending general API requests:
+        The refresh happens ``DEFAULT_TOKEN_REFRESH_LEAD_TIME`` seconds (plus a random
+        jitter, so that many clients don't refresh in lockstep) before expiry, but
+        never earlier than halfway through the token's lifetime.
 
-        1. 401: We catch this, refresh the access token, and retry the original request.
-        2. 409: SimpliSafe base stations regular synchronize themselves with the API,
-                which is where this error can occur; we can't control when/how that
-                happens (e.g., we might query the API in the middle of a base station
-                update), so it should be viewed as retryable.
+        Args:
+            expires_in: The number of seconds until the access token expires.
+        """
+        self._cancel_token_refresh_timer()
 
-        But when fetching media files:
+        if not self.proactive_token_refresh:
+            return
 
-        3. 404: When fetching media files, you may get a 404 if the media file is not
-                yet available to read. Keep trying however, and it will eventually
-                return a 200.
+        delay = max(
+            expires_in
+            - DEFAULT_TOKEN_REFRESH_LEAD_TIME
+            - random.uniform(0, DEFAULT_TOKEN_REFRESH_JITTER),  # noqa: S311
+            expires_in / 2,
+        )
+        LOGGER.debug("Scheduling access token refresh in %.0f seconds", delay)
 
-        Args:
-            retriable_error_codes: A list of retriable error status codes.
+        self._token_refresh_timer = asyncio.get_running_loop().call_later(
+            delay, self._start_proactive_token_refresh
+        )
 
-        Returns:
-            A callable function used by backoff to check for errors.
-        """
+    def _cancel_token_refresh_timer(self) -> None:
+        """Cancel any scheduled proactive access token refresh."""
+        if self._token_refresh_timer:
+            self._token_refresh_timer.cancel()
+            self._token_refresh_timer = None
 
-        def check(err: ClientResponseError) -> bool:
-            """Perform the check.
+    def _start_proactive_token_refresh(self) -> None:
+        """Start refreshing the access token ahead of its expiration (as a task)."""
+        self._token_refresh_timer = None
 
-            Args:
-                err: An ``aiohttp`` ``ClientResponseError``
+        # Proactive refreshes might have been turned off since this was scheduled:
+        if not self.proactive_token_refresh or (
+            self._token_refresh_task and not self._token_refresh_task.done()
+        ):
+            return
 
-            Returns:
-                Whether the error is a fatal one.
-            """
-            if err.status in retriable_error_codes:
-                return False
-            return 400 <= err.status < 500
+        LOGGER.debug("Proactively refreshing access token")
 
-        return check
+        self._token_refresh_task = asyncio.create_task(
+            self._async_refresh_access_token()
+        )
+        self._token_refresh_task.add_done_callback(
+            self._handle_proactive_token_refresh_done
+        )
 
-    def _wrap_request_method(
-        self,
-        request_retries: int,
-        retry_codes: list[int],
-        request_func: Callable[..., Awaitable[dict[str, Any]]],
-    ) -> Callable[..., Awaitable[dict[str, Any]]]:
-        """Wrap a request method in backoff/retry logic.
+    @staticmethod
+    def _handle_proactive_token_refresh_done(task: asyncio.Task[None]) -> None:
+        """Log the failure of a proactive access token refresh.
 
         Args:
-            request_retries: The number of retries to give a failed request.
-            retry_codes: A list of HTTP status codes that cause the retry
-                loop to continue.
-            request_func: A function that performs the request.
-
-        Returns:
-            A version of the request callable that can do retries.
+            task: The finished refresh task.
         """
-        return backoff.on_exception(
-            backoff.expo,
-            ClientResponseError,
-            giveup=self.is_fatal_error(retry_codes),  # type: ignore[arg-type]
-            jitter=backoff.random_jitter,
-            logger=LOGGER,
-            max_tries=request_retries,
-            on_backoff=self._async_handle_on_backoff,  # type: ignore[arg-type]
-            on_giveup=self._handle_on_giveup,  # type: ignore[arg-type]
-        )(request_func)
+        if not task.cancelled() and (err := task.exception()):
+            # If this fails, the reactive (401-based) refresh will try again later:
+            LOGGER.error("Error while proactively refreshing access token: %s", err)
 
     def disable_request_retries(self) -> None:
-        """Disable the request retry mechanism."""
-        self.async_request = self._wrap_request_method(
-            request_retries=1,
-            retry_codes=[401, 409],
-            request_func=self._async_api_request,
-        )
-        self._async_media_data = self._wrap_request_method(
-            request_retries=1,
-            retry_codes=[401, 404, 409],
-            request_func=self._async_media_request,
-        )
+        """Disable the request retry mechanism.
+
+        Requests that are already in progress keep the retry policy they started with;
+        requests that are passed an explicit retry policy are unaffected.
+        """
+        self._retries_enabled = False
 
     def enable_request_retries(self) -> None:
         """Enable the request retry mechanism."""
-        self.async_request = self._wrap_request_method(
-            request_retries=self._request_retries,
-            retry_codes=[401, 409],
-            request_func=self._async_api_request,
-        )
-        self._async_media_data = self._wrap_request_method(
-            request_retries=self._media_retries,
-            retry_codes=[401, 404, 409],
-            request_func=self._async_media_request,
-        )
+        self._retries_enabled = True
 
     def add_refresh_token_callback(
         self, callback: Callable[[str], Awaitable[None] | None]
@@ -420,15 +739,41 @@ class API:  # pylint: disable=too-many-instance-attributes
         def remove() -> None:
             """Remove the callback."""
             self._refresh_token_callbacks.remove(callback)
+            self.callback_executor.forget(callback)
 
         return remove
 
-    async def async_get_systems(self) -> dict[int, SystemV2 | SystemV3]:
+    async def async_close(self) -> None:
+        """Stop any background work (like polling or a scheduled token refresh).
+
+        Note that the ``aiohttp`` ``ClientSession`` is left open, since it belongs to
+        the caller.
+        """
+        await self._async_stop_polling()
+
+        self._cancel_token_refresh_timer()
+
+        if task := self._token_refresh_task:
+            self._token_refresh_task = None
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def async_get_systems(
+        self, *, max_concurrency: int = DEFAULT_SYSTEM_UPDATE_CONCURRENCY
+    ) -> dict[int, SystemV2 | SystemV3]:
         """Get systems associated to the associated SimpliSafe account.
 
         In the dict that is returned, the keys are the subscription ID and the values
         are actual ``System`` objects.
 
+        Systems are updated concurrently (up to ``max_concurrency`` at a time). A
+        system that fails to update is left out of the returned dict and its error is
+        logged and stored in :meth:`simplipy.api.API.system_errors`; only if every
+        system fails is an error raised.
+
+        Args:
+            max_concurrency: The maximum number of systems to update at once.
+
         Returns:
             A dictionary of system IDs to System objects.
         """
@@ -445,24 +790,44 @@ class API:  # pylint: disable=too-many-instance-attributes
                 LOGGER.error("Skipping subscription with missing system data: %s", sid)
                 continue
 
-            system: SystemV2 | SystemV3
             if subscription["location"]["system"]["version"] == 2:
-                system = SystemV2(self, sid)
+                systems[sid] = SystemV2(self, sid)
             else:
-                system = SystemV3(self, sid)
+                systems[sid] = SystemV3(self, sid)
+
+        async def async_hydrate(system: SystemV2 | SystemV3) -> None:
+            """Update a single system (which generates its device objects).
 
+            Args:
+                system: The system to hydrate.
+            """
             # Update the system, but don't include subscription data itself, since it
             # will already have been fetched when the API was first queried:
             await system.async_update(include_subscription=False)
-            system.generate_device_objects()
-            systems[sid] = system
 
+        await self._async_run_per_system(systems, async_hydrate, max_concurrency)
+        for sid in self.system_errors:
+            systems.pop(sid)
+
+        self._track_systems(systems)
         return systems
 
     async def async_refresh_access_token(self) -> None:
         """Initiate a refresh of the access/refresh tokens.
 
         Note that this will execute any callbacks added via add_refresh_token_callback.
+        If a refresh is already in progress, this waits for it rather than starting
+        another one.
+        """
+        if self._token_refresh_task is None or self._token_refresh_task.done():
+            self._token_refresh_task = asyncio.create_task(
+                self._async_refresh_access_token()
+            )
+
+        await asyncio.shield(self._token_refresh_task)
+
+    async def _async_refresh_access_token(self) -> None:
+        """Refresh the access/refresh tokens.
 
         Raises:
             InvalidCredentialsError: Raised on invalid username/password.
@@ -495,14 +860,112 @@ class API:  # pylint: disable=too-many-instance-attributes
         self._save_token_data_from_response(token_data)
 
         for callback in self._refresh_token_callbacks:
-            execute_callback(callback, self.refresh_token)
+            self.callback_executor.execute(callback, self.refresh_token)
 
-    async def async_update_subscription_data(self) -> None:
-        """Get the latest subscription data."""
-        subscription_resp = await self.async_request(
-            "get", f"users/{self.user_id}/subscriptions", params={"activeOnly": "true"}
-        )
-        self.subscription_data = {
+        if self.websocket and self.websocket.connected:
+            # Let the websocket server know about the new token so that the existing
+            # connection stays authorized:
+            try:
+                await self.websocket.async_reauthenticate()
+            except WebsocketError as err:
+                LOGGER.error("Error while re-identifying with the websocket: %s", err)
+
+    async def _async_fetch_subscription_data(
+        self,
+    ) -> tuple[dict[int, Any], datetime]:
+        """Get the latest subscription data and when it was fetched.
+
+        If the response cache holds the response, it knows when the request that
+        fetched it started (which, for a cached response, can be a while ago).
+
+        Returns:
+            A dictionary of subscription ID to subscription data, and when it was
+            fetched from the SimpliSafe cloud.
+        """
+        endpoint = f"users/{self.user_id}/subscriptions"
+        params = {"activeOnly": "true"}
+        fetched_dt = utcnow()
+
+        subscription_resp = await self.async_request("get", endpoint, params=params)
+
+        if self.response_cache and (
+            cached_dt := self.response_cache.get_fetched_dt(
+                get_request_key("get", endpoint, {"params": params})
+            )
+        ):
+            fetched_dt = cached_dt
+
+        return {
             subscription["sid"]: subscription
             for subscription in subscription_resp["subscriptions"]
-        }
+        }, fetched_dt
+
+    def _store_subscription_data(
+        self, subscription_data: dict[int, Any], fetched_dt: datetime
+    ) -> None:
+        """Store new subscription data (along with when it was fetched).
+
+        Args:
+            subscription_data: A dictionary of subscription ID to subscription data.
+            fetched_dt: When the data was fetched from the SimpliSafe cloud.
+        """
+        self.subscription_data = subscription_data
+        self.subscription_data_dt = fetched_dt
+
+    async def async_get_subscription_data(self) -> dict[int, Any]:
+        """Get (but don't store) the latest subscription data.
+
+        Returns:
+            A dictionary of subscription ID to subscription data.
+        """
+        subscription_data, _ = await self._async_fetch_subscription_data()
+        return subscription_data
+
+    async def async_update_all_systems(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        include_settings: bool = True,
+        include_devices: bool = True,
+        cached: bool = True,
+        max_concurrency: int = DEFAULT_SYSTEM_UPDATE_CONCURRENCY,
+        priority: RequestPriority = RequestPriority.BACKGROUND,
+    ) -> None:
+        """Update every system returned by the last call to ``async_get_systems``.
+
+        Subscription data (which covers every system on the account) is fetched exactly
+        once; each system then reuses that snapshot while fetching its own settings and
+        device data (up to ``max_concurrency`` systems at a time). As with
+        :meth:`simplipy.api.API.async_get_systems`, per-system failures are stored in
+        :meth:`simplipy.api.API.system_errors`. If request scheduling is enabled, the
+        update's reads are scheduled with ``priority``.
+
+        Args:
+            include_settings: Whether system settings (like PINs) should be updated.
+            include_devices: whether sensors/locks/etc. should be updated.
+            cached: Whether to used cached data.
+            max_concurrency: The maximum number of systems to update at once.
+            priority: The priority class of the update's reads.
+        """
+
+        async def async_update(system: SystemV2 | SystemV3) -> None:
+            """Update a single system.
+
+            Args:
+                system: The system to update.
+            """
+            await system.async_update(
+                include_subscription=False,
+                include_settings=include_settings,
+                include_devices=include_devices,
+                cached=cached,
+            )
+
+        with request_priority(priority):
+            await self.async_update_subscription_data()
+            await self._async_run_per_system(
+                self._systems, async_update, max_concurrency
+            )
+
+    async def async_update_subscription_data(self) -> None:
+        """Get the latest subscription data."""
+        self._store_subscription_data(*await self._async_fetch_subscription_data())
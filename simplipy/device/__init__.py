@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from enum import Enum
-from typing import TYPE_CHECKING, Any, cast
+from typing import TYPE_CHECKING, Any, ClassVar, cast
 
 from simplipy.const import LOGGER
+from simplipy.util.records import Decodable, from_record
 
 if TYPE_CHECKING:
     from simplipy.system import System
@@ -37,6 +39,24 @@ class DeviceTypes(Enum):
     UNKNOWN = 99
 
 
+@dataclass(frozen=True, slots=True)
+class DeviceRecord:
+    """Define a typed record of a device's properties."""
+
+    name: str
+    serial: str
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceV3Record(DeviceRecord):
+    """Define a typed record of a V3 device's properties."""
+
+    error: bool
+    low_battery: bool
+    offline: bool
+    settings: dict[str, Any]
+
+
 def get_device_type_from_data(device_data: dict[str, Any]) -> DeviceTypes:
     """Get the device type of a raw data payload.
 
@@ -53,7 +73,7 @@ def get_device_type_from_data(device_data: dict[str, Any]) -> DeviceTypes:
         return DeviceTypes.UNKNOWN
 
 
-class Device:
+class Device(Decodable):
     """A base SimpliSafe device.
 
     Note that this class shouldn't be instantiated directly; it will be instantiated as
@@ -65,6 +85,8 @@ class Device:
         serial: The serial number of the device.
     """
 
+    _record_type: ClassVar[type | None] = DeviceRecord
+
     def __init__(self, system: System, device_type: DeviceTypes, serial: str) -> None:
         """Initialize.
 
@@ -78,6 +100,7 @@ class Device:
         self._system = system
 
     @property
+    @from_record
     def name(self) -> str:
         """Return the device name.
 
@@ -85,10 +108,12 @@ class Device:
             The device name.
         """
         return cast(
-            str, self._system.sensor_data[self._serial].get("name", self._serial)
+            str,
+            self._system.sensor_data.get(self._serial, {}).get("name", self._serial),
         )
 
     @property
+    @from_record
     def serial(self) -> str:
         """Return the device's serial number.
 
@@ -96,7 +121,8 @@ class Device:
             The device serial number.
         """
         return cast(
-            str, self._system.sensor_data[self._serial].get("serial", self._serial)
+            str,
+            self._system.sensor_data.get(self._serial, {}).get("serial", self._serial),
         )
 
     @property
@@ -108,6 +134,31 @@ class Device:
         """
         return self._device_type
 
+    def _update_data(self, section: str, **values: Any) -> None:
+        """Update part of this device's raw data (and its record).
+
+        The raw data is copied rather than changed in place, since it may be shared
+        (e.g., with a cached API response).
+
+        Args:
+            section: The section of the raw data to update (e.g., ``status``).
+            **values: The raw values to set.
+        """
+        data = self._system.sensor_data[self._serial]
+        self._system.sensor_data[self._serial] = {
+            **data,
+            section: {**data.get(section, {}), **values},
+        }
+        self._update_record(self._record is not None)
+
+    def _get_payload(self) -> Any:
+        """Get the raw payload that this device's properties read.
+
+        Returns:
+            An API response payload (or ``None`` if the device is gone).
+        """
+        return self._system.sensor_data.get(self._serial)
+
     def as_dict(self) -> dict[str, Any]:
         """Return dictionary version of this device.
 
@@ -141,7 +192,10 @@ class DeviceV3(Device):
     instantiated as appropriate via :meth:`simplipy.API.async_get_systems`.
     """
 
+    _record_type: ClassVar[type | None] = DeviceV3Record
+
     @property
+    @from_record
     def error(self) -> bool:
         """Return the device's error status.
 
@@ -156,6 +210,7 @@ class DeviceV3(Device):
         )
 
     @property
+    @from_record
     def low_battery(self) -> bool:
         """Return whether the device's battery is low.
 
@@ -170,6 +225,7 @@ class DeviceV3(Device):
         )
 
     @property
+    @from_record
     def offline(self) -> bool:
         """Return whether the device is offline.
 
@@ -184,6 +240,7 @@ class DeviceV3(Device):
         )
 
     @property
+    @from_record
     def settings(self) -> dict[str, Any]:
         """Return the device's settings.
 
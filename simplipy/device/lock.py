@@ -3,11 +3,13 @@
 from __future__ import annotations
 
 from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING, Any, cast
 
 from simplipy.const import LOGGER
-from simplipy.device import DeviceTypes, DeviceV3
+from simplipy.device import DeviceTypes, DeviceV3, DeviceV3Record
+from simplipy.util.records import from_record
 
 if TYPE_CHECKING:
     from simplipy.system import System
@@ -22,6 +24,17 @@ class LockStates(Enum):
     UNKNOWN = 99
 
 
+@dataclass(frozen=True, slots=True)
+class LockRecord(DeviceV3Record):
+    """Define a typed record of a lock's properties."""
+
+    disabled: bool
+    lock_low_battery: bool
+    pin_pad_low_battery: bool
+    pin_pad_offline: bool
+    state: LockStates
+
+
 class Lock(DeviceV3):
     """A lock that works with V3 systems.
 
@@ -41,6 +54,8 @@ class Lock(DeviceV3):
         LOCKED = 1
         UNLOCKED = 2
 
+    _record_type = LockRecord
+
     def __init__(
         self,
         request: Callable[..., Awaitable[dict[str, Any]]],
@@ -61,6 +76,7 @@ class Lock(DeviceV3):
         self._request = request
 
     @property
+    @from_record
     def disabled(self) -> bool:
         """Return whether the lock is disabled.
 
@@ -72,6 +88,7 @@ class Lock(DeviceV3):
         )
 
     @property
+    @from_record
     def lock_low_battery(self) -> bool:
         """Return whether the lock's battery is low.
 
@@ -83,6 +100,7 @@ class Lock(DeviceV3):
         )
 
     @property
+    @from_record
     def pin_pad_low_battery(self) -> bool:
         """Return whether the pin pad's battery is low.
 
@@ -94,6 +112,7 @@ class Lock(DeviceV3):
         )
 
     @property
+    @from_record
     def pin_pad_offline(self) -> bool:
         """Return whether the pin pad is offline.
 
@@ -105,6 +124,7 @@ class Lock(DeviceV3):
         )
 
     @property
+    @from_record
     def state(self) -> LockStates:
         """Return the current state of the lock.
 
@@ -141,6 +161,23 @@ class Lock(DeviceV3):
             "state": self.state.value,
         }
 
+    def _set_state(self, state: LockStates) -> None:
+        """Update the internal state representation from a reported state.
+
+        Args:
+            state: The reported lock state.
+        """
+        if state == LockStates.JAMMED:
+            self._update_data("status", lockJamState=1)
+        elif state == LockStates.LOCKED:
+            self._update_data(
+                "status", lockState=self._InternalStates.LOCKED.value, lockJamState=0
+            )
+        elif state == LockStates.UNLOCKED:
+            self._update_data(
+                "status", lockState=self._InternalStates.UNLOCKED.value, lockJamState=0
+            )
+
     async def async_lock(self) -> None:
         """Lock the lock."""
         await self._request(
@@ -149,10 +186,10 @@ class Lock(DeviceV3):
             json={"state": "lock"},
         )
 
-        # Update the internal state representation:
-        self._system.sensor_data[self._serial]["status"]["lockState"] = (
-            self._InternalStates.LOCKED.value
-        )
+        # Update the internal state representation (a lock that just moved isn't
+        # jammed) and the indexes that depend on it:
+        self._set_state(LockStates.LOCKED)
+        self._system._index_device(self)  # pylint: disable=protected-access
 
     async def async_unlock(self) -> None:
         """Unlock the lock."""
@@ -162,7 +199,7 @@ class Lock(DeviceV3):
             json={"state": "unlock"},
         )
 
-        # Update the internal state representation:
-        self._system.sensor_data[self._serial]["status"]["lockState"] = (
-            self._InternalStates.UNLOCKED.value
-        )
+        # Update the internal state representation (a lock that just moved isn't
+        # jammed) and the indexes that depend on it:
+        self._set_state(LockStates.UNLOCKED)
+        self._system._index_device(self)  # pylint: disable=protected-access
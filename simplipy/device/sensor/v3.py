@@ -2,9 +2,20 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Any, cast
 
-from simplipy.device import DeviceTypes, DeviceV3
+from simplipy.device import DeviceTypes, DeviceV3, DeviceV3Record
+from simplipy.util.records import from_record
+
+
+@dataclass(frozen=True, slots=True)
+class SensorV3Record(DeviceV3Record):
+    """Define a typed record of a V3 sensor's properties."""
+
+    temperature: int | None
+    trigger_instantly: bool
+    triggered: bool
 
 
 class SensorV3(DeviceV3):
@@ -14,7 +25,10 @@ class SensorV3(DeviceV3):
     instantiated as appropriate via :meth:`simplipy.API.async_get_systems`.
     """
 
+    _record_type = SensorV3Record
+
     @property
+    @from_record
     def trigger_instantly(self) -> bool:
         """Return whether the sensor will trigger instantly.
 
@@ -29,6 +43,7 @@ class SensorV3(DeviceV3):
         )
 
     @property
+    @from_record
     def triggered(self) -> bool:
         """Return whether the sensor has been triggered.
 
@@ -79,6 +94,9 @@ class SensorV3(DeviceV3):
         if self.type != DeviceTypes.TEMPERATURE:
             raise AttributeError("Non-temperature sensor cannot have a temperature")
 
+        if (record := self._record) is not None:
+            return cast(int, record.temperature)
+
         return cast(
             int, self._system.sensor_data[self._serial]["status"]["temperature"]
         )
@@ -41,6 +41,18 @@ class RequestError(SimplipyError):
     pass
 
 
+class CircuitOpenError(RequestError):
+    """An error raised when requests to an endpoint family are failing fast."""
+
+    pass
+
+
+class RequestTimeoutError(RequestError):
+    """An error raised when a request doesn't finish within its deadline."""
+
+    pass
+
+
 class WebsocketError(SimplipyError):
     """An error related to generic websocket errors."""
 
@@ -65,6 +77,12 @@ class ConnectionFailedError(WebsocketError):
     pass
 
 
+class EventStreamOverflowError(WebsocketError):
+    """Define a error when an event stream's consumer falls too far behind."""
+
+    pass
+
+
 class InvalidMessageError(WebsocketError):
     """Define a error related to an invalid message from the websocket server."""
 
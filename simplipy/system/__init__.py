@@ -2,22 +2,41 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+import asyncio
+from collections.abc import Awaitable, Callable
 from dataclasses import asdict, dataclass, field
 from datetime import datetime
 from enum import Enum
-from functools import wraps
-from typing import TYPE_CHECKING, Any, Optional, TypeVar, cast
+from functools import partial, wraps
+from typing import TYPE_CHECKING, Any, ClassVar, Optional, TypeVar, cast
 
 from simplipy.const import LOGGER
+from simplipy.device import Device, DeviceTypes
 from simplipy.device.sensor.v2 import SensorV2
 from simplipy.device.sensor.v3 import SensorV3
 from simplipy.errors import MaxUserPinsExceededError, PinError, SimplipyError
-from simplipy.util.dt import utc_from_timestamp
+from simplipy.util.dt import utc_from_timestamp, utcnow
+from simplipy.util.records import Decodable, from_record
 from simplipy.util.string import convert_to_underscore
+from simplipy.websocket import (
+    EVENT_ALARM_CANCELED,
+    EVENT_ALARM_TRIGGERED,
+    EVENT_ARMED_AWAY,
+    EVENT_ARMED_AWAY_BY_KEYPAD,
+    EVENT_ARMED_AWAY_BY_REMOTE,
+    EVENT_ARMED_HOME,
+    EVENT_AWAY_EXIT_DELAY_BY_KEYPAD,
+    EVENT_AWAY_EXIT_DELAY_BY_REMOTE,
+    EVENT_DISARMED_BY_KEYPAD,
+    EVENT_DISARMED_BY_REMOTE,
+    EVENT_ENTRY_DELAY,
+    EVENT_HOME_EXIT_DELAY,
+    WebsocketEvent,
+)
 
 if TYPE_CHECKING:
     from simplipy.api import API
+    from simplipy.util.changes import Change
 
 CONF_DEFAULT = "default"
 CONF_DURESS_PIN = "duress"
@@ -49,6 +68,19 @@ class SystemNotification:
         object.__setattr__(self, "received_dt", utc_from_timestamp(self.timestamp))
 
 
+@dataclass(frozen=True, slots=True)
+class SystemRecord:
+    """Define a typed record of a system's subscription properties."""
+
+    address: str | None
+    alarm_going_off: bool
+    connection_type: str | None
+    serial: str
+    state: SystemStates
+    temperature: int | None
+    version: int | None
+
+
 class SystemStates(Enum):
     """States that the system can be in."""
 
@@ -66,6 +98,22 @@ class SystemStates(Enum):
     UNKNOWN = 99
 
 
+# The system state that each websocket event type implies:
+EVENT_SYSTEM_STATES: dict[str | None, SystemStates] = {
+    EVENT_ALARM_CANCELED: SystemStates.OFF,
+    EVENT_ALARM_TRIGGERED: SystemStates.ALARM,
+    EVENT_ARMED_AWAY: SystemStates.AWAY,
+    EVENT_ARMED_AWAY_BY_KEYPAD: SystemStates.AWAY,
+    EVENT_ARMED_AWAY_BY_REMOTE: SystemStates.AWAY,
+    EVENT_ARMED_HOME: SystemStates.HOME,
+    EVENT_AWAY_EXIT_DELAY_BY_KEYPAD: SystemStates.EXIT_DELAY,
+    EVENT_AWAY_EXIT_DELAY_BY_REMOTE: SystemStates.EXIT_DELAY,
+    EVENT_DISARMED_BY_KEYPAD: SystemStates.OFF,
+    EVENT_DISARMED_BY_REMOTE: SystemStates.OFF,
+    EVENT_ENTRY_DELAY: SystemStates.ENTRY_DELAY,
+    EVENT_HOME_EXIT_DELAY: SystemStates.EXIT_DELAY,
+}
+
 _GuardedCallableReturnType = TypeVar(  # pylint: disable=invalid-name
     "_GuardedCallableReturnType"
 )
@@ -73,6 +121,8 @@ _GuardedCallableReturnType = TypeVar(  # pylint: disable=invalid-name
 # pylint: disable=consider-alternative-union-syntax
 _GuardedCallableType = Callable[..., Optional[_GuardedCallableReturnType]]
 
+_DeviceT = TypeVar("_DeviceT", bound=Device)
+
 
 def guard_from_missing_data(
     *,
@@ -121,7 +171,7 @@ def guard_from_missing_data(
     return decorator
 
 
-class System:  # pylint: disable=too-many-public-methods
+class System(Decodable):  # pylint: disable=too-many-public-methods
     """Define a system.
 
     Note that this class shouldn't be instantiated directly; it will be instantiated as
@@ -132,6 +182,8 @@ class System:  # pylint: disable=too-many-public-methods
         sid: A subscription ID.
     """
 
+    _record_type: ClassVar[type | None] = SystemRecord
+
     def __init__(self, api: API, sid: int) -> None:
         """Initialize.
 
@@ -140,7 +192,15 @@ class System:  # pylint: disable=too-many-public-methods
             sid: A subscription ID.
         """
         self._api = api
+        self._device_removed_callbacks: list[
+            Callable[[Device], Awaitable[None] | None]
+        ] = []
         self._sid = sid
+        self._deferred_update: asyncio.Task[None] | None = None
+        self._last_event_dt: datetime | None = None
+        self._last_poll_dt: datetime | None = None
+        self._deferred_update_kwargs: dict[str, bool] = {}
+        self._subscription_epoch = api.subscription_epoch
 
         # These will get filled in after initial update:
         self._notifications: list[SystemNotification] = []
@@ -149,6 +209,7 @@ class System:  # pylint: disable=too-many-public-methods
         self.sensors: dict[str, SensorV2 | SensorV3] = {}
 
     @property
+    @from_record
     @guard_from_missing_data()
     def address(self) -> str | None:
         """Return the street address of the system.
@@ -159,6 +220,7 @@ class System:  # pylint: disable=too-many-public-methods
         return cast(str, self._api.subscription_data[self._sid]["location"]["street1"])
 
     @property
+    @from_record
     @guard_from_missing_data(default_value=False)
     def alarm_going_off(self) -> bool:
         """Return whether the alarm is going off.
@@ -172,6 +234,29 @@ class System:  # pylint: disable=too-many-public-methods
         )
 
     @property
+    def last_event_dt(self) -> datetime | None:
+        """Return when a websocket event last changed this system's state.
+
+        Returns:
+            The timestamp of the event (or ``None`` if no event has been applied).
+        """
+        return self._last_event_dt
+
+    @property
+    def last_poll_dt(self) -> datetime | None:
+        """Return when this system's state was last confirmed by an update.
+
+        This is when the subscription data behind the system's state was fetched from
+        the SimpliSafe cloud (which can predate the update itself, e.g., if the data
+        was cached or fetched by another update).
+
+        Returns:
+            When the state was last confirmed (or ``None`` if it never was).
+        """
+        return self._last_poll_dt
+
+    @property
+    @from_record
     @guard_from_missing_data()
     def connection_type(self) -> str | None:
         """Return the system's connection type (cell or WiFi).
@@ -194,6 +279,7 @@ class System:  # pylint: disable=too-many-public-methods
         return self._notifications
 
     @property
+    @from_record
     def serial(self) -> str:
         """Return the system's serial number.
 
@@ -224,6 +310,7 @@ class System:  # pylint: disable=too-many-public-methods
         return self._sid
 
     @property
+    @from_record
     @guard_from_missing_data()
     def temperature(self) -> int | None:
         """Return the overall temperature measured by the system.
@@ -237,6 +324,7 @@ class System:  # pylint: disable=too-many-public-methods
         )
 
     @property
+    @from_record
     @guard_from_missing_data()
     def version(self) -> int | None:
         """Return the system version.
@@ -249,6 +337,220 @@ class System:  # pylint: disable=too-many-public-methods
             self._api.subscription_data[self._sid]["location"]["system"]["version"],
         )
 
+    def _apply_subscription_snapshot(self) -> None:
+        """Update any data derived from a new subscription snapshot."""
+        pass
+
+    async def _async_deferred_update(self, **kwargs: bool) -> None:
+        """Join (or schedule) a single update that runs once the system can update.
+
+        The options of every joining call are combined so that the update fetches
+        everything any of them asked for (and only uses cached data, or reuses a
+        subscription snapshot, if all of them allow it).
+
+        Args:
+            **kwargs: The options passed to ``async_update``.
+        """
+        if self._deferred_update is None:
+            self._deferred_update_kwargs = kwargs
+            self._deferred_update = asyncio.create_task(
+                self._async_run_deferred_update()
+            )
+        else:
+            for key, value in kwargs.items():
+                if key in ("cached", "reuse_subscription"):
+                    self._deferred_update_kwargs[key] &= value
+                else:
+                    self._deferred_update_kwargs[key] |= value
+
+        await asyncio.shield(self._deferred_update)
+
+    async def _async_run_deferred_update(self) -> None:
+        """Wait until the system can update, then run the deferred update."""
+        # Another arm/disarm can extend the wait while we're waiting:
+        while delay := self.get_update_delay():
+            LOGGER.debug(
+                "Deferring update of system %s by %s seconds", self._sid, delay
+            )
+            await asyncio.sleep(delay)
+
+        kwargs = self._deferred_update_kwargs
+        self._deferred_update = None
+        await self.async_update(**kwargs)
+
+    def _apply_device_event(self, device: Device, event_type: str | None) -> bool:
+        """Apply a websocket event to the state of one of this system's devices.
+
+        Args:
+            device: The device the event is about.
+            event_type: The type of the event.
+
+        Returns:
+            Whether the event changed the device's state.
+
+        Raises:
+            NotImplementedError: Raises when not implemented.
+        """
+        raise NotImplementedError()
+
+    def _apply_event(self, event: WebsocketEvent) -> bool:
+        """Apply a websocket event to the state of this system (or one of its devices).
+
+        Events that are older than the last update are ignored (since that update
+        already reflects them), as are backfilled events that are older than the last
+        event applied.
+
+        Args:
+            event: The websocket event.
+
+        Returns:
+            Whether the event changed any state.
+        """
+        if self._last_poll_dt and event.timestamp < self._last_poll_dt:
+            return False
+
+        # Backfilled events can arrive after newer live ones, which they mustn't undo:
+        if (
+            event.backfilled
+            and self._last_event_dt
+            and event.timestamp < self._last_event_dt
+        ):
+            return False
+
+        changed = False
+
+        if (state := EVENT_SYSTEM_STATES.get(event.event_type)) is not None:
+            self._state = state
+            changed = True
+
+        if (serial := event.sensor_serial) and (
+            device := self._api.device_index.get_system_device(self._sid, serial)
+        ):
+            if self._apply_device_event(device, event.event_type):
+                self._index_device(device)
+                changed = True
+
+        if changed:
+            self._last_event_dt = event.timestamp
+        return changed
+
+    def _get_fresh_subscription_dt(self) -> datetime | None:
+        """Get when the API's subscription snapshot was stored, if it can be reused.
+
+        Returns:
+            When the snapshot was stored (or ``None`` if it should be fetched again).
+        """
+        stored_at = self._api.subscription_data_dt
+        if (
+            stored_at is None
+            or (utcnow() - stored_at).total_seconds() >= self._api.subscription_max_age
+        ):
+            return None
+        return stored_at
+
+    def _get_decodable_devices(self) -> dict[str, Decodable]:
+        """Get the devices whose properties can be decoded into records.
+
+        Returns:
+            A dictionary of serial number to device.
+        """
+        return {**self.sensors}
+
+    def _get_devices(self) -> dict[str, Device]:
+        """Get every device of this system.
+
+        Returns:
+            A dictionary of serial number to device.
+        """
+        return {**self.sensors}
+
+    def _get_payload(self) -> Any:
+        """Get the raw payload that this system's properties read.
+
+        Returns:
+            An API response payload.
+        """
+        return self._api.subscription_data[self._sid]
+
+    def _reconcile_devices(
+        self,
+        devices: dict[str, _DeviceT],
+        device_types: dict[str, DeviceTypes],
+        create: Callable[[str, DeviceTypes], _DeviceT],
+    ) -> None:
+        """Bring a dictionary of device objects in line with the latest device data.
+
+        Existing objects are kept (so that references to them stay valid); objects for
+        serial numbers that disappeared (or whose device type changed) are retired.
+
+        Args:
+            devices: A dictionary of serial number to device object (updated in place).
+            device_types: A dictionary of serial number to device type, as found in the
+                latest device data.
+            create: A callable that creates a device object from a serial number and
+                device type.
+        """
+        for serial in [
+            serial
+            for serial, device in devices.items()
+            if device_types.get(serial) != device.type
+        ]:
+            self._retire_device(devices.pop(serial))
+
+        for serial, device_type in device_types.items():
+            if serial not in devices:
+                devices[serial] = create(serial, device_type)
+
+    def _retire_device(self, device: Device) -> None:
+        """Stop tracking a device that no longer exists and notify listeners.
+
+        Args:
+            device: The retired device.
+        """
+        LOGGER.debug("Removing device from system %s: %s", self._sid, device.serial)
+
+        if tracker := self._api.change_tracker:
+            tracker.forget(self._sid, device.serial)
+
+        for callback in self._device_removed_callbacks:
+            self._api.callback_executor.execute(callback, device)
+
+    def _index_device(self, device: Device) -> None:
+        """Re-index one of this system's devices after its state changed locally.
+
+        Args:
+            device: The device.
+        """
+        self._api.device_index.index_device(self, device.serial, device)
+
+    def _update_indexes(self) -> None:
+        """Re-index this system's devices in the API's device index."""
+        self._api.device_index.index_system(self, self._get_devices())
+
+    def _update_records(self) -> None:
+        """Decode (or drop) the typed records of this system and its devices.
+
+        If change tracking is enabled, only objects whose raw payload changed are
+        decoded again, and the properties that changed are published to listeners.
+        """
+        enabled = self._api.typed_decoding
+        tracker = self._api.change_tracker
+
+        changes: list[Change] = []
+        objects: list[tuple[str | None, Decodable]] = [
+            (None, self),
+            *self._get_decodable_devices().items(),
+        ]
+        for serial, obj in objects:
+            changes.extend(
+                obj._refresh_record(  # pylint: disable=protected-access
+                    enabled, tracker, self._sid, serial
+                )
+            )
+
+        if tracker is not None:
+            tracker.publish(changes, self._api.callback_executor)
+
     async def _async_clear_notifications(self) -> None:
         """Clear active notifications.
 
@@ -279,8 +581,8 @@ class System:  # pylint: disable=too-many-public-methods
         """
         raise NotImplementedError()
 
-    async def _async_update_device_data(self, cached: bool = False) -> None:
-        """Update all device data.
+    async def _async_fetch_device_data(self, cached: bool = True) -> dict[str, Any]:
+        """Fetch (but don't apply) the latest device data.
 
         Args:
             cached: Whether to update with cached data.
@@ -290,8 +592,8 @@ class System:  # pylint: disable=too-many-public-methods
         """
         raise NotImplementedError()
 
-    async def _async_update_settings_data(self, cached: bool = True) -> None:
-        """Update all settings data.
+    async def _async_fetch_settings_data(self, cached: bool = True) -> dict[str, Any]:
+        """Fetch (but don't apply) the latest settings data.
 
         Args:
             cached: Whether to update with cached data.
@@ -301,9 +603,49 @@ class System:  # pylint: disable=too-many-public-methods
         """
         raise NotImplementedError()
 
-    async def _async_update_subscription_data(self) -> None:
-        """Update subscription data."""
-        await self._api.async_update_subscription_data()
+    def _apply_device_data(self, device_resp: dict[str, Any]) -> None:
+        """Apply fetched device data.
+
+        Args:
+            device_resp: An API response payload.
+
+        Raises:
+            NotImplementedError: Raises when not implemented.
+        """
+        raise NotImplementedError()
+
+    def _apply_settings_data(self, settings_resp: dict[str, Any]) -> None:
+        """Apply fetched settings data.
+
+        Args:
+            settings_resp: An API response payload.
+
+        Raises:
+            NotImplementedError: Raises when not implemented.
+        """
+        raise NotImplementedError()
+
+    def _apply_subscription_data(
+        self, subscription_data: dict[int, Any], fetched_dt: datetime
+    ) -> None:
+        """Apply fetched subscription data.
+
+        Args:
+            subscription_data: A dictionary of subscription ID to subscription data.
+            fetched_dt: When the data was fetched from the SimpliSafe cloud.
+        """
+        self._api._store_subscription_data(  # pylint: disable=protected-access
+            subscription_data, fetched_dt
+        )
+
+    async def _async_update_settings_data(self, cached: bool = True) -> None:
+        """Update all settings data.
+
+        Args:
+            cached: Whether to update with cached data.
+        """
+        self._apply_settings_data(await self._async_fetch_settings_data(cached))
+        self._update_record(self._api.typed_decoding)
 
     def as_dict(self) -> dict[str, Any]:
         """Return dictionary version of this device.
@@ -336,8 +678,34 @@ class System:  # pylint: disable=too-many-public-methods
             await self._async_clear_notifications()
             self._notifications = []
 
+    def add_device_removed_callback(
+        self, callback: Callable[[Device], Awaitable[None] | None]
+    ) -> Callable[[], None]:
+        """Add a callback that should be triggered when a device is removed.
+
+        Note that callbacks should expect to receive the removed
+        :meth:`simplipy.device.Device` object as a parameter.
+
+        Args:
+            callback: The callback to execute.
+
+        Returns:
+            A callable to cancel the callback.
+        """
+        self._device_removed_callbacks.append(callback)
+
+        def remove() -> None:
+            """Remove the callback."""
+            self._device_removed_callbacks.remove(callback)
+            self._api.callback_executor.forget(callback)
+
+        return remove
+
     def generate_device_objects(self) -> None:
-        """Generate device objects for this system.
+        """Reconcile this system's device objects with its latest device data.
+
+        Device objects are created for new serial numbers and retired for ones that
+        disappeared; existing device objects are kept as-is.
 
         Raises:
             NotImplementedError: Raises when not implemented.
@@ -386,6 +754,14 @@ class System:  # pylint: disable=too-many-public-methods
         except IndexError:
             raise SimplipyError("SimpliSafe didn't return any events") from None
 
+    def get_update_delay(self) -> float:
+        """Return how long (in seconds) this system must wait before it can update.
+
+        Returns:
+            The number of seconds to wait.
+        """
+        return 0.0
+
     async def async_get_pins(self, cached: bool = True) -> dict[str, str]:
         """Return all of the set PINs, including master and duress.
 
@@ -478,31 +854,98 @@ class System:  # pylint: disable=too-many-public-methods
 
         await self._async_set_updated_pins(latest_pins)
 
-    async def async_update(
+    async def async_update(  # pylint: disable=too-many-arguments,too-many-locals
         self,
         *,
         include_subscription: bool = True,
         include_settings: bool = True,
         include_devices: bool = True,
         cached: bool = True,
+        concurrent: bool = False,
+        defer: bool = False,
+        reuse_subscription: bool = True,
     ) -> None:
         """Get the latest system data.
 
         The ``cached`` parameter determines whether the SimpliSafe Cloud uses the last
         known values retrieved from the base station (``True``) or retrieves new data.
 
+        If ``concurrent`` is ``True``, the subscription, settings, and device data are
+        fetched at the same time and then applied in one step (so that the system is
+        never seen in a half-updated state).
+
+        If :meth:`simplipy.api.API.subscription_max_age` is set, subscription data that
+        another update stored less than that many seconds ago is reused rather than
+        fetched again (unless ``reuse_subscription`` is ``False``).
+
+        If ``defer`` is ``True`` and the system can't be updated yet (see
+        :meth:`simplipy.system.System.get_update_delay`), the update runs as soon as it
+        can (rather than being skipped); every deferred call made in the meantime waits
+        for that same, single update.
+
         Args:
             include_subscription: Whether system state/properties should be updated.
             include_settings: Whether system settings (like PINs) should be updated.
             include_devices: whether sensors/locks/etc. should be updated.
             cached: Whether to used cached data.
+            concurrent: Whether to fetch the requested data concurrently.
+            defer: Whether to wait for (rather than skip) an update that can't run yet.
+            reuse_subscription: Whether a recent subscription snapshot may be reused.
         """
+        if defer and self.get_update_delay():
+            await self._async_deferred_update(
+                include_subscription=include_subscription,
+                include_settings=include_settings,
+                include_devices=include_devices,
+                cached=cached,
+                concurrent=concurrent,
+                reuse_subscription=reuse_subscription,
+            )
+            return
+
+        if (
+            include_subscription
+            and reuse_subscription
+            and self._get_fresh_subscription_dt()
+        ):
+            include_subscription = False
+
+        steps: list[tuple[Callable[[], Awaitable[Any]], Callable[[Any], None]]] = []
         if include_subscription:
-            await self._async_update_subscription_data()
+            steps.append(
+                (
+                    self._api._async_fetch_subscription_data,  # pylint: disable=protected-access
+                    lambda result: self._apply_subscription_data(*result),
+                )
+            )
         if include_settings:
-            await self._async_update_settings_data(cached)
+            steps.append(
+                (
+                    partial(self._async_fetch_settings_data, cached),
+                    self._apply_settings_data,
+                )
+            )
         if include_devices:
-            await self._async_update_device_data(cached)
+            steps.append(
+                (
+                    partial(self._async_fetch_device_data, cached),
+                    self._apply_device_data,
+                )
+            )
+
+        if concurrent:
+            results = await asyncio.gather(*[fetch() for fetch, _ in steps])
+            for (_, apply), result in zip(steps, results):
+                apply(result)
+        else:
+            for fetch, apply in steps:
+                apply(await fetch())
+
+        # Subscription data is shared by every system on the account, so it may have
+        # been refreshed elsewhere (e.g., by API.async_update_all_systems):
+        if self._subscription_epoch != self._api.subscription_epoch:
+            self._subscription_epoch = self._api.subscription_epoch
+            self._apply_subscription_snapshot()
 
         # Create notifications:
         self._notifications = [
@@ -530,3 +973,10 @@ class System:  # pylint: disable=too-many-public-methods
         except KeyError:
             LOGGER.error("Unknown raw system state: %s", raw_state)
             self._state = SystemStates.UNKNOWN
+
+        # The system's state is only as recent as the subscription snapshot it comes
+        # from (which may be cached, or fetched by another update); if a write made
+        # that snapshot's age unknown, the last known time is kept:
+        if snapshot_dt := self._api.subscription_data_dt:
+            self._last_poll_dt = snapshot_dt
+        self.generate_device_objects()
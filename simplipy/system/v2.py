@@ -5,7 +5,7 @@ from __future__ import annotations
 from typing import Any
 
 from simplipy.const import LOGGER
-from simplipy.device import get_device_type_from_data
+from simplipy.device import Device, get_device_type_from_data
 from simplipy.device.sensor.v2 import SensorV2
 from simplipy.system import (
     CONF_DURESS_PIN,
@@ -82,36 +82,88 @@ class SystemV2(System):
             json=create_pin_payload(pins),
         )
 
-    async def _async_update_device_data(self, cached: bool = True) -> None:
-        """Update all device data.
+    async def _async_fetch_device_data(self, cached: bool = True) -> dict[str, Any]:
+        """Fetch (but don't apply) the latest device data.
 
         Args:
             cached: Whether to update with cached data.
+
+        Returns:
+            An API response payload.
         """
-        sensor_resp = await self._api.async_request(
+        return await self._api.async_request(
             "get",
             f"subscriptions/{self.system_id}/settings",
             params={"settingsType": "all", "cached": str(cached).lower()},
         )
 
-        for sensor in sensor_resp.get("settings", {}).get("sensors", []):
-            if not sensor:
-                continue
-            self.sensor_data[sensor["serial"]] = sensor
-
-    async def _async_update_settings_data(self, cached: bool = True) -> None:
-        """Update all settings data.
+    async def _async_fetch_settings_data(self, cached: bool = True) -> dict[str, Any]:
+        """Fetch (but don't apply) the latest settings data.
 
         Args:
             cached: Whether to update with cached data.
+
+        Returns:
+            An API response payload.
+        """
+        return {}
+
+    def _apply_device_data(self, device_resp: dict[str, Any]) -> None:
+        """Apply fetched device data.
+
+        A payload without a sensor list leaves the existing sensors alone (so that a
+        partial response doesn't retire every device); an explicitly empty list
+        retires them.
+
+        Args:
+            device_resp: An API response payload.
+        """
+        if (sensors := device_resp.get("settings", {}).get("sensors")) is None:
+            LOGGER.debug("No sensor data in response; keeping existing sensors")
+            return
+
+        self.sensor_data = {sensor["serial"]: sensor for sensor in sensors if sensor}
+
+    def _apply_device_event(self, device: Device, event_type: str | None) -> bool:
+        """Apply a websocket event to the state of one of this system's devices.
+
+        V2 device data doesn't carry the state that websocket events describe, so
+        events never change it.
+
+        Args:
+            device: The device the event is about.
+            event_type: The type of the event.
+
+        Returns:
+            Whether the event changed the device's state.
+        """
+        return False
+
+    def _apply_settings_data(self, settings_resp: dict[str, Any]) -> None:
+        """Apply fetched settings data.
+
+        Args:
+            settings_resp: An API response payload.
         """
         pass
 
     def generate_device_objects(self) -> None:
-        """Generate device objects for this system."""
-        for serial, data in self.sensor_data.items():
-            sensor_type = get_device_type_from_data(data)
-            self.sensors[serial] = SensorV2(self, sensor_type, serial)
+        """Reconcile this system's device objects with its latest device data.
+
+        Device objects are created for new serial numbers and retired for ones that
+        disappeared; existing device objects are kept as-is.
+        """
+        self._reconcile_devices(
+            self.sensors,
+            {
+                serial: get_device_type_from_data(data)
+                for serial, data in self.sensor_data.items()
+            },
+            lambda serial, device_type: SensorV2(self, device_type, serial),
+        )
+
+        self._update_records()
+        self._update_indexes()
 
     async def async_get_pins(self, cached: bool = True) -> dict[str, str]:
         """Return all of the set PINs, including master and duress.
@@ -132,11 +184,12 @@ class SystemV2(System):
         )
 
         pins = {
-            CONF_MASTER_PIN: pins_resp["pins"].pop("pin1")["value"],
-            CONF_DURESS_PIN: pins_resp["pins"].pop("duress")["value"],
+            CONF_MASTER_PIN: pins_resp["pins"]["pin1"]["value"],
+            CONF_DURESS_PIN: pins_resp["pins"]["duress"]["value"],
         }
 
-        for user_pin in [p for p in pins_resp["pins"].values() if p["value"]]:
-            pins[user_pin["name"]] = user_pin["value"]
+        for key, user_pin in pins_resp["pins"].items():
+            if key not in ("pin1", "duress") and user_pin["value"]:
+                pins[user_pin["name"]] = user_pin["value"]
 
         return pins
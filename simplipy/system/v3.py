@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
 from typing import TYPE_CHECKING, Any, Final, cast
@@ -9,19 +10,30 @@ from typing import TYPE_CHECKING, Any, Final, cast
 import voluptuous as vol
 
 from simplipy.const import LOGGER
-from simplipy.device import DeviceTypes, get_device_type_from_data
+from simplipy.device import Device, DeviceTypes, get_device_type_from_data
 from simplipy.device.camera import Camera
-from simplipy.device.lock import Lock
+from simplipy.device.lock import Lock, LockStates
 from simplipy.device.sensor.v3 import SensorV3
 from simplipy.system import (
     CONF_DURESS_PIN,
     CONF_MASTER_PIN,
     DEFAULT_MAX_USER_PINS,
     System,
+    SystemRecord,
     SystemStates,
     guard_from_missing_data,
 )
 from simplipy.util.dt import utcnow
+from simplipy.util.records import Decodable, from_record
+from simplipy.websocket import (
+    EVENT_ALARM_TRIGGERED,
+    EVENT_ENTRY_DELAY,
+    EVENT_LOCK_ERROR,
+    EVENT_LOCK_LOCKED,
+    EVENT_LOCK_UNLOCKED,
+    EVENT_SENSOR_NOT_RESPONDING,
+    EVENT_SENSOR_RESTORED,
+)
 
 if TYPE_CHECKING:
     from simplipy.api import API
@@ -38,6 +50,13 @@ CONF_VOICE_PROMPT_VOLUME = "voice_prompt_volume"
 
 DEFAULT_LOCK_STATE_CHANGE_WINDOW = timedelta(seconds=15)
 
+# The lock state that each websocket event type implies:
+EVENT_LOCK_STATES: dict[str | None, LockStates] = {
+    EVENT_LOCK_ERROR: LockStates.JAMMED,
+    EVENT_LOCK_LOCKED: LockStates.LOCKED,
+    EVENT_LOCK_UNLOCKED: LockStates.UNLOCKED,
+}
+
 SYSTEM_PROPERTIES_VALUE_MAP = {
     CONF_ALARM_DURATION: "alarmDuration",
     CONF_ALARM_VOLUME: "alarmVolume",
@@ -71,6 +90,29 @@ class Volume(Enum):
     HIGH = 3
 
 
+@dataclass(frozen=True, slots=True)
+class SystemV3Record(SystemRecord):
+    """Define a typed record of a V3 system's subscription and settings properties."""
+
+    alarm_duration: int | None
+    alarm_volume: Volume | None
+    battery_backup_power_level: int | None
+    chime_volume: Volume | None
+    entry_delay_away: int | None
+    entry_delay_home: int | None
+    exit_delay_away: int | None
+    exit_delay_home: int | None
+    gsm_strength: int | None
+    light: bool | None
+    offline: bool
+    power_outage: bool
+    rf_jamming: bool
+    voice_prompt_volume: Volume | None
+    wall_power_level: int | None
+    wifi_ssid: str | None
+    wifi_strength: int | None
+
+
 SYSTEM_PROPERTIES_PAYLOAD_SCHEMA = vol.Schema(
     {
         vol.Optional(CONF_ALARM_DURATION): vol.All(
@@ -148,6 +190,8 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         sid: A subscription ID.
     """
 
+    _record_type = SystemV3Record
+
     def __init__(self, api: API, system_id: int) -> None:
         """Initialize.
 
@@ -166,6 +210,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         self.settings_data: dict[str, dict] = {}
 
     @property
+    @from_record
     @guard_from_missing_data()
     def alarm_duration(self) -> int | None:
         """Return the number of seconds an activated alarm will sound for.
@@ -181,6 +226,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         )
 
     @property
+    @from_record
     @guard_from_missing_data()
     def alarm_volume(self) -> Volume:
         """Return the volume level of the alarm.
@@ -197,6 +243,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         )
 
     @property
+    @from_record
     @guard_from_missing_data()
     def battery_backup_power_level(self) -> int:
         """Return the power rating of the battery backup.
@@ -207,6 +254,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         return cast(int, self.settings_data["basestationStatus"]["backupBattery"])
 
     @property
+    @from_record
     @guard_from_missing_data()
     def chime_volume(self) -> Volume:
         """Return the volume level of the door chime.
@@ -223,6 +271,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         )
 
     @property
+    @from_record
     @guard_from_missing_data()
     def entry_delay_away(self) -> int:
         """Return the number of seconds to delay when returning to an "away" alarm.
@@ -238,6 +287,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         )
 
     @property
+    @from_record
     @guard_from_missing_data()
     def entry_delay_home(self) -> int:
         """Return the number of seconds to delay when returning to a "home" alarm.
@@ -253,6 +303,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         )
 
     @property
+    @from_record
     @guard_from_missing_data()
     def exit_delay_away(self) -> int:
         """Return the number of seconds to delay when exiting an "away" alarm.
@@ -268,6 +319,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         )
 
     @property
+    @from_record
     @guard_from_missing_data()
     def exit_delay_home(self) -> int:
         """Return the number of seconds to delay when exiting an "home" alarm.
@@ -283,6 +335,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         )
 
     @property
+    @from_record
     @guard_from_missing_data()
     def gsm_strength(self) -> int:
         """Return the signal strength of the cell antenna.
@@ -293,6 +346,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         return cast(int, self.settings_data["basestationStatus"]["gsmRssi"])
 
     @property
+    @from_record
     @guard_from_missing_data()
     def light(self) -> bool:
         """Return whether the base station light is on.
@@ -308,6 +362,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         )
 
     @property
+    @from_record
     @guard_from_missing_data(default_value=False)
     def offline(self) -> bool:
         """Return whether the system is offline.
@@ -321,6 +376,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         )
 
     @property
+    @from_record
     @guard_from_missing_data(default_value=False)
     def power_outage(self) -> bool:
         """Return whether the system is experiencing a power outage.
@@ -334,6 +390,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         )
 
     @property
+    @from_record
     @guard_from_missing_data(default_value=False)
     def rf_jamming(self) -> bool:
         """Return whether the base station is noticing RF jamming.
@@ -344,6 +401,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         return cast(bool, self.settings_data["basestationStatus"]["rfJamming"])
 
     @property
+    @from_record
     @guard_from_missing_data()
     def voice_prompt_volume(self) -> Volume:
         """Return the volume level of the voice prompt.
@@ -360,6 +418,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         )
 
     @property
+    @from_record
     @guard_from_missing_data()
     def wall_power_level(self) -> int:
         """Return the power rating of the A/C outlet.
@@ -370,6 +429,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         return cast(int, self.settings_data["basestationStatus"]["wallPower"])
 
     @property
+    @from_record
     @guard_from_missing_data()
     def wifi_ssid(self) -> str:
         """Return the ssid of the base station.
@@ -380,6 +440,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         return cast(str, self.settings_data["settings"]["normal"]["wifiSSID"])
 
     @property
+    @from_record
     @guard_from_missing_data()
     def wifi_strength(self) -> int:
         """Return the signal strength of the wifi antenna.
@@ -419,42 +480,113 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
             f"ss3/subscriptions/{self.system_id}/settings/pins",
             json=create_pin_payload(pins),
         )
+        self._update_record(self._api.typed_decoding)
 
-    async def _async_update_device_data(self, cached: bool = True) -> None:
-        """Update all device data.
+    async def _async_fetch_device_data(self, cached: bool = True) -> dict[str, Any]:
+        """Fetch (but don't apply) the latest device data.
 
         Args:
             cached: Whether to update with cached data.
+
+        Returns:
+            An API response payload.
         """
-        sensor_resp = await self._api.async_request(
+        return await self._api.async_request(
             "get",
             f"ss3/subscriptions/{self.system_id}/sensors",
             params={"forceUpdate": str(not cached).lower()},
         )
-        self.sensor_data = {
-            sensor["serial"]: sensor for sensor in sensor_resp.get("sensors", [])
-        }
 
-    async def _async_update_settings_data(self, cached: bool = True) -> None:
-        """Update all settings data.
+    async def _async_fetch_settings_data(self, cached: bool = True) -> dict[str, Any]:
+        """Fetch (but don't apply) the latest settings data.
 
         Args:
             cached: Whether to update with cached data.
+
+        Returns:
+            An API response payload.
         """
-        settings_resp = await self._api.async_request(
+        return await self._api.async_request(
             "get",
             f"ss3/subscriptions/{self.system_id}/settings/normal",
             params={"forceUpdate": str(not cached).lower()},
         )
 
+    def _apply_device_data(self, device_resp: dict[str, Any]) -> None:
+        """Apply fetched device data.
+
+        Args:
+            device_resp: An API response payload.
+        """
+        self.sensor_data = {
+            sensor["serial"]: sensor for sensor in device_resp.get("sensors", [])
+        }
+
+    def _apply_settings_data(self, settings_resp: dict[str, Any]) -> None:
+        """Apply fetched settings data.
+
+        Args:
+            settings_resp: An API response payload.
+        """
         if settings_resp:
             self.settings_data = settings_resp
 
-    async def _async_update_subscription_data(self) -> None:
-        """Update subscription data."""
-        await super()._async_update_subscription_data()
+    def _apply_subscription_snapshot(self) -> None:
+        """Update any data derived from a new subscription snapshot."""
         self.camera_data = self._generate_camera_data()
 
+    def _apply_device_event(self, device: Device, event_type: str | None) -> bool:
+        """Apply a websocket event to the state of one of this system's devices.
+
+        Args:
+            device: The device the event is about.
+            event_type: The type of the event.
+
+        Returns:
+            Whether the event changed the device's state.
+        """
+        # pylint: disable=protected-access
+        if isinstance(device, Lock) and event_type in EVENT_LOCK_STATES:
+            device._set_state(EVENT_LOCK_STATES[event_type])
+        elif isinstance(device, Camera):
+            return False
+        elif event_type in (EVENT_SENSOR_NOT_RESPONDING, EVENT_SENSOR_RESTORED):
+            device._update_data(
+                "flags", offline=event_type == EVENT_SENSOR_NOT_RESPONDING
+            )
+        elif isinstance(device, SensorV3) and event_type in (
+            EVENT_ALARM_TRIGGERED,
+            EVENT_ENTRY_DELAY,
+        ):
+            device._update_data("status", triggered=True)
+        else:
+            return False
+        return True
+
+    def _get_decodable_devices(self) -> dict[str, Decodable]:
+        """Get the devices whose properties can be decoded into records.
+
+        Returns:
+            A dictionary of serial number to device.
+        """
+        return {**self.sensors, **self.locks}
+
+    def _get_devices(self) -> dict[str, Device]:
+        """Get every device of this system.
+
+        Returns:
+            A dictionary of serial number to device.
+        """
+        return {**self.sensors, **self.locks, **self.cameras}
+
+    def _get_payload(self) -> Any:
+        """Get the raw payloads that this system's properties read.
+
+        Returns:
+            The subscription and settings payloads.
+        """
+        return [super()._get_payload(), self.settings_data]
+
     def _generate_camera_data(self) -> dict[str, dict]:
         """Generate usable, hashable camera data from subscription data.
 
@@ -509,17 +641,60 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
         return data
 
     def generate_device_objects(self) -> None:
-        """Generate device objects for this system."""
+        """Reconcile this system's device objects with its latest device data.
+
+        Device objects are created for new serial numbers and retired for ones that
+        disappeared; existing device objects are kept as-is.
+        """
+        lock_types: dict[str, DeviceTypes] = {}
+        sensor_types: dict[str, DeviceTypes] = {}
         for serial, sensor in self.sensor_data.items():
             if (sensor_type := get_device_type_from_data(sensor)) == DeviceTypes.LOCK:
-                self.locks[serial] = Lock(
-                    self._api.async_request, self, sensor_type, serial
-                )
+                lock_types[serial] = sensor_type
             else:
-                self.sensors[serial] = SensorV3(self, sensor_type, serial)
+                sensor_types[serial] = sensor_type
+
+        self._reconcile_devices(
+            self.locks,
+            lock_types,
+            lambda serial, device_type: Lock(
+                self._api.async_request, self, device_type, serial
+            ),
+        )
+        self._reconcile_devices(
+            self.sensors,
+            sensor_types,
+            lambda serial, device_type: SensorV3(self, device_type, serial),
+        )
+        self._reconcile_devices(
+            self.cameras,
+            {serial: DeviceTypes.CAMERA for serial in self.camera_data},
+            lambda serial, device_type: Camera(self, device_type, serial),
+        )
+
+        self._update_records()
+        self._update_indexes()
+
+    def get_update_delay(self) -> float:
+        """Return how long (in seconds) this system must wait before it can update.
 
-        for serial in self.camera_data:
-            self.cameras[serial] = Camera(self, DeviceTypes.CAMERA, serial)
+        The SimpliSafe cloud API currently has a bug wherein systems with locks will
+        audibly announce that those locks aren't responding when the system is updated
+        within a certain window (around 15 seconds) of the system changing state. Oof.
+        So, updates aren't allowed inside that window.
+
+        Returns:
+            The number of seconds to wait.
+        """
+        if not self.locks or not self._last_state_change_dt:
+            return 0.0
+
+        return max(
+            0.0,
+            (
+                self._last_state_change_dt + DEFAULT_LOCK_STATE_CHANGE_WINDOW - utcnow()
+            ).total_seconds(),
+        )
 
     async def async_get_pins(self, cached: bool = True) -> dict[str, str]:
         """Return all of the set PINs, including master and duress.
@@ -591,36 +766,43 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
 
         if settings_resp:
             self.settings_data = settings_resp
+            self._update_record(self._api.typed_decoding)
 
-    async def async_update(
+    async def async_update(  # pylint: disable=too-many-arguments
         self,
         *,
         include_subscription: bool = True,
         include_settings: bool = True,
         include_devices: bool = True,
         cached: bool = True,
+        concurrent: bool = False,
+        defer: bool = False,
+        reuse_subscription: bool = True,
     ) -> None:
         """Get the latest system data.
 
         The ``cached`` parameter determines whether the SimpliSafe Cloud uses the last
         known values retrieved from the base station (``True``) or retrieves new data.
 
+        If ``concurrent`` is ``True``, the subscription, settings, and device data are
+        fetched at the same time and then applied in one step (so that the system is
+        never seen in a half-updated state).
+
+        Updates requested within ``DEFAULT_LOCK_STATE_CHANGE_WINDOW`` of arming or
+        disarming a system with locks via the API are skipped, unless ``defer`` is
+        ``True``: then, they are combined into a single update that runs when the window
+        closes. (State changes that arrive as websocket events don't open the window.)
+
         Args:
             include_subscription: Whether system state/properties should be updated.
             include_settings: Whether system settings (like PINs) should be updated.
             include_devices: whether sensors/locks/etc. should be updated.
             cached: Whether to used cached data.
+            concurrent: Whether to fetch the requested data concurrently.
+            defer: Whether to wait for (rather than skip) an update inside the window.
+            reuse_subscription: Whether a recent subscription snapshot may be reused.
         """
-        if (
-            self.locks
-            and self._last_state_change_dt
-            and utcnow()
-            <= self._last_state_change_dt + DEFAULT_LOCK_STATE_CHANGE_WINDOW
-        ):
-            # The SimpliSafe cloud API currently has a bug wherein systems with locks
-            # will audible announce that those locks aren't responding when the system
-            # is updated within a certain window (around 15 seconds) of the system
-            # changing state. Oof. So, we refuse to update inside that window:
+        if not defer and self.get_update_delay():
             LOGGER.info(
                 "Skipping system update within %s seconds from last system arm/disarm",
                 DEFAULT_LOCK_STATE_CHANGE_WINDOW,
@@ -632,4 +814,7 @@ class SystemV3(System):  # pylint: disable=too-many-public-methods
             include_settings=include_settings,
             include_devices=include_devices,
             cached=cached,
+            concurrent=concurrent,
+            defer=defer,
+            reuse_subscription=reuse_subscription,
         )
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import warnings
 from collections.abc import Awaitable, Callable
 from typing import Any, Optional
 
@@ -16,10 +17,18 @@ def execute_callback(callback: CallbackType, *args: Any) -> None:
     The callback is expected to be short-lived, as no sort of task management takes
     place – this is a fire-and-forget system.
 
+    This is deprecated; use
+    :meth:`simplipy.util.callbacks.CallbackExecutor.execute` instead.
+
     Args:
         callback: The callback to execute.
         *args: Any arguments to pass to the callback.
     """
+    warnings.warn(
+        "execute_callback is deprecated; use CallbackExecutor.execute instead",
+        DeprecationWarning,
+        stacklevel=2,
+    )
     if asyncio.iscoroutinefunction(callback):
         asyncio.create_task(callback(*args))
     else:
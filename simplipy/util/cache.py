@@ -0,0 +1,233 @@
+"""Define a TTL/LRU cache for API responses."""
+
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from collections.abc import Hashable
+from copy import deepcopy
+from dataclasses import dataclass
+from datetime import datetime
+from time import monotonic
+from typing import Any
+
+from simplipy.util.dt import utcnow
+from simplipy.util.endpoint import (
+    ENDPOINT_FAMILY_SENSORS,
+    ENDPOINT_FAMILY_SETTINGS,
+    ENDPOINT_FAMILY_SUBSCRIPTIONS,
+    get_endpoint_family,
+    get_system_id,
+)
+
+DEFAULT_CACHE_MAX_ENTRIES = 256
+DEFAULT_CACHE_TTLS = {
+    ENDPOINT_FAMILY_SENSORS: 5.0,
+    ENDPOINT_FAMILY_SETTINGS: 30.0,
+    ENDPOINT_FAMILY_SUBSCRIPTIONS: 10.0,
+}
+
+
+@dataclass
+class CacheStats:
+    """Define counters that describe response cache usage."""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    entries: int = 0
+    size_bytes: int = 0
+
+
+@dataclass
+class _CacheEntry:
+    """Define a single cached response."""
+
+    data: dict[str, Any]
+    expires_at: float
+    fetched_dt: datetime
+    size_bytes: int
+    system_id: int | None
+    family: str
+
+
+class ResponseCache:
+    """Define a TTL cache of API responses with LRU eviction.
+
+    Only responses from endpoint families that have a TTL are cached. Entries are
+    evicted (least recently used first) once either ``max_entries`` or ``max_bytes``
+    is exceeded; note that byte sizes are only computed when ``max_bytes`` is set.
+
+    Responses are copied on the way in and on the way out, so callers that modify a
+    response can't change what is cached.
+
+    Args:
+        ttls: A mapping of endpoint family to TTL (in seconds).
+        max_entries: The maximum number of cached responses.
+        max_bytes: The maximum (approximate) serialized size of all cached responses.
+    """
+
+    def __init__(
+        self,
+        *,
+        ttls: dict[str, float] | None = None,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+        max_bytes: int | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            ttls: A mapping of endpoint family to TTL (in seconds).
+            max_entries: The maximum number of cached responses.
+            max_bytes: The maximum (approximate) serialized size of all cached
+                responses.
+        """
+        self._entries: OrderedDict[Hashable, _CacheEntry] = OrderedDict()
+        self._max_bytes = max_bytes
+        self._max_entries = max_entries
+        self._ttls = DEFAULT_CACHE_TTLS if ttls is None else ttls
+        self.generation = 0
+        self.stats = CacheStats()
+
+    def _pop(self, key: Hashable) -> None:
+        """Remove an entry and update the stats.
+
+        Args:
+            key: The cache key.
+        """
+        entry = self._entries.pop(key)
+        self.stats.entries = len(self._entries)
+        self.stats.size_bytes -= entry.size_bytes
+
+    def get(self, key: Hashable) -> dict[str, Any] | None:
+        """Get a cached response.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            The cached API response payload (or ``None`` on a miss).
+        """
+        if (entry := self._entries.get(key)) is None:
+            self.stats.misses += 1
+            return None
+
+        if entry.expires_at <= monotonic():
+            self._pop(key)
+            self.stats.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return deepcopy(entry.data)
+
+    def get_fetched_dt(self, key: Hashable) -> datetime | None:
+        """Get when a cached response was fetched from the SimpliSafe cloud.
+
+        Args:
+            key: The cache key.
+
+        Returns:
+            When the response was fetched (or ``None`` if it isn't cached).
+        """
+        if (entry := self._entries.get(key)) is None or entry.expires_at <= monotonic():
+            return None
+        return entry.fetched_dt
+
+    def can_serve(self, endpoint: str, params: dict[str, Any] | None) -> bool:
+        """Get whether a read request may be served from the cache.
+
+        Requests to endpoint families without a TTL can't be; neither can requests
+        that ask the SimpliSafe cloud for fresh data (``forceUpdate=true`` or
+        ``cached=false``, e.g., right before a PIN is changed).
+
+        Args:
+            endpoint: A relative API endpoint.
+            params: The request's query parameters (if any).
+
+        Returns:
+            Whether the request may be served from the cache.
+        """
+        if not self.get_ttl(endpoint):
+            return False
+        params = params or {}
+        return (
+            str(params.get("forceUpdate")).lower() != "true"
+            and str(params.get("cached")).lower() != "false"
+        )
+
+    def get_ttl(self, endpoint: str) -> float | None:
+        """Get the TTL that applies to a relative API endpoint.
+
+        Args:
+            endpoint: A relative API endpoint.
+
+        Returns:
+            The TTL (in seconds), or ``None`` if the endpoint isn't cached.
+        """
+        return self._ttls.get(get_endpoint_family(endpoint))
+
+    def invalidate(self, *, system_id: int | None = None) -> None:
+        """Invalidate cached responses affected by a write.
+
+        Account-level subscription data is always invalidated (since it contains
+        system state); if a system ID is provided, every entry for that system is
+        invalidated, too.
+
+        Args:
+            system_id: The ID of the system that was written to.
+        """
+        self.generation += 1
+
+        for key in [
+            key
+            for key, entry in self._entries.items()
+            if entry.family == ENDPOINT_FAMILY_SUBSCRIPTIONS
+            or (system_id is not None and entry.system_id == system_id)
+        ]:
+            self._pop(key)
+            self.stats.invalidations += 1
+
+    def set(
+        self,
+        key: Hashable,
+        endpoint: str,
+        data: dict[str, Any],
+        fetched_dt: datetime | None = None,
+    ) -> None:
+        """Cache a response.
+
+        Args:
+            key: The cache key.
+            endpoint: The relative API endpoint that produced the response.
+            data: An API response payload.
+            fetched_dt: When the request that produced the response started
+                (defaults to now).
+        """
+        if not (ttl := self.get_ttl(endpoint)):
+            return
+
+        if key in self._entries:
+            self._pop(key)
+
+        size_bytes = len(json.dumps(data)) if self._max_bytes is not None else 0
+        if self._max_bytes is not None and size_bytes > self._max_bytes:
+            return
+
+        self._entries[key] = _CacheEntry(
+            deepcopy(data),
+            monotonic() + ttl,
+            fetched_dt or utcnow(),
+            size_bytes,
+            get_system_id(endpoint),
+            get_endpoint_family(endpoint),
+        )
+        self.stats.entries = len(self._entries)
+        self.stats.size_bytes += size_bytes
+
+        while len(self._entries) > self._max_entries or (
+            self._max_bytes is not None and self.stats.size_bytes > self._max_bytes
+        ):
+            self._pop(next(iter(self._entries)))
+            self.stats.evictions += 1
@@ -0,0 +1,270 @@
+"""Define a managed executor for user callbacks."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable
+from dataclasses import dataclass
+from functools import partial
+from time import monotonic
+from typing import Any, cast
+
+from simplipy.const import LOGGER
+from simplipy.util import CallbackType
+
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_MAX_PENDING = 1000
+DEFAULT_SLOW_CALLBACK_THRESHOLD = 1.0
+
+
+@dataclass
+class CallbackStats:
+    """Define counters that describe how a callback runs."""
+
+    calls: int = 0
+    dropped: int = 0
+    errors: int = 0
+    slow: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+
+def get_callback_name(callback: CallbackType) -> str:
+    """Get the name that a callback's log messages use.
+
+    Args:
+        callback: The callback.
+
+    Returns:
+        The callback's qualified name (or its representation if it has none).
+    """
+    return getattr(callback, "__qualname__", None) or repr(callback)
+
+
+class CallbackExecutor:
+    """Define an executor that runs callbacks as tracked, bounded tasks.
+
+    Coroutine callbacks run as tasks, at most ``max_concurrency`` at once; calls beyond
+    that wait in a queue (rather than as tasks of their own) until a slot frees up. At
+    most ``max_pending`` calls wait at once; beyond that, the oldest waiting call is
+    dropped (and a warning is logged). Synchronous callbacks run inline, or in the
+    default thread pool (as bounded tasks, too) when ``run_sync_in_executor`` is set.
+    Exceptions raised by callbacks are logged rather than lost, and every call whose
+    execution takes at least ``slow_callback_threshold`` seconds is logged as slow.
+    Stats are kept per callback (so two callbacks that share a name, like two
+    instances' bound methods, are counted separately) until the callback is forgotten
+    (see :meth:`simplipy.util.callbacks.CallbackExecutor.forget`).
+
+    Args:
+        max_concurrency: The maximum number of callbacks to run at once.
+        max_pending: The maximum number of callback calls to keep waiting.
+        run_sync_in_executor: Whether to run synchronous callbacks in a thread pool.
+        slow_callback_threshold: The number of seconds after which a callback is slow.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        run_sync_in_executor: bool = False,
+        slow_callback_threshold: float = DEFAULT_SLOW_CALLBACK_THRESHOLD,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            max_concurrency: The maximum number of callbacks to run at once.
+            max_pending: The maximum number of callback calls to keep waiting.
+            run_sync_in_executor: Whether to run synchronous callbacks in a thread
+                pool.
+            slow_callback_threshold: The number of seconds after which a callback is
+                slow.
+        """
+        self._coroutine_callbacks: dict[CallbackType, bool] = {}
+        self._overflowing = False
+        self._pending: deque[tuple[CallbackType, tuple[Any, ...], bool]] = deque()
+        self._tasks: set[asyncio.Task[None]] = set()
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.run_sync_in_executor = run_sync_in_executor
+        self.slow_callback_threshold = slow_callback_threshold
+        self.stats: dict[CallbackType, CallbackStats] = {}
+
+    @property
+    def pending(self) -> int:
+        """Return the number of callback calls waiting for a free slot.
+
+        Returns:
+            The number of waiting calls.
+        """
+        return len(self._pending)
+
+    @property
+    def running(self) -> int:
+        """Return the number of callbacks currently running as tasks.
+
+        Returns:
+            The number of running callbacks.
+        """
+        return len(self._tasks)
+
+    async def _async_run(
+        self, callback: CallbackType, args: tuple[Any, ...], is_coroutine: bool
+    ) -> None:
+        """Run a callback (as a task).
+
+        Args:
+            callback: The callback to run.
+            args: The arguments to pass to the callback.
+            is_coroutine: Whether the callback is a coroutine function.
+        """
+        start = monotonic()
+        failed = False
+
+        try:
+            if is_coroutine:
+                await cast(Awaitable[None], callback(*args))
+            else:
+                await asyncio.get_running_loop().run_in_executor(
+                    None, partial(callback, *args)
+                )
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Error in callback %s", get_callback_name(callback))
+            failed = True
+
+        self._record(callback, monotonic() - start, failed)
+
+    def _drop_oldest_pending(self) -> None:
+        """Drop the oldest waiting callback call."""
+        callback, *_ = self._pending.popleft()
+        self.stats.setdefault(callback, CallbackStats()).dropped += 1
+
+        # Only warn once per burst (rather than once per dropped call):
+        if not self._overflowing:
+            self._overflowing = True
+            LOGGER.warning(
+                "More than %s callback calls are waiting; dropping the oldest ones",
+                self.max_pending,
+            )
+
+    def _is_coroutine_callback(self, callback: CallbackType) -> bool:
+        """Return whether a callback is a coroutine function (checking it only once).
+
+        Args:
+            callback: The callback.
+
+        Returns:
+            Whether the callback is a coroutine function.
+        """
+        if (is_coroutine := self._coroutine_callbacks.get(callback)) is None:
+            is_coroutine = self._coroutine_callbacks[callback] = (
+                asyncio.iscoroutinefunction(callback)
+            )
+        return is_coroutine
+
+    def _record(self, callback: CallbackType, duration: float, failed: bool) -> None:
+        """Record the execution of a callback.
+
+        Args:
+            callback: The callback that ran.
+            duration: The number of seconds the callback took.
+            failed: Whether the callback raised an exception.
+        """
+        stats = self.stats.setdefault(callback, CallbackStats())
+        stats.calls += 1
+        stats.total_time += duration
+        stats.max_time = max(stats.max_time, duration)
+
+        if failed:
+            stats.errors += 1
+
+        if duration >= self.slow_callback_threshold:
+            stats.slow += 1
+            LOGGER.warning(
+                "Callback %s took %.3f seconds", get_callback_name(callback), duration
+            )
+
+    def _start_pending(self) -> None:
+        """Start waiting callback calls while there are free slots."""
+        while self._pending and len(self._tasks) < self.max_concurrency:
+            task = asyncio.create_task(self._async_run(*self._pending.popleft()))
+            self._tasks.add(task)
+            task.add_done_callback(self._on_task_done)
+
+        if not self._pending:
+            self._overflowing = False
+
+    def _on_task_done(self, task: asyncio.Task[None]) -> None:
+        """Free up a task's slot once it finishes.
+
+        Args:
+            task: The finished task.
+        """
+        self._tasks.discard(task)
+        self._start_pending()
+
+    async def async_drain(self, timeout: float | None = None) -> None:
+        """Wait for every running and waiting callback call to finish.
+
+        Args:
+            timeout: The number of seconds to wait; after that, waiting calls are
+                discarded and running ones are canceled.
+        """
+
+        async def async_wait() -> None:
+            """Wait until no callback is running."""
+            while self._tasks:
+                await asyncio.wait(set(self._tasks))
+
+        try:
+            await asyncio.wait_for(async_wait(), timeout)
+        except asyncio.TimeoutError:
+            LOGGER.warning(
+                "Canceling %s running callback(s) and discarding %s waiting one(s)",
+                len(self._tasks),
+                len(self._pending),
+            )
+            self._pending.clear()
+            tasks = list(self._tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def forget(self, callback: CallbackType) -> None:
+        """Drop everything kept about a callback (like its stats).
+
+        This is called when a callback is removed, so that the executor doesn't keep
+        it (or, for a bound method, its instance) alive.
+
+        Args:
+            callback: The callback.
+        """
+        self._coroutine_callbacks.pop(callback, None)
+        self.stats.pop(callback, None)
+
+    def execute(self, callback: CallbackType, *args: Any) -> None:
+        """Schedule a callback to be called.
+
+        Args:
+            callback: The callback to execute.
+            *args: Any arguments to pass to the callback.
+        """
+        is_coroutine = self._is_coroutine_callback(callback)
+        if self.run_sync_in_executor or is_coroutine:
+            self._pending.append((callback, args, is_coroutine))
+            self._start_pending()
+            while len(self._pending) > self.max_pending:
+                self._drop_oldest_pending()
+            return
+
+        start = monotonic()
+        failed = False
+
+        try:
+            callback(*args)
+        except Exception:  # pylint: disable=broad-except
+            LOGGER.exception("Error in callback %s", get_callback_name(callback))
+            failed = True
+
+        self._record(callback, monotonic() - start, failed)
@@ -0,0 +1,153 @@
+"""Define incremental change detection for systems and devices."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+from weakref import WeakSet
+
+from simplipy.util.callbacks import CallbackExecutor
+from simplipy.util.codec import get_codec
+from simplipy.util.records import get_record_field_names
+
+
+@dataclass(frozen=True, slots=True)
+class Change:
+    """Define a change to a single property of a system or device.
+
+    ``serial`` is ``None`` for changes to the system itself.
+    """
+
+    system_id: int
+    serial: str | None
+    field: str
+    old: Any
+    new: Any
+
+
+class ChangeTracker:
+    """Define a tracker that detects which properties changed between updates.
+
+    Each system and device is keyed by its system ID and serial number (``None`` for
+    the system itself). A hash of its raw payload is kept so that unchanged objects
+    can be skipped without looking at their properties; for objects whose payload
+    changed, the new typed record is compared, field by field, to the previous one.
+    Objects seen for the first time only establish a baseline.
+
+    Args:
+        dumps: A callable that serializes a raw payload to a string (defaults to the
+            ``dumps`` of the fastest installed JSON codec).
+    """
+
+    def __init__(self, *, dumps: Callable[[Any], str] | None = None) -> None:
+        """Initialize.
+
+        Args:
+            dumps: A callable that serializes a raw payload to a string.
+        """
+        self._callbacks: list[Callable[[list[Change]], Awaitable[None] | None]] = []
+        self._dumps = dumps or get_codec().dumps
+        # The executors that have run this tracker's callbacks (so that they can forget
+        # a callback once it's removed):
+        self._executors: WeakSet[CallbackExecutor] = WeakSet()
+        self._hashes: dict[tuple[int, str | None], int] = {}
+        self._snapshots: dict[tuple[int, str | None], Any] = {}
+
+    def add_callback(
+        self, callback: Callable[[list[Change]], Awaitable[None] | None]
+    ) -> Callable[[], None]:
+        """Add a callback that should be triggered when properties change.
+
+        Note that callbacks should expect to receive a list of
+        :meth:`simplipy.util.changes.Change` objects (all of the changes detected in a
+        single system update) as a parameter.
+
+        Args:
+            callback: The callback to execute.
+
+        Returns:
+            A callable to cancel the callback.
+        """
+        self._callbacks.append(callback)
+
+        def remove() -> None:
+            """Remove the callback."""
+            self._callbacks.remove(callback)
+            for executor in self._executors:
+                executor.forget(callback)
+
+        return remove
+
+    def check(self, system_id: int, serial: str | None, payload: Any) -> bool:
+        """Store the hash of an object's raw payload and return whether it changed.
+
+        Args:
+            system_id: The system ID.
+            serial: The device serial number (or ``None`` for the system itself).
+            payload: The object's raw payload.
+
+        Returns:
+            Whether the payload changed (or was never seen).
+        """
+        key = (system_id, serial)
+        content_hash = hash(self._dumps(payload))
+        if self._hashes.get(key) == content_hash:
+            return False
+        self._hashes[key] = content_hash
+        return True
+
+    def diff(self, system_id: int, serial: str | None, snapshot: Any) -> list[Change]:
+        """Store an object's latest typed record and return the properties that changed.
+
+        Args:
+            system_id: The system ID.
+            serial: The device serial number (or ``None`` for the system itself).
+            snapshot: The object's typed record (or ``None`` if it couldn't be
+                decoded).
+
+        Returns:
+            The changed properties.
+        """
+        key = (system_id, serial)
+        previous = self._snapshots.get(key)
+        self._snapshots[key] = snapshot
+
+        if (
+            previous is None
+            or snapshot is None
+            or type(previous) is not type(snapshot)
+            or previous == snapshot
+        ):
+            return []
+
+        record_type: type = type(snapshot)
+        return [
+            Change(system_id, serial, name, old, new)
+            for name in get_record_field_names(record_type)
+            if (old := getattr(previous, name)) != (new := getattr(snapshot, name))
+        ]
+
+    def forget(self, system_id: int, serial: str | None) -> None:
+        """Stop tracking a system or device.
+
+        Args:
+            system_id: The system ID.
+            serial: The device serial number (or ``None`` for the system itself).
+        """
+        self._hashes.pop((system_id, serial), None)
+        self._snapshots.pop((system_id, serial), None)
+
+    def publish(self, changes: list[Change], executor: CallbackExecutor) -> None:
+        """Send the changes detected in an update to listeners.
+
+        Args:
+            changes: The detected changes.
+            executor: The executor to run the callbacks with.
+        """
+        if not changes:
+            return
+
+        self._executors.add(executor)
+        for callback in self._callbacks:
+            executor.execute(callback, changes)
@@ -0,0 +1,187 @@
+"""Define a per-endpoint-family circuit breaker for API requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import Enum
+from time import monotonic
+
+from aiohttp import ClientError, ClientResponseError
+
+from simplipy.const import LOGGER
+from simplipy.errors import CircuitOpenError
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RECOVERY_TIMEOUT = 30.0
+
+
+class CircuitState(Enum):
+    """States of a circuit."""
+
+    CLOSED = "closed"
+    HALF_OPEN = "half_open"
+    OPEN = "open"
+
+
+@dataclass
+class _Circuit:
+    """Define the state of a single endpoint family's circuit."""
+
+    state: CircuitState = CircuitState.CLOSED
+    failures: int = 0
+    opened_at: float = 0.0
+    probing: bool = False
+
+
+def is_circuit_failure(err: BaseException) -> bool:
+    """Return whether an error indicates that the SimpliSafe cloud is degraded.
+
+    Connection errors, timeouts, throttling (429), and server errors (5xx) count;
+    other HTTP errors (e.g., an expired access token) mean the server is responsive.
+
+    Args:
+        err: The error raised by a request.
+
+    Returns:
+        Whether the error should count against the circuit.
+    """
+    if isinstance(err, ClientResponseError):
+        return err.status == 429 or err.status >= 500
+    return isinstance(err, (ClientError, asyncio.TimeoutError))
+
+
+class CircuitBreaker:
+    """Define a circuit breaker that tracks each endpoint family separately.
+
+    A circuit opens after ``failure_threshold`` consecutive failures; while it is open,
+    requests fail fast with :meth:`simplipy.errors.CircuitOpenError`. Once
+    ``recovery_timeout`` seconds have passed, the circuit is half-open and lets a
+    single probe request through: if it succeeds, the circuit closes; if it fails, the
+    circuit opens again.
+
+    Args:
+        failure_threshold: The number of consecutive failures that open a circuit.
+        recovery_timeout: The number of seconds an open circuit waits before probing.
+        on_state_change: A callable to run (with the endpoint family and its new state)
+            whenever a circuit changes state.
+    """
+
+    def __init__(
+        self,
+        *,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        recovery_timeout: float = DEFAULT_RECOVERY_TIMEOUT,
+        on_state_change: Callable[[str, CircuitState], None] | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            failure_threshold: The number of consecutive failures that open a
+                circuit.
+            recovery_timeout: The number of seconds an open circuit waits before
+                probing.
+            on_state_change: A callable to run (with the endpoint family and its new
+                state) whenever a circuit changes state.
+        """
+        self._circuits: dict[str, _Circuit] = {}
+        self._failure_threshold = failure_threshold
+        self._on_state_change = on_state_change
+        self._recovery_timeout = recovery_timeout
+
+    @property
+    def states(self) -> dict[str, CircuitState]:
+        """Return the state of every circuit that has seen a request.
+
+        Returns:
+            A mapping of endpoint family to circuit state.
+        """
+        return {family: circuit.state for family, circuit in self._circuits.items()}
+
+    def _set_state(self, family: str, circuit: _Circuit, state: CircuitState) -> None:
+        """Change the state of a circuit.
+
+        Args:
+            family: The endpoint family.
+            circuit: The circuit to change.
+            state: The new state.
+        """
+        if circuit.state == state:
+            return
+
+        LOGGER.info("Circuit for %s endpoints is now %s", family, state.value)
+        circuit.state = state
+        if state == CircuitState.OPEN:
+            circuit.opened_at = monotonic()
+        if self._on_state_change:
+            self._on_state_change(family, state)
+
+    def before_request(self, family: str) -> None:
+        """Check whether a request to an endpoint family may proceed.
+
+        Args:
+            family: The endpoint family.
+
+        Raises:
+            CircuitOpenError: Raised when the circuit is open.
+        """
+        circuit = self._circuits.setdefault(family, _Circuit())
+
+        if (
+            circuit.state == CircuitState.OPEN
+            and monotonic() - circuit.opened_at >= self._recovery_timeout
+        ):
+            self._set_state(family, circuit, CircuitState.HALF_OPEN)
+
+        if circuit.state == CircuitState.OPEN or (
+            circuit.state == CircuitState.HALF_OPEN and circuit.probing
+        ):
+            raise CircuitOpenError(f"Requests to {family} endpoints are failing fast")
+
+        circuit.probing = circuit.state == CircuitState.HALF_OPEN
+
+    def record_outcome(self, family: str, err: BaseException | None = None) -> None:
+        """Record the outcome of a request that was allowed through.
+
+        Args:
+            family: The endpoint family.
+            err: The error raised by the request (if any).
+        """
+        circuit = self._circuits[family]
+        circuit.probing = False
+
+        if err is not None and not isinstance(err, Exception):
+            # A cancelled request says nothing about the server's health:
+            return
+
+        if err is not None and is_circuit_failure(err):
+            circuit.failures += 1
+            if (
+                circuit.state == CircuitState.HALF_OPEN
+                or circuit.failures >= self._failure_threshold
+            ):
+                self._set_state(family, circuit, CircuitState.OPEN)
+            return
+
+        circuit.failures = 0
+        self._set_state(family, circuit, CircuitState.CLOSED)
+
+    @contextmanager
+    def guard(self, family: str) -> Iterator[None]:
+        """Let a request to an endpoint family through and record its outcome.
+
+        Args:
+            family: The endpoint family.
+
+        Yields:
+            Nothing.
+        """
+        self.before_request(family)
+        try:
+            yield
+        except BaseException as err:
+            self.record_outcome(family, err)
+            raise
+        self.record_outcome(family)
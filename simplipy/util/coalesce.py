@@ -0,0 +1,111 @@
+"""Define a mechanism to coalesce identical, concurrent requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from copy import deepcopy
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+_T = TypeVar("_T")
+
+
+@dataclass
+class CoalescingStats:
+    """Define counters that describe request coalescing."""
+
+    requests: int = 0
+    coalesced: int = 0
+    in_flight: int = 0
+
+
+def get_request_key(
+    method: str, endpoint: str, kwargs: dict[str, Any]
+) -> Hashable | None:
+    """Get a key that identifies a coalescable request (if one can be made).
+
+    Only requests that are fully described by their method, endpoint, URL base and
+    query parameters are considered; anything that carries a body or custom headers
+    is never coalesced.
+
+    Args:
+        method: An HTTP method.
+        endpoint: A relative API endpoint.
+        kwargs: The additional kwargs that will be sent with the request.
+
+    Returns:
+        A hashable key (or ``None`` if the request can't be coalesced).
+    """
+    if method.lower() != "get" or set(kwargs) - {"params", "url_base"}:
+        return None
+
+    params = kwargs.get("params") or {}
+
+    try:
+        return (
+            method.lower(),
+            kwargs.get("url_base"),
+            endpoint,
+            frozenset(params.items()),
+        )
+    except TypeError:
+        return None
+
+
+class RequestCoalescer(Generic[_T]):  # pylint: disable=too-few-public-methods
+    """Define an object that shares one in-flight request among identical callers.
+
+    The first caller for a particular key starts the request; any other caller that
+    arrives with the same key before that request finishes awaits the same result (or
+    exception). Each joining caller receives its own (deep) copy of the result, so a
+    caller that modifies its response can't change what the others see.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._in_flight: dict[Hashable, asyncio.Task[_T]] = {}
+        self.stats = CoalescingStats()
+
+    def _on_done(self, key: Hashable, task: asyncio.Task[_T]) -> None:
+        """Clean up after an in-flight request finishes.
+
+        Args:
+            key: The request key.
+            task: The finished task.
+        """
+        if self._in_flight.get(key) is task:
+            self._in_flight.pop(key)
+            self.stats.in_flight = len(self._in_flight)
+
+        # Mark the exception as retrieved so that it isn't logged when every caller
+        # was cancelled before it could see it:
+        if not task.cancelled():
+            task.exception()
+
+    async def async_run(
+        self, key: Hashable, request_func: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Run a request, joining an identical in-flight one if it exists.
+
+        Args:
+            key: The request key.
+            request_func: A callable that performs the request.
+
+        Returns:
+            The request result.
+        """
+        self.stats.requests += 1
+
+        if (task := self._in_flight.get(key)) is not None:
+            self.stats.coalesced += 1
+            return deepcopy(await asyncio.shield(task))
+
+        task = asyncio.create_task(request_func())  # type: ignore[arg-type]
+        self._in_flight[key] = task
+        self.stats.in_flight = len(self._in_flight)
+        task.add_done_callback(lambda t: self._on_done(key, t))
+
+        # Shield the shared task so that one caller being cancelled doesn't cancel
+        # the request for everyone else:
+        return await asyncio.shield(task)
@@ -0,0 +1,108 @@
+"""Define pluggable JSON codecs for REST and websocket payloads."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Any
+
+
+@dataclass(frozen=True)
+class JsonCodec:
+    """Define a JSON codec.
+
+    ``loads`` must accept ``bytes`` or ``str`` and raise a ``ValueError`` (or
+    subclass) on invalid input; ``dumps`` must return a ``str``.
+    """
+
+    name: str
+    loads: Callable[[bytes | str], Any]
+    dumps: Callable[[Any], str]
+
+
+STDLIB_CODEC = JsonCodec("json", json.loads, json.dumps)
+
+
+def _get_orjson_codec() -> JsonCodec | None:
+    """Get a codec backed by ``orjson`` (if it is installed).
+
+    Returns:
+        A codec (or ``None`` if ``orjson`` isn't installed).
+    """
+    try:
+        orjson = import_module("orjson")
+    except ImportError:
+        return None
+
+    def dumps(obj: Any) -> str:
+        """Serialize an object to a JSON string.
+
+        Args:
+            obj: The object to serialize.
+
+        Returns:
+            A JSON string.
+        """
+        return str(orjson.dumps(obj).decode())
+
+    return JsonCodec("orjson", orjson.loads, dumps)
+
+
+def _get_msgspec_codec() -> JsonCodec | None:
+    """Get a codec backed by ``msgspec`` (if it is installed).
+
+    Returns:
+        A codec (or ``None`` if ``msgspec`` isn't installed).
+    """
+    try:
+        msgspec_json = import_module("msgspec.json")
+    except ImportError:
+        return None
+
+    decoder = msgspec_json.Decoder()
+    encoder = msgspec_json.Encoder()
+
+    def dumps(obj: Any) -> str:
+        """Serialize an object to a JSON string.
+
+        Args:
+            obj: The object to serialize.
+
+        Returns:
+            A JSON string.
+        """
+        return str(encoder.encode(obj).decode())
+
+    return JsonCodec("msgspec", decoder.decode, dumps)
+
+
+def get_codec(name: str | None = None) -> JsonCodec:
+    """Get a JSON codec.
+
+    If no name is provided, the fastest installed codec is returned: ``orjson``, then
+    ``msgspec``, then the standard library's ``json`` module.
+
+    Args:
+        name: The name of a codec ("orjson", "msgspec", or "json").
+
+    Returns:
+        A codec.
+
+    Raises:
+        ValueError: Raised when the requested codec isn't installed or doesn't exist.
+    """
+    if name is None:
+        return _get_orjson_codec() or _get_msgspec_codec() or STDLIB_CODEC
+
+    factories: dict[str, Callable[[], JsonCodec | None]] = {
+        "orjson": _get_orjson_codec,
+        "msgspec": _get_msgspec_codec,
+        STDLIB_CODEC.name: lambda: STDLIB_CODEC,
+    }
+
+    if name not in factories or (codec := factories[name]()) is None:
+        raise ValueError(f"JSON codec is unavailable: {name}")
+
+    return codec
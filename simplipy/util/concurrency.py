@@ -0,0 +1,51 @@
+"""Define helpers for running coroutines concurrently."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any, TypeVar
+
+_KeyT = TypeVar("_KeyT")
+_ValueT = TypeVar("_ValueT")
+
+
+async def async_run_isolated(
+    items: Mapping[_KeyT, _ValueT],
+    func: Callable[[_ValueT], Awaitable[Any]],
+    *,
+    max_concurrency: int | None = None,
+) -> dict[_KeyT, BaseException]:
+    """Run a coroutine function for every value of a mapping concurrently.
+
+    Failures are isolated: an exception raised for one value doesn't stop the others
+    from finishing; instead, it is returned under that value's key.
+
+    Args:
+        items: The mapping whose values to run the coroutine function for.
+        func: The coroutine function.
+        max_concurrency: The maximum number of values to run at once (``None`` means
+            no limit).
+
+    Returns:
+        A mapping of key to exception (for every value that failed).
+    """
+    semaphore = asyncio.Semaphore(max_concurrency or len(items) or 1)
+
+    async def async_run(value: _ValueT) -> None:
+        """Run the coroutine function for a single value.
+
+        Args:
+            value: The value to run for.
+        """
+        async with semaphore:
+            await func(value)
+
+    results = await asyncio.gather(
+        *[async_run(value) for value in items.values()], return_exceptions=True
+    )
+    return {
+        key: result
+        for key, result in zip(list(items), results)
+        if isinstance(result, BaseException)
+    }
@@ -0,0 +1,93 @@
+"""Define a bounded window for suppressing duplicate events."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import dataclass
+from time import monotonic
+
+DEFAULT_DEDUP_MAX_AGE = 3600.0
+DEFAULT_DEDUP_MAX_ENTRIES = 1000
+
+
+@dataclass
+class DedupStats:
+    """Define counters that describe duplicate suppression."""
+
+    checked: int = 0
+    suppressed: int = 0
+    evictions: int = 0
+    entries: int = 0
+
+
+class DedupWindow:
+    """Define a window of recently seen keys (e.g., event fingerprints).
+
+    A key is a duplicate if it was first seen less than ``max_age`` seconds ago. Keys
+    are remembered in the order they were first seen, so the oldest are evicted first
+    once they age out or once more than ``max_entries`` are remembered; membership
+    checks and evictions are O(1).
+
+    Args:
+        max_age: The number of seconds to remember a key for.
+        max_entries: The maximum number of keys to remember.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_age: float = DEFAULT_DEDUP_MAX_AGE,
+        max_entries: int = DEFAULT_DEDUP_MAX_ENTRIES,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            max_age: The number of seconds to remember a key for.
+            max_entries: The maximum number of keys to remember.
+        """
+        self._seen: OrderedDict[Hashable, float] = OrderedDict()
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.stats = DedupStats()
+
+    def _evict(self, now: float) -> None:
+        """Evict keys that have aged out (or that exceed the maximum count).
+
+        Args:
+            now: The current (monotonic) time.
+        """
+        while self._seen and (
+            len(self._seen) > self.max_entries
+            or next(iter(self._seen.values())) <= now - self.max_age
+        ):
+            self._seen.popitem(last=False)
+            self.stats.evictions += 1
+
+        self.stats.entries = len(self._seen)
+
+    def check(self, key: Hashable) -> bool:
+        """Record a key and return whether it is new.
+
+        Args:
+            key: The key to check.
+
+        Returns:
+            Whether the key wasn't seen within the window (i.e., isn't a duplicate).
+        """
+        now = monotonic()
+        self._evict(now)
+        self.stats.checked += 1
+
+        if key in self._seen:
+            self.stats.suppressed += 1
+            return False
+
+        self._seen[key] = now
+        self._evict(now)
+        return True
+
+    def clear(self) -> None:
+        """Forget every key."""
+        self._seen.clear()
+        self.stats.entries = 0
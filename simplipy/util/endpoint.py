@@ -0,0 +1,71 @@
+"""Define utilities to classify SimpliSafe API endpoints."""
+
+from __future__ import annotations
+
+from typing import Final
+
+ENDPOINT_FAMILY_AUTH: Final = "auth"
+ENDPOINT_FAMILY_DOORLOCK: Final = "doorlock"
+ENDPOINT_FAMILY_EVENTS: Final = "events"
+ENDPOINT_FAMILY_MEDIA: Final = "media"
+ENDPOINT_FAMILY_MESSAGES: Final = "messages"
+ENDPOINT_FAMILY_OTHER: Final = "other"
+ENDPOINT_FAMILY_PINS: Final = "pins"
+ENDPOINT_FAMILY_SENSORS: Final = "sensors"
+ENDPOINT_FAMILY_SETTINGS: Final = "settings"
+ENDPOINT_FAMILY_STATE: Final = "state"
+ENDPOINT_FAMILY_SUBSCRIPTIONS: Final = "subscriptions"
+
+# When walking an endpoint's path from the end, the first segment found in this set
+# determines the family (e.g., "settings/pins" is a PIN endpoint, while
+# "settings/normal" is a settings endpoint):
+_FAMILY_SEGMENTS = {
+    ENDPOINT_FAMILY_EVENTS,
+    ENDPOINT_FAMILY_MESSAGES,
+    ENDPOINT_FAMILY_PINS,
+    ENDPOINT_FAMILY_SENSORS,
+    ENDPOINT_FAMILY_SETTINGS,
+    ENDPOINT_FAMILY_STATE,
+    ENDPOINT_FAMILY_SUBSCRIPTIONS,
+}
+
+
+def get_endpoint_family(endpoint: str) -> str:
+    """Get the family that a relative API endpoint belongs to.
+
+    Args:
+        endpoint: A relative API endpoint (e.g., ``ss3/subscriptions/123/sensors``).
+
+    Returns:
+        The endpoint family.
+    """
+    segments = endpoint.strip("/").split("/")
+
+    if segments[0] == "oauth":
+        return ENDPOINT_FAMILY_AUTH
+    if segments[0] == "doorlock":
+        return ENDPOINT_FAMILY_DOORLOCK
+
+    for segment in reversed(segments):
+        if segment in _FAMILY_SEGMENTS:
+            return segment
+
+    return ENDPOINT_FAMILY_OTHER
+
+
+def get_system_id(endpoint: str) -> int | None:
+    """Get the system ID that a relative API endpoint refers to (if any).
+
+    Args:
+        endpoint: A relative API endpoint (e.g., ``ss3/subscriptions/123/sensors``).
+
+    Returns:
+        The system ID (or ``None`` if the endpoint isn't system-specific).
+    """
+    segments = endpoint.strip("/").split("/")
+
+    for idx, segment in enumerate(segments[:-1]):
+        if segment in ("doorlock", "subscriptions") and segments[idx + 1].isdigit():
+            return int(segments[idx + 1])
+
+    return None
@@ -0,0 +1,238 @@
+"""Define secondary indexes over the devices of every system."""
+
+from __future__ import annotations
+
+from enum import Enum
+from typing import TYPE_CHECKING
+
+from simplipy.device import DeviceTypes
+from simplipy.device.camera import Camera
+from simplipy.device.lock import Lock, LockStates
+from simplipy.errors import SimplipyError
+
+if TYPE_CHECKING:
+    from simplipy.device import Device
+    from simplipy.system import System
+
+
+class DeviceFlags(Enum):
+    """Define status flags that devices can be indexed by."""
+
+    ERROR = "error"
+    LOCK_JAMMED = "lock_jammed"
+    LOW_BATTERY = "low_battery"
+    OFFLINE = "offline"
+    TRIGGERED = "triggered"
+
+
+# The device properties that correspond to each (non-lock-specific) flag:
+FLAG_PROPERTIES = {
+    DeviceFlags.ERROR: "error",
+    DeviceFlags.LOW_BATTERY: "low_battery",
+    DeviceFlags.OFFLINE: "offline",
+    DeviceFlags.TRIGGERED: "triggered",
+}
+
+
+def get_device_flags(device: Device) -> frozenset[DeviceFlags]:
+    """Get the status flags that are currently set on a device.
+
+    Properties that a device doesn't have (or whose value can't be determined from its
+    data) don't set a flag.
+
+    Args:
+        device: A device.
+
+    Returns:
+        The set flags.
+    """
+    # Camera data lives in the subscription (not alongside other devices), so cameras
+    # have no status flags:
+    if isinstance(device, Camera):
+        return frozenset()
+
+    flags: set[DeviceFlags] = set()
+
+    for flag, name in FLAG_PROPERTIES.items():
+        try:
+            if getattr(device, name, False) is True:
+                flags.add(flag)
+        except (KeyError, SimplipyError):
+            continue
+
+    if isinstance(device, Lock):
+        try:
+            if device.lock_low_battery:
+                flags.add(DeviceFlags.LOW_BATTERY)
+            if device.state == LockStates.JAMMED:
+                flags.add(DeviceFlags.LOCK_JAMMED)
+        except KeyError:
+            pass
+
+    return frozenset(flags)
+
+
+class DeviceIndex:
+    """Define indexes over the devices of every system.
+
+    Devices are indexed by serial number, by device type, and by the status flags that
+    are currently set on them; each system's entries are replaced whenever that system
+    updates. Queries only touch matching devices (rather than scanning every device of
+    every system).
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._by_flag: dict[DeviceFlags, dict[tuple[int, str], Device]] = {
+            flag: {} for flag in DeviceFlags
+        }
+        self._by_serial: dict[str, tuple[System, Device]] = {}
+        self._by_type: dict[DeviceTypes, dict[tuple[int, str], Device]] = {
+            device_type: {} for device_type in DeviceTypes
+        }
+        self._entries: dict[int, dict[str, tuple[Device, frozenset[DeviceFlags]]]] = {}
+
+    def _add(
+        self,
+        system: System,
+        serial: str,
+        device: Device,
+        flags: frozenset[DeviceFlags],
+    ) -> None:
+        """Add a device to the indexes.
+
+        Args:
+            system: The system the device belongs to.
+            serial: The device serial number.
+            device: The device.
+            flags: The status flags set on the device.
+        """
+        key = (system.system_id, serial)
+        self._by_serial[serial] = (system, device)
+        self._by_type[device.type][key] = device
+        for flag in flags:
+            self._by_flag[flag][key] = device
+
+    def _remove(
+        self,
+        system_id: int,
+        serial: str,
+        device: Device,
+        flags: frozenset[DeviceFlags],
+    ) -> None:
+        """Remove a device from the indexes.
+
+        Args:
+            system_id: The ID of the system the device belongs to.
+            serial: The device serial number.
+            device: The device.
+            flags: The status flags that were set on the device.
+        """
+        key = (system_id, serial)
+        if (entry := self._by_serial.get(serial)) and entry[1] is device:
+            self._by_serial.pop(serial)
+        self._by_type[device.type].pop(key, None)
+        for flag in flags:
+            self._by_flag[flag].pop(key, None)
+
+    def get_device(self, serial: str) -> tuple[System, Device] | None:
+        """Get a device (and the system it belongs to) by serial number.
+
+        Args:
+            serial: The device serial number.
+
+        Returns:
+            A (system, device) tuple (or ``None`` if the device isn't known).
+        """
+        return self._by_serial.get(serial)
+
+    def get_system_device(self, system_id: int, serial: str) -> Device | None:
+        """Get a device of a particular system by serial number.
+
+        Args:
+            system_id: The ID of the system the device belongs to.
+            serial: The device serial number.
+
+        Returns:
+            The device (or ``None`` if the system has no such device).
+        """
+        if entry := self._entries.get(system_id, {}).get(serial):
+            return entry[0]
+        return None
+
+    def get_devices(
+        self,
+        *,
+        device_type: DeviceTypes | None = None,
+        flag: DeviceFlags | None = None,
+    ) -> list[Device]:
+        """Get the devices that match a device type and/or a status flag.
+
+        Args:
+            device_type: The device type to match.
+            flag: The status flag to match.
+
+        Returns:
+            The matching devices.
+        """
+        candidates = [
+            index
+            for index in (
+                None if device_type is None else self._by_type[device_type],
+                None if flag is None else self._by_flag[flag],
+            )
+            if index is not None
+        ]
+
+        if not candidates:
+            return [device for _, device in self._by_serial.values()]
+
+        smallest, *others = sorted(candidates, key=len)
+        return [
+            device
+            for key, device in smallest.items()
+            if all(key in other for other in others)
+        ]
+
+    def index_device(self, system: System, serial: str, device: Device) -> None:
+        """Add (or re-index) a single device of a system.
+
+        Args:
+            system: The system the device belongs to.
+            serial: The device serial number.
+            device: The device.
+        """
+        entries = self._entries.setdefault(system.system_id, {})
+        entry = (device, get_device_flags(device))
+        if (previous := entries.get(serial)) == entry:
+            return
+        if previous:
+            self._remove(system.system_id, serial, *previous)
+        self._add(system, serial, *entry)
+        entries[serial] = entry
+
+    def index_system(self, system: System, devices: dict[str, Device]) -> None:
+        """Replace a system's entries with its current devices.
+
+        Only devices that are new, or whose status flags changed, are re-indexed.
+
+        Args:
+            system: The system to index.
+            devices: A dictionary of serial number to device for every device of the
+                system.
+        """
+        for serial, device in devices.items():
+            self.index_device(system, serial, device)
+
+        entries = self._entries.get(system.system_id, {})
+        for serial in [serial for serial in entries if serial not in devices]:
+            self._remove(system.system_id, serial, *entries.pop(serial))
+
+    def remove_system(self, system_id: int) -> None:
+        """Remove all of a system's entries.
+
+        Args:
+            system_id: The ID of the system to remove.
+        """
+        for serial, entry in self._entries.pop(system_id, {}).items():
+            self._remove(system_id, serial, *entry)
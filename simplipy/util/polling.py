@@ -0,0 +1,224 @@
+"""Define an adaptive polling scheduler for systems."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from time import monotonic
+from typing import TYPE_CHECKING
+
+from simplipy.const import LOGGER
+from simplipy.system import SystemStates
+from simplipy.util.scheduler import RequestPriority, request_priority
+
+if TYPE_CHECKING:
+    from simplipy.system import System
+
+DEFAULT_ACTIVE_INTERVAL = 5.0
+DEFAULT_IDLE_INTERVAL = 60.0
+DEFAULT_JITTER = 0.1
+DEFAULT_MAX_ERROR_INTERVAL = 1800.0
+DEFAULT_QUIET_AFTER = 300.0
+DEFAULT_QUIET_INTERVAL = 900.0
+
+# System states that can change again within seconds (e.g., an entry delay that turns
+# into an alarm):
+ACTIVE_SYSTEM_STATES = frozenset(
+    {
+        SystemStates.ALARM,
+        SystemStates.ALARM_COUNT,
+        SystemStates.AWAY_COUNT,
+        SystemStates.ENTRY_DELAY,
+        SystemStates.EXIT_DELAY,
+        SystemStates.HOME_COUNT,
+    }
+)
+
+
+@dataclass(frozen=True)
+class PollingPolicy:
+    """Define how often each system is refreshed.
+
+    A system is refreshed every ``active_interval`` seconds while it is in an active
+    state (e.g., an entry/exit delay or an alarm). Otherwise, it is refreshed every
+    ``idle_interval`` seconds, or every ``quiet_interval`` seconds when the websocket is
+    connected and hasn't delivered an event for the system in ``quiet_after`` seconds
+    (since the websocket reports changes as they happen). After failed refreshes, the
+    interval doubles with each consecutive failure (capped at ``max_error_interval``).
+    Every interval is randomized by up to ``jitter`` (as a fraction) so that the
+    refreshes of many systems don't line up.
+    """
+
+    active_interval: float = DEFAULT_ACTIVE_INTERVAL
+    idle_interval: float = DEFAULT_IDLE_INTERVAL
+    quiet_interval: float = DEFAULT_QUIET_INTERVAL
+    quiet_after: float = DEFAULT_QUIET_AFTER
+    max_error_interval: float = DEFAULT_MAX_ERROR_INTERVAL
+    jitter: float = DEFAULT_JITTER
+
+    def get_interval(
+        self,
+        *,
+        state: SystemStates,
+        errors: int,
+        websocket_connected: bool,
+        idle_for: float | None,
+    ) -> float:
+        """Get the number of seconds to wait before the next refresh (without jitter).
+
+        Args:
+            state: The current state of the system.
+            errors: The number of consecutive failed refreshes.
+            websocket_connected: Whether the websocket is connected.
+            idle_for: The number of seconds since the websocket last delivered an event
+                for the system (or ``None`` if it never has).
+
+        Returns:
+            The number of seconds to wait.
+        """
+        if errors:
+            return min(
+                self.idle_interval * 2.0 ** (errors - 1), self.max_error_interval
+            )
+
+        if state in ACTIVE_SYSTEM_STATES:
+            return self.active_interval
+
+        if websocket_connected and (idle_for is None or idle_for >= self.quiet_after):
+            return self.quiet_interval
+
+        return self.idle_interval
+
+
+class Poller:
+    """Define a scheduler that keeps refreshing a set of systems.
+
+    Each system is refreshed by its own task, at an interval set by a
+    :meth:`simplipy.util.polling.PollingPolicy`. A websocket event for a system
+    triggers a refresh of that system after ``active_interval`` seconds (so that its
+    full state catches up with the event). If a system can't be updated yet (see
+    :meth:`simplipy.system.System.get_update_delay`), its refresh is deferred until it
+    can rather than skipped.
+
+    Args:
+        policy: The polling policy to use.
+        is_websocket_connected: A callable that returns whether the websocket is
+            connected.
+    """
+
+    def __init__(
+        self, *, policy: PollingPolicy, is_websocket_connected: Callable[[], bool]
+    ) -> None:
+        """Initialize.
+
+        Args:
+            policy: The polling policy to use.
+            is_websocket_connected: A callable that returns whether the websocket is
+                connected.
+        """
+        self._canceled_tasks: set[asyncio.Task[None]] = set()
+        self._is_websocket_connected = is_websocket_connected
+        self._last_event: dict[int, float] = {}
+        self._tasks: dict[int, tuple[System, asyncio.Task[None]]] = {}
+        self._wake_events: dict[int, asyncio.Event] = {}
+        self.policy = policy
+
+    def _get_interval(self, system: System, errors: int) -> float:
+        """Get the (randomized) number of seconds to wait before refreshing a system.
+
+        Args:
+            system: The system.
+            errors: The number of consecutive failed refreshes.
+
+        Returns:
+            The number of seconds to wait.
+        """
+        last_event = self._last_event.get(system.system_id)
+        interval = self.policy.get_interval(
+            state=system.state,
+            errors=errors,
+            websocket_connected=self._is_websocket_connected(),
+            idle_for=None if last_event is None else monotonic() - last_event,
+        )
+        return interval * random.uniform(1 - self.policy.jitter, 1 + self.policy.jitter)
+
+    async def _async_poll(self, system: System) -> None:
+        """Keep refreshing a system.
+
+        Args:
+            system: The system to refresh.
+        """
+        errors = 0
+        wake_event = self._wake_events.setdefault(system.system_id, asyncio.Event())
+
+        while True:
+            try:
+                await asyncio.wait_for(
+                    wake_event.wait(), self._get_interval(system, errors)
+                )
+            except asyncio.TimeoutError:
+                pass
+            else:
+                # Give the SimpliSafe cloud a moment to catch up with the event:
+                await asyncio.sleep(self.policy.active_interval)
+
+            wake_event.clear()
+
+            try:
+                with request_priority(RequestPriority.BACKGROUND):
+                    await system.async_update(defer=True)
+            except Exception as err:  # pylint: disable=broad-except
+                # Any failure (even one that the library doesn't wrap, like a dropped
+                # connection) just backs off; the poller keeps going:
+                errors += 1
+                LOGGER.warning(
+                    "Error while refreshing system %s: %s", system.system_id, err
+                )
+            else:
+                errors = 0
+
+    def record_event(self, system_id: int) -> None:
+        """Record websocket activity for a system (which triggers a refresh).
+
+        Args:
+            system_id: The ID of the system the event belongs to.
+        """
+        self._last_event[system_id] = monotonic()
+        if wake_event := self._wake_events.get(system_id):
+            wake_event.set()
+
+    async def async_stop(self) -> None:
+        """Stop refreshing every system and wait for the refresh tasks to finish."""
+        self.stop()
+        tasks = list(self._canceled_tasks)
+        self._canceled_tasks.clear()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stop(self) -> None:
+        """Stop refreshing every system (without waiting for the refresh tasks)."""
+        self.track({})
+
+    def track(self, systems: Mapping[int, System]) -> None:
+        """Refresh exactly the given systems (starting and stopping tasks as needed).
+
+        Args:
+            systems: A dictionary of system ID to system.
+        """
+        for system_id, (system, task) in list(self._tasks.items()):
+            if systems.get(system_id) is not system:
+                task.cancel()
+                # Hold on to the canceled task until it finishes, so that
+                # async_stop can wait for it:
+                self._canceled_tasks.add(task)
+                task.add_done_callback(self._canceled_tasks.discard)
+                self._tasks.pop(system_id)
+                self._wake_events.pop(system_id, None)
+
+        for system_id, system in systems.items():
+            if system_id not in self._tasks:
+                self._tasks[system_id] = (
+                    system,
+                    asyncio.create_task(self._async_poll(system)),
+                )
@@ -0,0 +1,171 @@
+"""Define a client-side, token-bucket rate limiter for API requests."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from time import monotonic
+
+from simplipy.util.endpoint import (
+    ENDPOINT_FAMILY_DOORLOCK,
+    ENDPOINT_FAMILY_EVENTS,
+    ENDPOINT_FAMILY_SENSORS,
+    ENDPOINT_FAMILY_SETTINGS,
+    ENDPOINT_FAMILY_SUBSCRIPTIONS,
+    get_endpoint_family,
+)
+
+RATE_LIMIT_GLOBAL = "global"
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Define a token-bucket budget.
+
+    ``rate`` is the sustained number of requests per second; ``burst`` is the number of
+    requests that can be made at once after a quiet period.
+    """
+
+    rate: float
+    burst: int
+
+
+DEFAULT_GLOBAL_RATE_LIMIT = RateLimit(5.0, 10)
+DEFAULT_FAMILY_RATE_LIMITS = {
+    ENDPOINT_FAMILY_DOORLOCK: RateLimit(1.0, 2),
+    ENDPOINT_FAMILY_EVENTS: RateLimit(1.0, 3),
+    ENDPOINT_FAMILY_SENSORS: RateLimit(2.0, 5),
+    ENDPOINT_FAMILY_SETTINGS: RateLimit(1.0, 3),
+    ENDPOINT_FAMILY_SUBSCRIPTIONS: RateLimit(1.0, 3),
+}
+
+
+@dataclass
+class RateLimiterStats:
+    """Define counters that describe how a rate limit budget is used."""
+
+    requests: int = 0
+    delayed: int = 0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+class TokenBucket:  # pylint: disable=too-few-public-methods
+    """Define a token bucket that queues (rather than rejects) excess requests.
+
+    Each request reserves a token immediately (letting the balance go negative) and
+    then waits until that token would have been refilled; this serves requests in the
+    order they arrive.
+
+    Args:
+        limit: The budget for this bucket.
+    """
+
+    def __init__(self, limit: RateLimit) -> None:
+        """Initialize.
+
+        Args:
+            limit: The budget for this bucket.
+        """
+        self._limit = limit
+        self._tokens = float(limit.burst)
+        self._updated = monotonic()
+        self.stats = RateLimiterStats()
+
+    def _reserve(self) -> float:
+        """Reserve a token.
+
+        Returns:
+            The number of seconds to wait before the token is available.
+        """
+        now = monotonic()
+        self._tokens = min(
+            float(self._limit.burst),
+            self._tokens + (now - self._updated) * self._limit.rate,
+        )
+        self._updated = now
+        self._tokens -= 1
+        return max(0.0, -self._tokens / self._limit.rate)
+
+    async def async_acquire(self) -> None:
+        """Wait until a request fits within the budget."""
+        delay = self._reserve()
+        self.stats.requests += 1
+
+        if not delay:
+            return
+
+        self.stats.delayed += 1
+        self.stats.queue_depth += 1
+        self.stats.max_queue_depth = max(
+            self.stats.max_queue_depth, self.stats.queue_depth
+        )
+
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            # Give the token back so that a cancelled request doesn't eat the budget:
+            self._tokens += 1
+            raise
+        finally:
+            self.stats.queue_depth -= 1
+
+        self.stats.total_wait += delay
+        self.stats.max_wait = max(self.stats.max_wait, delay)
+
+
+class RateLimiter:
+    """Define a rate limiter with a global budget and per-endpoint-family budgets.
+
+    Every request counts against the global budget and (if one is defined) the budget
+    of its endpoint family (e.g., ``subscriptions``, ``sensors``). Requests that exceed
+    a budget are queued in the order they were made, not rejected.
+
+    Args:
+        global_limit: The budget shared by every request.
+        family_limits: A mapping of endpoint family to budget.
+    """
+
+    def __init__(
+        self,
+        *,
+        global_limit: RateLimit = DEFAULT_GLOBAL_RATE_LIMIT,
+        family_limits: dict[str, RateLimit] | None = None,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            global_limit: The budget shared by every request.
+            family_limits: A mapping of endpoint family to budget.
+        """
+        if family_limits is None:
+            family_limits = DEFAULT_FAMILY_RATE_LIMITS
+
+        self._global_bucket = TokenBucket(global_limit)
+        self._family_buckets = {
+            family: TokenBucket(limit) for family, limit in family_limits.items()
+        }
+
+    @property
+    def stats(self) -> dict[str, RateLimiterStats]:
+        """Return counters for each budget.
+
+        Returns:
+            A mapping of endpoint family (or ``"global"``) to counters.
+        """
+        return {
+            RATE_LIMIT_GLOBAL: self._global_bucket.stats,
+            **{family: bucket.stats for family, bucket in self._family_buckets.items()},
+        }
+
+    async def async_acquire(self, endpoint: str) -> None:
+        """Wait until a request to an endpoint fits within every applicable budget.
+
+        Args:
+            endpoint: A relative API endpoint.
+        """
+        if bucket := self._family_buckets.get(get_endpoint_family(endpoint)):
+            await bucket.async_acquire()
+        await self._global_bucket.async_acquire()
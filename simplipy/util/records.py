@@ -0,0 +1,188 @@
+"""Define typed records that are decoded from raw API payloads."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import fields
+from functools import cache, wraps
+from typing import TYPE_CHECKING, Any, ClassVar, TypeVar, cast
+
+from simplipy.const import LOGGER
+
+if TYPE_CHECKING:
+    from simplipy.util.changes import Change, ChangeTracker
+
+_DecodableT = TypeVar("_DecodableT", bound="Decodable")
+_ReturnT = TypeVar("_ReturnT")
+
+
+@cache
+def get_record_field_names(record_type: type) -> tuple[str, ...]:
+    """Get the field names of a record type.
+
+    Args:
+        record_type: A dataclass type.
+
+    Returns:
+        The names of its fields.
+    """
+    return tuple(field.name for field in fields(record_type))
+
+
+class Decodable:  # pylint: disable=too-few-public-methods
+    """Define a mixin for objects whose properties can be decoded into a record.
+
+    A subclass sets ``_record_type`` to a ``__slots__`` dataclass whose fields are
+    named after the properties they hold. Once a record has been decoded, properties
+    decorated with :meth:`simplipy.util.records.from_record` read it instead of walking
+    the raw payload.
+    """
+
+    _record: Any = None
+    _record_type: ClassVar[type | None] = None
+
+    def _decode_record(self) -> Any:
+        """Decode a record from the raw payload (without storing it).
+
+        Returns:
+            A record (or ``None`` if the raw payload is missing data that a property
+            requires).
+
+        Raises:
+            AttributeError: Raised when a record field has no matching property.
+        """
+        if (record_type := self._record_type) is None:
+            return None
+
+        # Properties must read the raw payload while the record is being built:
+        self._record = None
+
+        try:
+            return record_type(  # pylint: disable=not-callable
+                *[
+                    self._read_record_field(name)
+                    for name in get_record_field_names(record_type)
+                ]
+            )
+        except (KeyError, TypeError, ValueError) as err:
+            LOGGER.debug("Not decoding a record for %s: %s", self, err)
+            return None
+
+    def _read_record_field(self, name: str) -> Any:
+        """Read the property that a record field holds.
+
+        A property that doesn't apply to this object (e.g., the temperature of a
+        sensor that isn't a temperature sensor) raises ``AttributeError`` and is
+        recorded as ``None``; a field without a matching property is a bug.
+
+        Args:
+            name: The name of the record field.
+
+        Returns:
+            The property's value.
+
+        Raises:
+            AttributeError: Raised when the field has no matching property.
+        """
+        if not hasattr(type(self), name):
+            raise AttributeError(
+                f"{type(self).__name__} has no property for record field {name!r}"
+            )
+
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            return None
+
+    def _get_snapshot(self) -> Any:
+        """Get a record of this object's current properties.
+
+        Returns:
+            A record (or ``None`` if one can't be decoded).
+        """
+        if self._record is not None:
+            return self._record
+        return self._decode_record()
+
+    def _get_payload(self) -> Any:
+        """Get the raw payload that this object's properties read.
+
+        Raises:
+            NotImplementedError: Raises when not implemented.
+        """
+        raise NotImplementedError()
+
+    def _refresh_record(
+        self,
+        enabled: bool,
+        tracker: ChangeTracker | None,
+        system_id: int,
+        serial: str | None,
+    ) -> list[Change]:
+        """Decode (or drop) this object's record, detecting changes along the way.
+
+        If a change tracker is provided and the raw payload hasn't changed since it
+        was last tracked, the existing record is kept as-is.
+
+        Args:
+            enabled: Whether typed decoding is enabled.
+            tracker: The change tracker (if change tracking is enabled).
+            system_id: The ID of the system this object belongs to.
+            serial: The device serial number (or ``None`` for the system itself).
+
+        Returns:
+            The properties that changed.
+        """
+        if tracker is None:
+            self._update_record(enabled)
+            return []
+
+        if (
+            not tracker.check(system_id, serial, self._get_payload())
+            and (self._record is not None) == enabled
+        ):
+            return []
+
+        self._update_record(enabled)
+        return tracker.diff(system_id, serial, self._get_snapshot())
+
+    def _update_record(self, enabled: bool) -> None:
+        """Decode (or drop) this object's record.
+
+        If the raw payload is missing data that a property requires, no record is
+        stored and properties keep reading the raw payload.
+
+        Args:
+            enabled: Whether typed decoding is enabled.
+        """
+        self._record = self._decode_record() if enabled else None
+
+
+def from_record(
+    func: Callable[[_DecodableT], _ReturnT],
+) -> Callable[[_DecodableT], _ReturnT]:
+    """Read a property from an object's decoded record (if it has one).
+
+    Args:
+        func: The property getter to decorate.
+
+    Returns:
+        A decorated property getter.
+    """
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(self: _DecodableT) -> _ReturnT:
+        """Return the record value (falling back to the raw payload).
+
+        Args:
+            self: A :meth:`simplipy.util.records.Decodable` object.
+
+        Returns:
+            The property value.
+        """
+        if (record := self._record) is not None:  # pylint: disable=protected-access
+            return cast(_ReturnT, getattr(record, name))
+        return func(self)
+
+    return wrapper
@@ -0,0 +1,230 @@
+"""Define retry policies for API requests."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable, Coroutine, Iterable
+from dataclasses import dataclass, replace
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from time import monotonic
+from typing import Any, TypeVar
+
+from aiohttp import ClientResponseError
+
+from simplipy.const import LOGGER
+from simplipy.errors import RequestError, RequestTimeoutError
+from simplipy.util.dt import utcnow
+
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 30.0
+DEFAULT_MAX_RETRY_AFTER = 300.0
+DEFAULT_MAX_TRIES = 4
+
+# 401: We catch this, refresh the access token, and retry the original request.
+# 409: SimpliSafe base stations regularly synchronize themselves with the API, which is
+#      where this error can occur; we can't control when/how that happens (e.g., we
+#      might query the API in the middle of a base station update), so it should be
+#      viewed as retryable.
+# 429: The SimpliSafe cloud is throttling us; we wait as long as it asks us to.
+DEFAULT_RETRY_CODES = frozenset({401, 409, 429})
+
+# When fetching media files, you may get a 404 if the media file is not yet available
+# to read. Keep trying however, and it will eventually return a 200.
+DEFAULT_MEDIA_RETRY_CODES = DEFAULT_RETRY_CODES | {404}
+
+RETRY_AFTER_CODES = frozenset({409, 429, 503})
+
+_T = TypeVar("_T")
+
+
+def get_retry_after(err: ClientResponseError) -> float | None:
+    """Get the delay requested by a response's ``Retry-After`` header.
+
+    Args:
+        err: An ``aiohttp`` ``ClientResponseError``.
+
+    Returns:
+        The requested delay (in seconds), or ``None`` if there isn't a valid one.
+    """
+    if err.status not in RETRY_AFTER_CODES or not err.headers:
+        return None
+
+    if (value := err.headers.get("Retry-After")) is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at: datetime = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+
+    return max(0.0, (retry_at - utcnow()).total_seconds())
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Define how a failed request is retried.
+
+    Failed attempts are retried (up to ``max_tries`` attempts in total) when the
+    response has a status in ``retry_codes`` or a 5xx status. Between attempts, the
+    policy waits for as long as a ``Retry-After`` header (on a 409, 429, or 503
+    response) asks, up to ``max_retry_after`` seconds; otherwise, it backs off
+    exponentially from ``base_delay`` (capped at ``max_delay``) with up to a second of
+    random jitter. If ``deadline`` is set, no retry is attempted that would start more
+    than ``deadline`` seconds after the first attempt.
+    """
+
+    max_tries: int = DEFAULT_MAX_TRIES
+    retry_codes: frozenset[int] = DEFAULT_RETRY_CODES
+    base_delay: float = DEFAULT_BASE_DELAY
+    max_delay: float = DEFAULT_MAX_DELAY
+    max_retry_after: float = DEFAULT_MAX_RETRY_AFTER
+    deadline: float | None = None
+
+    def get_delay(self, attempt: int, err: ClientResponseError) -> float:
+        """Get the number of seconds to wait before the next attempt.
+
+        Args:
+            attempt: The number of the attempt that just failed (starting at 1).
+            err: The error raised by that attempt.
+
+        Returns:
+            The delay (in seconds).
+        """
+        if (retry_after := get_retry_after(err)) is not None:
+            return min(self.max_retry_after, retry_after)
+        delay = min(self.max_delay, self.base_delay * 2.0 ** (attempt - 1))
+        return delay + random.random()  # noqa: S311
+
+    def is_retriable(self, err: ClientResponseError) -> bool:
+        """Return whether a failed attempt should be retried.
+
+        Args:
+            err: The error raised by the attempt.
+
+        Returns:
+            Whether the attempt should be retried.
+        """
+        return err.status in self.retry_codes or not 400 <= err.status < 500
+
+    def limit_to(self, timeout: float | None) -> RetryPolicy:
+        """Get a version of the policy that doesn't retry past a time budget.
+
+        Args:
+            timeout: The time budget (in seconds); ``None`` means no limit.
+
+        Returns:
+            A retry policy.
+        """
+        # Don't start a retry that can't possibly finish within the time budget:
+        if timeout is None or (self.deadline is not None and self.deadline <= timeout):
+            return self
+        return replace(self, deadline=timeout)
+
+
+def is_fatal_error(
+    retriable_error_codes: Iterable[int],
+) -> Callable[[ClientResponseError], bool]:
+    """Get a check for whether a ClientResponseError is fatal and shouldn't be retried.
+
+    The check is the inverse of :meth:`RetryPolicy.is_retriable` for a policy that
+    retries the same status codes.
+
+    Args:
+        retriable_error_codes: The retriable error status codes.
+
+    Returns:
+        A callable that checks an error.
+    """
+    policy = RetryPolicy(retry_codes=frozenset(retriable_error_codes))
+    return lambda err: not policy.is_retriable(err)
+
+
+async def async_run_with_retries(
+    retry_policy: RetryPolicy,
+    request_func: Callable[..., Awaitable[_T]],
+    *args: Any,
+    on_retry: Callable[[ClientResponseError], Awaitable[None]] | None = None,
+    **kwargs: Any,
+) -> _T:
+    """Run a request function, retrying it according to a retry policy.
+
+    Args:
+        retry_policy: The retry policy to follow.
+        request_func: A function that performs the request.
+        *args: Positional arguments to pass to the request function.
+        on_retry: A coroutine function to run (with the error) before each retry.
+        **kwargs: Keyword arguments to pass to the request function.
+
+    Returns:
+        The request function's result.
+
+    Raises:
+        RequestError: Raised once the request fails and can't be retried.
+        RequestTimeoutError: Raised when an attempt times out or a retry would exceed
+            the policy's deadline.
+    """
+    start = monotonic()
+    attempt = 0
+
+    while True:
+        attempt += 1
+        try:
+            return await request_func(*args, **kwargs)
+        except asyncio.TimeoutError as err:
+            # Retrying a hung request would only multiply the wait:
+            raise RequestTimeoutError(
+                f"Request attempt timed out after {attempt} tries"
+            ) from err
+        except ClientResponseError as err:
+            if not retry_policy.is_retriable(err) or attempt >= retry_policy.max_tries:
+                raise RequestError(err) from err
+
+            delay = retry_policy.get_delay(attempt, err)
+            if (
+                retry_policy.deadline is not None
+                and monotonic() - start + delay > retry_policy.deadline
+            ):
+                raise RequestTimeoutError(
+                    f"Giving up since retrying would exceed the deadline: {err}"
+                ) from err
+
+            if on_retry:
+                await on_retry(err)
+
+            LOGGER.info(
+                "Backing off %.1f seconds after %s tries of %s",
+                delay,
+                attempt,
+                request_func.__name__,
+            )
+            await asyncio.sleep(delay)
+
+
+async def async_run_with_timeout(
+    coro: Coroutine[Any, Any, _T], timeout: float | None
+) -> _T:
+    """Run a coroutine within a total time budget.
+
+    Args:
+        coro: The coroutine to run.
+        timeout: The time budget (in seconds); ``None`` means no limit.
+
+    Returns:
+        The coroutine's result.
+
+    Raises:
+        RequestTimeoutError: Raised when the time budget runs out.
+    """
+    try:
+        return await asyncio.wait_for(coro, timeout)
+    except asyncio.TimeoutError as err:
+        raise RequestTimeoutError(
+            f"Request did not finish within {timeout} seconds"
+        ) from err
@@ -0,0 +1,172 @@
+"""Define a priority-aware scheduler for outgoing API requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from time import monotonic
+
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+DEFAULT_MAX_STARVATION = 8
+
+
+class RequestPriority(IntEnum):
+    """Define request priority classes (lower values are served first)."""
+
+    CRITICAL = 0
+    INTERACTIVE = 1
+    BACKGROUND = 2
+
+
+_REQUEST_PRIORITY: ContextVar[RequestPriority | None] = ContextVar(
+    "request_priority", default=None
+)
+
+
+@contextmanager
+def request_priority(priority: RequestPriority) -> Iterator[None]:
+    """Set the priority of read requests made within a block (and tasks it spawns).
+
+    Args:
+        priority: The priority class to use.
+
+    Yields:
+        Nothing.
+    """
+    token = _REQUEST_PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _REQUEST_PRIORITY.reset(token)
+
+
+def get_request_priority(method: str) -> RequestPriority:
+    """Get the priority class of a request.
+
+    Writes (arming/disarming, locking/unlocking, token refreshes, etc.) are always
+    critical; reads default to interactive unless a different priority is set via
+    :meth:`simplipy.util.scheduler.request_priority`.
+
+    Args:
+        method: An HTTP method.
+
+    Returns:
+        A priority class.
+    """
+    if method.lower() != "get":
+        return RequestPriority.CRITICAL
+    if (priority := _REQUEST_PRIORITY.get()) is None:
+        return RequestPriority.INTERACTIVE
+    return priority
+
+
+@dataclass
+class RequestSchedulerStats:
+    """Define counters that describe the queueing of one priority class."""
+
+    requests: int = 0
+    queue_depth: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+class RequestScheduler:
+    """Define a scheduler that limits concurrent requests and serves them by priority.
+
+    Waiting requests are served highest-priority first (first-come, first-served
+    within a class). To bound starvation, a waiting class that has been passed over
+    ``max_starvation`` times in a row is served next regardless of its priority.
+
+    Args:
+        max_concurrency: The maximum number of requests in flight at once.
+        max_starvation: The number of times a waiting class can be passed over.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENT_REQUESTS,
+        max_starvation: int = DEFAULT_MAX_STARVATION,
+    ) -> None:
+        """Initialize.
+
+        Args:
+            max_concurrency: The maximum number of requests in flight at once.
+            max_starvation: The number of times a waiting class can be passed over.
+        """
+        self._active = 0
+        self._max_concurrency = max_concurrency
+        self._max_starvation = max_starvation
+        self._passed_over = dict.fromkeys(RequestPriority, 0)
+        self._waiters: dict[RequestPriority, deque[asyncio.Future[None]]] = {
+            priority: deque() for priority in RequestPriority
+        }
+        self.stats = {priority: RequestSchedulerStats() for priority in RequestPriority}
+
+    def _grant_next(self) -> None:
+        """Let waiting requests proceed while there is capacity."""
+        while self._active < self._max_concurrency:
+            waiting = [
+                priority for priority in RequestPriority if self._waiters[priority]
+            ]
+            if not waiting:
+                return
+
+            starved = [
+                priority
+                for priority in waiting
+                if self._passed_over[priority] >= self._max_starvation
+            ]
+            granted = starved[0] if starved else waiting[0]
+
+            for priority in waiting:
+                if priority > granted:
+                    self._passed_over[priority] += 1
+            self._passed_over[granted] = 0
+
+            self._waiters[granted].popleft().set_result(None)
+            self._active += 1
+
+    async def async_acquire(self, priority: RequestPriority) -> None:
+        """Wait for a request slot.
+
+        Args:
+            priority: The priority class of the request.
+        """
+        stats = self.stats[priority]
+        stats.requests += 1
+
+        if self._active < self._max_concurrency and not any(self._waiters.values()):
+            self._active += 1
+            return
+
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters[priority].append(future)
+        stats.queue_depth += 1
+        start = monotonic()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was granted just before cancellation; hand it on:
+                self.release()
+            else:
+                self._waiters[priority].remove(future)
+            raise
+        finally:
+            stats.queue_depth -= 1
+
+        wait = monotonic() - start
+        stats.total_wait += wait
+        stats.max_wait = max(stats.max_wait, wait)
+
+    def release(self) -> None:
+        """Release a request slot."""
+        self._active -= 1
+        self._grant_next()
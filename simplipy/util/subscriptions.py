@@ -0,0 +1,222 @@
+"""Define event filters and an index of filtered subscribers."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import count
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
+
+from simplipy.device import DeviceTypes
+
+if TYPE_CHECKING:
+    from simplipy.websocket import WebsocketEvent
+
+_SubscriberT = TypeVar("_SubscriberT")
+
+# The event attribute that each filter dimension matches, most selective first:
+FILTER_ATTRIBUTES = {
+    "sensor_serials": "sensor_serial",
+    "system_ids": "system_id",
+    "event_types": "event_type",
+    "sensor_types": "sensor_type",
+}
+
+
+def _to_frozenset(value: Any) -> frozenset[Any] | None:
+    """Convert a filter argument (a single value or an iterable of them) to a set.
+
+    Args:
+        value: The filter argument.
+
+    Returns:
+        The set of values (or ``None`` if the argument is ``None``).
+    """
+    if value is None:
+        return None
+    if isinstance(value, (str, int, DeviceTypes)):
+        return frozenset({value})
+    return frozenset(value)
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """Define which websocket events a subscriber receives.
+
+    Each argument takes a single value or an iterable of values; an event matches if,
+    for every argument that isn't ``None``, the event's corresponding attribute is one
+    of the given values.
+    """
+
+    event_types: str | Iterable[str] | None = None
+    sensor_serials: str | Iterable[str] | None = None
+    sensor_types: DeviceTypes | Iterable[DeviceTypes] | None = None
+    system_ids: int | Iterable[int] | None = None
+
+    def __post_init__(self) -> None:
+        """Normalize every argument to a frozen set."""
+        for name in FILTER_ATTRIBUTES:
+            object.__setattr__(self, name, _to_frozenset(getattr(self, name)))
+
+    def get_values(self, name: str) -> frozenset[Any] | None:
+        """Get the values that a filter dimension allows.
+
+        Args:
+            name: The name of the filter dimension (e.g., ``system_ids``).
+
+        Returns:
+            The allowed values (or ``None`` if any value is allowed).
+        """
+        values: frozenset[Any] | None = getattr(self, name)
+        return values
+
+    def matches(self, event: WebsocketEvent) -> bool:
+        """Return whether an event matches the filter.
+
+        Args:
+            event: The websocket event.
+
+        Returns:
+            Whether the event matches.
+        """
+        return all(
+            (values := self.get_values(name)) is None
+            or getattr(event, attribute) in values  # pylint: disable=unsupported-membership-test
+            for name, attribute in FILTER_ATTRIBUTES.items()
+        )
+
+
+@dataclass
+class _Subscription(Generic[_SubscriberT]):
+    """Define a subscriber and the filter it subscribed with."""
+
+    subscriber: _SubscriberT
+    event_filter: EventFilter
+    order: int = field(compare=False)
+
+
+class SubscriptionIndex(Generic[_SubscriberT]):
+    """Define an index of subscribers by the events their filters match.
+
+    Each subscription is indexed under the values of its most selective filter
+    dimension (sensor serial numbers, then system IDs, then event types, then sensor
+    types); subscriptions without a filter are kept apart. Finding an event's
+    subscribers only looks at the subscriptions indexed under the event's own values
+    (plus the unfiltered ones), rather than at every subscription.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self._indexes: dict[str, dict[Hashable, dict[int, _Subscription]]] = {
+            name: {} for name in FILTER_ATTRIBUTES
+        }
+        self._order = count()
+        self._subscriptions: dict[int, tuple[str | None, _Subscription]] = {}
+        self._unfiltered: dict[int, _Subscription] = {}
+
+    def __iter__(self) -> Iterator[_SubscriberT]:
+        """Iterate over every subscriber (in the order they subscribed).
+
+        Returns:
+            An iterator of subscribers.
+        """
+        return iter(
+            subscription.subscriber for _, subscription in self._subscriptions.values()
+        )
+
+    def __len__(self) -> int:
+        """Return the number of subscriptions.
+
+        Returns:
+            The number of subscriptions.
+        """
+        return len(self._subscriptions)
+
+    def _remove(self, order: int) -> None:
+        """Remove a subscription.
+
+        Args:
+            order: The subscription's position in subscription order.
+        """
+        if (entry := self._subscriptions.pop(order, None)) is None:
+            return
+
+        name, subscription = entry
+        if name is None:
+            self._unfiltered.pop(order)
+            return
+
+        index = self._indexes[name]
+        for value in subscription.event_filter.get_values(name) or ():
+            index[value].pop(order)
+            if not index[value]:
+                index.pop(value)
+
+    def add(
+        self, subscriber: _SubscriberT, event_filter: EventFilter | None = None
+    ) -> Callable[[], None]:
+        """Add a subscriber.
+
+        Args:
+            subscriber: The subscriber.
+            event_filter: The filter that events must match (or ``None`` for every
+                event).
+
+        Returns:
+            A callable to remove the subscription.
+        """
+        order = next(self._order)
+        subscription = _Subscription(subscriber, event_filter or EventFilter(), order)
+
+        name = next(
+            (
+                name
+                for name in FILTER_ATTRIBUTES
+                if subscription.event_filter.get_values(name) is not None
+            ),
+            None,
+        )
+        self._subscriptions[order] = (name, subscription)
+
+        if name is None:
+            self._unfiltered[order] = subscription
+        else:
+            index = self._indexes[name]
+            for value in subscription.event_filter.get_values(name) or ():
+                index.setdefault(value, {})[order] = subscription
+
+        def remove() -> None:
+            """Remove the subscription."""
+            self._remove(order)
+
+        return remove
+
+    def get_subscribers(self, event: WebsocketEvent) -> list[_SubscriberT]:
+        """Get the subscribers whose filters match an event.
+
+        Args:
+            event: The websocket event.
+
+        Returns:
+            The matching subscribers (in the order they subscribed).
+        """
+        candidates = list(self._unfiltered.values())
+        for name, attribute in FILTER_ATTRIBUTES.items():
+            if bucket := self._indexes[name].get(getattr(event, attribute)):
+                candidates.extend(bucket.values())
+
+        return [
+            subscription.subscriber
+            for subscription in sorted(candidates, key=lambda sub: sub.order)
+            if subscription.event_filter.matches(event)
+        ]
+
+    def remove(self, subscriber: _SubscriberT) -> None:
+        """Remove every subscription of a subscriber.
+
+        Args:
+            subscriber: The subscriber.
+        """
+        for order, (_, subscription) in list(self._subscriptions.items()):
+            if subscription.subscriber is subscriber:
+                self._remove(order)
@@ -0,0 +1,161 @@
+"""Define how an API object keeps its systems up to date."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING
+
+from simplipy.const import LOGGER
+from simplipy.util.concurrency import async_run_isolated
+from simplipy.util.polling import Poller, PollingPolicy
+
+if TYPE_CHECKING:
+    from simplipy.system.v2 import SystemV2
+    from simplipy.system.v3 import SystemV3
+    from simplipy.util.index import DeviceIndex
+    from simplipy.websocket import WebsocketClient, WebsocketEvent
+
+
+class SystemUpdatesMixin:
+    """Define a mixin for API objects that keep their systems up to date.
+
+    The API object provides the systems returned by its latest ``async_get_systems``
+    call, its device index, and its websocket client; this mixin updates those systems
+    (concurrently, on demand, or in the background) and applies websocket events to
+    them.
+    """
+
+    _poller: Poller | None = None
+    _remove_polling_event_callback: Callable[[], None] | None = None
+    _remove_state_event_callback: Callable[[], None] | None = None
+    _systems: dict[int, SystemV2 | SystemV3]
+    device_index: DeviceIndex
+    system_errors: dict[int, BaseException]
+    websocket: WebsocketClient | None
+
+    def _handle_polling_event(self, event: WebsocketEvent) -> None:
+        """Let the poller know about websocket activity for a system.
+
+        Args:
+            event: The websocket event.
+        """
+        if self._poller:
+            self._poller.record_event(event.system_id)
+
+    def _handle_state_event(self, event: WebsocketEvent) -> None:
+        """Apply a websocket event to the state of the system it belongs to.
+
+        Args:
+            event: The websocket event.
+        """
+        if system := self._systems.get(event.system_id):
+            system._apply_event(event)  # pylint: disable=protected-access
+
+    def disable_polling(self) -> None:
+        """Stop refreshing systems in the background."""
+        if self._remove_polling_event_callback:
+            self._remove_polling_event_callback()
+            self._remove_polling_event_callback = None
+
+        if self._poller:
+            self._poller.stop()
+            self._poller = None
+
+    def enable_polling(self, policy: PollingPolicy | None = None) -> None:
+        """Refresh every system returned by ``async_get_systems`` in the background.
+
+        Each system is refreshed at an interval that adapts to it: quickly during entry
+        and exit delays and alarms, slowly while the websocket is connected and quiet,
+        and with growing delays after errors. A websocket event for a system triggers a
+        refresh of that system. Refreshes that would fall inside a system's lock state
+        change window are deferred until it closes.
+
+        Args:
+            policy: The polling policy to use (defaults to
+                :meth:`simplipy.util.polling.PollingPolicy` with default values).
+        """
+        self.disable_polling()
+
+        self._poller = Poller(
+            policy=policy or PollingPolicy(),
+            is_websocket_connected=lambda: bool(
+                self.websocket and self.websocket.connected
+            ),
+        )
+        if self.websocket:
+            self._remove_polling_event_callback = self.websocket._add_event_handler(  # pylint: disable=protected-access
+                self._handle_polling_event
+            )
+        self._poller.track(self._systems)
+
+    def disable_websocket_state_updates(self) -> None:
+        """Stop applying websocket events to system and device state."""
+        if self._remove_state_event_callback:
+            self._remove_state_event_callback()
+            self._remove_state_event_callback = None
+
+    def enable_websocket_state_updates(self) -> None:
+        """Apply websocket events to system and device state as they arrive.
+
+        Arming/disarming, alarm, and entry/exit delay events update the state of the
+        system they belong to; lock events update the state of the lock; and
+        sensor-specific events update whether the sensor is offline or triggered. Events
+        that are older than a system's last update are ignored. Each system keeps
+        track of when its state was last confirmed by an update
+        (:meth:`simplipy.system.System.last_poll_dt`) and last changed by an event
+        (:meth:`simplipy.system.System.last_event_dt`).
+        """
+        self.disable_websocket_state_updates()
+
+        if self.websocket:
+            self._remove_state_event_callback = self.websocket._add_event_handler(  # pylint: disable=protected-access
+                self._handle_state_event
+            )
+
+    async def _async_run_per_system(
+        self,
+        systems: dict[int, SystemV2 | SystemV3],
+        func: Callable[[SystemV2 | SystemV3], Awaitable[None]],
+        max_concurrency: int,
+    ) -> None:
+        """Run a coroutine function for multiple systems concurrently.
+
+        Each failure is logged and stored in :meth:`simplipy.api.API.system_errors`;
+        an error is raised only if every system fails.
+
+        Args:
+            systems: A dictionary of system IDs to System objects.
+            func: The coroutine function to run for each system.
+            max_concurrency: The maximum number of systems to run at once.
+
+        Raises:
+            BaseException: The first system error, if every system fails.
+        """
+        self.system_errors = await async_run_isolated(
+            systems, func, max_concurrency=max_concurrency
+        )
+        for sid, err in self.system_errors.items():
+            LOGGER.error("Error while updating system %s: %s", sid, err)
+
+        if self.system_errors and len(self.system_errors) == len(systems):
+            raise next(iter(self.system_errors.values()))
+
+    async def _async_stop_polling(self) -> None:
+        """Stop refreshing systems and wait for the refreshes in progress to end."""
+        if poller := self._poller:
+            self.disable_polling()
+            await poller.async_stop()
+
+    def _track_systems(self, systems: dict[int, SystemV2 | SystemV3]) -> None:
+        """Replace the known systems (and stop tracking the ones that are gone).
+
+        Args:
+            systems: A dictionary of system IDs to System objects.
+        """
+        for sid in self._systems.keys() - systems.keys():
+            self.device_index.remove_system(sid)
+
+        if self._poller:
+            self._poller.track(systems)
+
+        self._systems = systems
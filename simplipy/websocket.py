@@ -3,9 +3,12 @@
 from __future__ import annotations
 
 import asyncio
+import random
 from collections.abc import Awaitable, Callable
 from dataclasses import InitVar, dataclass, field
 from datetime import datetime, timedelta
+from enum import Enum
+from time import monotonic
 from typing import TYPE_CHECKING, Any, Final, cast
 
 from aiohttp import ClientWebSocketResponse, WSMsgType
@@ -17,17 +20,28 @@ from simplipy.errors import (
     CannotConnectError,
     ConnectionClosedError,
     ConnectionFailedError,
+    EventStreamOverflowError,
     InvalidMessageError,
     NotConnectedError,
+    WebsocketError,
 )
-from simplipy.util import CallbackType, execute_callback
+from simplipy.util import CallbackType
+from simplipy.util.callbacks import CallbackExecutor
+from simplipy.util.dedup import DedupWindow
 from simplipy.util.dt import utc_from_timestamp, utcnow
+from simplipy.util.subscriptions import EventFilter, SubscriptionIndex
 
 if TYPE_CHECKING:
     from simplipy import API
+    from simplipy.system import System
 
 WEBSOCKET_SERVER_URL = "wss://socketlink.prd.aser.simplisafe.com"
 
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_EVENT_STREAM_MAXSIZE = 100
+DEFAULT_RECONNECT_BASE_DELAY = 1.0
+DEFAULT_RECONNECT_MAX_DELAY = 300.0
+DEFAULT_RECONNECT_STABLE_AFTER = 60.0
 DEFAULT_WATCHDOG_TIMEOUT = timedelta(minutes=5)
 
 EVENT_ALARM_CANCELED: Final = "alarm_canceled"
@@ -107,6 +121,54 @@ EVENT_MAPPING = {
 }
 
 
+@dataclass(frozen=True)
+class ReconnectPolicy:
+    """Define how a supervised websocket reconnects.
+
+    After the ``n``-th consecutive failure to connect (or to stay connected), the
+    supervisor waits a random delay between zero and ``base_delay * 2 ** (n - 1)``
+    seconds (capped at ``max_delay``); spreading reconnects out this way keeps many
+    clients from reconnecting in lockstep after an outage. A connection that stays up
+    for ``stable_after`` seconds resets the count.
+    """
+
+    base_delay: float = DEFAULT_RECONNECT_BASE_DELAY
+    max_delay: float = DEFAULT_RECONNECT_MAX_DELAY
+    stable_after: float = DEFAULT_RECONNECT_STABLE_AFTER
+
+    def get_delay(self, failures: int) -> float:
+        """Get the number of seconds to wait before the next connection attempt.
+
+        Args:
+            failures: The number of consecutive failures.
+
+        Returns:
+            The delay (in seconds).
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2.0 ** (failures - 1))
+        return random.uniform(0, ceiling)  # noqa: S311
+
+
+class WebsocketState(Enum):
+    """Define the states of a supervised websocket."""
+
+    BACKING_OFF = "backing_off"
+    CONNECTED = "connected"
+    CONNECTING = "connecting"
+    STOPPED = "stopped"
+
+
+@dataclass
+class WebsocketHealth:
+    """Define the health of a supervised websocket."""
+
+    state: WebsocketState = WebsocketState.STOPPED
+    connects: int = 0
+    failures: int = 0
+    connected_since: datetime | None = None
+    last_error: str | None = None
+
+
 class Watchdog:
     """Define a watchdog to kick the websocket connection at intervals."""
 
@@ -122,6 +184,9 @@ class Watchdog:
             timeout: The time duration before the watchdog times out.
         """
         self._action = action
+        # The action gets an executor of its own, so that it never queues behind user
+        # callbacks:
+        self._executor = CallbackExecutor()
         self._action_task: asyncio.Task | None = None
         self._loop = asyncio.get_running_loop()
         self._timeout_seconds = timeout.total_seconds()
@@ -130,7 +195,7 @@ class Watchdog:
     def _on_expire(self) -> None:
         """Log and act when the watchdog expires."""
         LOGGER.info("Websocket watchdog expired")
-        execute_callback(self._action)
+        self._executor.execute(self._action)
 
     def cancel(self) -> None:
         """Cancel the watchdog."""
@@ -162,6 +227,7 @@ class WebsocketEvent:
     _video: dict | None
     _vid: str | None
 
+    _event_cid: int = field(init=False, repr=False)
     event_type: str | None = field(init=False)
     timestamp: datetime = field(init=False)
     media_urls: dict[str, str | None] | None = field(init=False)
@@ -170,6 +236,7 @@ class WebsocketEvent:
     sensor_name: str | None = None
     sensor_serial: str | None = None
     sensor_type: DeviceTypes | None = None
+    backfilled: bool = False
 
     def __post_init__(self, event_cid: int) -> None:
         """Run post-init initialization.
@@ -188,6 +255,7 @@ class WebsocketEvent:
             )
             object.__setattr__(self, "event_type", None)
 
+        object.__setattr__(self, "_event_cid", event_cid)
         object.__setattr__(self, "timestamp", utc_from_timestamp(self._raw_timestamp))
 
         if self.sensor_type is not None:
@@ -202,7 +270,7 @@ class WebsocketEvent:
                 )
                 object.__setattr__(self, "sensor_type", None)
 
-        if self._vid is not None and self._video is not None:
+        if self._vid and self._video:
             links = self._video[self._vid]["_links"]
             hls_safe_obj = links.get("playback/hls") or {}
             flv_safe_obj = links.get("playback/flv") or {}
@@ -221,12 +289,30 @@ class WebsocketEvent:
         else:
             object.__setattr__(self, "media_urls", None)
 
+    @property
+    def fingerprint(self) -> tuple[int, int, float, str | None]:
+        """Return a key that identifies the event across deliveries.
 
-def websocket_event_from_payload(payload: dict[str, Any]) -> WebsocketEvent:
+        Returns:
+            A (system ID, event CID, event timestamp, sensor serial) tuple.
+        """
+        return (
+            self.system_id,
+            self._event_cid,
+            self._raw_timestamp,
+            self.sensor_serial,
+        )
+
+
+def websocket_event_from_payload(
+    payload: dict[str, Any], *, backfilled: bool = False
+) -> WebsocketEvent:
     """Create a Message object from a websocket event payload.
 
     Args:
         payload: A raw websocket response payload.
+        backfilled: Whether the event was fetched after a reconnect (rather than
+            received over the websocket).
 
     Returns:
         A parsed WebsocketEvent object.
@@ -242,9 +328,168 @@ def websocket_event_from_payload(payload: dict[str, Any]) -> WebsocketEvent:
         sensor_name=payload["data"]["sensorName"],
         sensor_serial=payload["data"]["sensorSerial"],
         sensor_type=payload["data"]["sensorType"],
+        backfilled=backfilled,
     )
 
 
+class EventStreamOverflow(Enum):
+    """Define what an event stream does when its queue is full."""
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    ERROR = "error"
+
+
+@dataclass
+class EventStreamStats:
+    """Define counters that describe how far an event stream's consumer lags."""
+
+    delivered: int = 0
+    dropped: int = 0
+    lag: int = 0
+    max_lag: int = 0
+
+
+class EventStream:
+    """Define an async iterator over websocket events, backed by a bounded queue.
+
+    Note that this class shouldn't be instantiated directly; it will be instantiated as
+    appropriate via :meth:`simplipy.websocket.WebsocketClient.events`.
+
+    Args:
+        maxsize: The maximum number of events to queue for the consumer.
+        overflow: What to do when the queue is full.
+        on_close: A callable to call when the stream is closed.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int,
+        overflow: EventStreamOverflow,
+        on_close: Callable[[EventStream], None],
+    ) -> None:
+        """Initialize.
+
+        Args:
+            maxsize: The maximum number of events to queue for the consumer.
+            overflow: What to do when the queue is full.
+            on_close: A callable to call when the stream is closed.
+        """
+        self._closed = False
+        self._on_close = on_close
+        self._overflowed = False
+        self._queue: asyncio.Queue[WebsocketEvent | None] = asyncio.Queue()
+        self._room = asyncio.Event()
+        self.maxsize = maxsize
+        self.overflow = overflow
+        self.stats = EventStreamStats()
+
+    async def __aenter__(self) -> EventStream:
+        """Enter the stream's context.
+
+        Returns:
+            The stream.
+        """
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        """Close the stream upon leaving its context (whether or not it raised)."""
+        self.close()
+
+    def __aiter__(self) -> EventStream:
+        """Return the stream as an async iterator.
+
+        Returns:
+            The stream.
+        """
+        return self
+
+    async def __anext__(self) -> WebsocketEvent:
+        """Wait for the next event.
+
+        Returns:
+            The next event.
+
+        Raises:
+            EventStreamOverflowError: Raised when the queue overflowed (with the
+                ``error`` overflow strategy).
+            StopAsyncIteration: Raised when the stream is closed.
+        """
+        if self._overflowed:
+            self.close()
+            raise EventStreamOverflowError(
+                f"Consumer fell more than {self.maxsize} events behind"
+            )
+
+        if self._closed or (event := await self._queue.get()) is None:
+            raise StopAsyncIteration
+
+        self._room.set()
+        self.stats.delivered += 1
+        self.stats.lag = self._queue.qsize()
+        return event
+
+    def _is_full(self) -> bool:
+        """Return whether the consumer's queue is full.
+
+        Returns:
+            Whether the queue is full.
+        """
+        return self._queue.qsize() >= self.maxsize
+
+    @property
+    def closed(self) -> bool:
+        """Return whether the stream is closed.
+
+        Returns:
+            Whether the stream is closed.
+        """
+        return self._closed
+
+    async def async_put(self, event: WebsocketEvent) -> None:
+        """Queue an event for the consumer.
+
+        With the ``block`` overflow strategy, this waits until the queue has room.
+
+        Args:
+            event: The event to queue.
+        """
+        if self.overflow == EventStreamOverflow.BLOCK:
+            while self._is_full() and not self._closed:
+                self._room.clear()
+                await self._room.wait()
+
+        if self._closed or self._overflowed:
+            return
+
+        if self._is_full():
+            self.stats.dropped += 1
+            if self.overflow == EventStreamOverflow.ERROR:
+                self._overflowed = True
+                return
+            self._queue.get_nowait()
+
+        self._queue.put_nowait(event)
+        self.stats.lag = self._queue.qsize()
+        self.stats.max_lag = max(self.stats.max_lag, self.stats.lag)
+
+    def close(self) -> None:
+        """Close the stream (ending the consumer's iteration)."""
+        if self._closed:
+            return
+
+        self._closed = True
+        self._on_close(self)
+
+        # Discard queued events, then wake both a producer waiting for room and a
+        # consumer waiting for an event:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(None)
+        self._room.set()
+
+
 class WebsocketClient:
     """A websocket connection to the SimpliSafe cloud.
 
@@ -265,8 +510,16 @@ class WebsocketClient:
         self._api = api
         self._connect_callbacks: list[CallbackType] = []
         self._disconnect_callbacks: list[CallbackType] = []
-        self._event_callbacks: list[CallbackType] = []
+        self._event_callbacks: SubscriptionIndex[CallbackType] = SubscriptionIndex()
+        self._event_handlers: list[CallbackType] = []
+        self._event_streams: SubscriptionIndex[EventStream] = SubscriptionIndex()
         self._loop = asyncio.get_running_loop()
+        self.callback_executor = CallbackExecutor()
+        self._backfill_task: asyncio.Task[None] | None = None
+        self._disconnected_at: datetime | None = None
+        self._last_event_dt: dict[int, datetime] = {}
+        self.dedup_window = DedupWindow()
+        self.health = WebsocketHealth()
         self._watchdog = Watchdog(self.async_reconnect)
 
         # These will get filled in after initial authentication:
@@ -281,9 +534,8 @@ class WebsocketClient:
         """
         return self._client is not None and not self._client.closed
 
-    @staticmethod
     def _add_callback(
-        callback_list: list[CallbackType], callback: CallbackType
+        self, callback_list: list[CallbackType], callback: CallbackType
     ) -> Callable[[], None]:
         """Add a callback to a particular list.
 
@@ -299,9 +551,23 @@ class WebsocketClient:
         def remove() -> None:
             """Remove the callback."""
             callback_list.remove(callback)
+            self.callback_executor.forget(callback)
 
         return remove
 
+    def _add_event_handler(
+        self, handler: Callable[[WebsocketEvent], None]
+    ) -> Callable[[], None]:
+        """Add one of the library's own handlers to be called upon receiving an event.
+
+        Args:
+            handler: The handler to call.
+
+        Returns:
+            A callable to cancel the handler.
+        """
+        return self._add_callback(self._event_handlers, handler)
+
     async def _async_receive_json(self) -> dict[str, Any]:
         """Receive a JSON response from the websocket server.
 
@@ -325,7 +591,7 @@ class WebsocketClient:
             raise InvalidMessageError(f"Received non-text message: {msg.type}")
 
         try:
-            data = msg.json()
+            data = self._api.json_codec.loads(msg.data)
         except ValueError as err:
             raise InvalidMessageError("Received invalid JSON") from err
 
@@ -349,18 +615,106 @@ class WebsocketClient:
 
         LOGGER.debug("Sending data to websocket server: %s", payload)
 
-        await self._client.send_json(payload)
+        await self._client.send_json(payload, dumps=self._api.json_codec.dumps)
 
-    def _parse_payload(self, payload: dict[str, Any]) -> None:
+    async def _async_parse_payload(self, payload: dict[str, Any]) -> None:
         """Parse an incoming payload.
 
         Args:
             payload: A JSON payload.
         """
         if payload["type"] == "com.simplisafe.event.standard":
-            event = websocket_event_from_payload(payload)
-            for callback in self._event_callbacks:
-                execute_callback(callback, event)
+            await self._async_deliver_event(websocket_event_from_payload(payload))
+
+    async def _async_deliver_event(self, event: WebsocketEvent) -> None:
+        """Deliver an event to every callback and stream.
+
+        Args:
+            event: The event to deliver.
+        """
+        if (
+            last_event_dt := self._last_event_dt.get(event.system_id)
+        ) is None or event.timestamp > last_event_dt:
+            self._last_event_dt[event.system_id] = event.timestamp
+
+        if not self.dedup_window.check(event.fingerprint):
+            LOGGER.debug("Suppressing duplicate event: %s", event)
+            return
+
+        # The library's own handlers update shared state, so they run right away on the
+        # event loop (rather than behind, or in threads alongside, user callbacks):
+        for handler in self._event_handlers:
+            try:
+                handler(event)
+            except Exception:  # pylint: disable=broad-except
+                LOGGER.exception("Error while handling event: %s", event)
+
+        for callback in self._event_callbacks.get_subscribers(event):
+            self.callback_executor.execute(callback, event)
+        for stream in self._event_streams.get_subscribers(event):
+            await stream.async_put(event)
+
+    async def _async_get_missed_events(
+        self, system: System, since: datetime
+    ) -> list[WebsocketEvent]:
+        """Get the events a system recorded since a point in time (oldest first).
+
+        Args:
+            system: The system to get events for.
+            since: The point in time.
+
+        Returns:
+            The events.
+        """
+        events = [
+            websocket_event_from_payload({"data": data}, backfilled=True)
+            for data in await system.async_get_events(from_datetime=since)
+        ]
+        return sorted(
+            (event for event in events if event.timestamp >= since),
+            key=lambda event: event.timestamp,
+        )
+
+    async def _async_backfill(self, disconnected_at: datetime) -> None:
+        """Deliver the events that occurred while the websocket was disconnected.
+
+        The events of each system are fetched concurrently, starting from the last
+        event seen for that system (or from when the websocket disconnected). A system
+        whose events can't be fetched (for whatever reason) is logged and skipped.
+
+        Note that this runs alongside the listener: each system's missed events are
+        delivered in order, but they may be delivered after newer live events.
+
+        Args:
+            disconnected_at: When the websocket disconnected.
+        """
+        systems = list(self._api.systems.values())
+        results = await asyncio.gather(
+            *(
+                self._async_get_missed_events(
+                    system, self._last_event_dt.get(system.system_id, disconnected_at)
+                )
+                for system in systems
+            ),
+            return_exceptions=True,
+        )
+
+        for system, result in zip(systems, results):
+            if isinstance(result, BaseException):
+                LOGGER.warning(
+                    "Unable to backfill events for system %s: %s",
+                    system.system_id,
+                    result,
+                )
+                continue
+            for event in result:
+                await self._async_deliver_event(event)
+
+    def _cancel_backfill(self) -> None:
+        """Cancel the backfill that is in progress (if any)."""
+        if self._backfill_task:
+            self._backfill_task.cancel()
+            self._backfill_task = None
 
     def add_connect_callback(
         self, callback: Callable[[], Awaitable[None] | None]
@@ -389,7 +743,9 @@ class WebsocketClient:
         return self._add_callback(self._disconnect_callbacks, callback)
 
     def add_event_callback(
-        self, callback: Callable[[WebsocketEvent], Awaitable[None] | None]
+        self,
+        callback: Callable[[WebsocketEvent], Awaitable[None] | None],
+        event_filter: EventFilter | None = None,
     ) -> Callable[[], None]:
         """Add a callback to be called upon receiving an event.
 
@@ -398,15 +754,63 @@ class WebsocketClient:
 
         Args:
             callback: The callback to execute.
+            event_filter: The filter that events must match (defaults to every event;
+                see :meth:`simplipy.util.subscriptions.EventFilter`).
 
         Returns:
             A callable to cancel the callback.
         """
-        return self._add_callback(self._event_callbacks, callback)
+        remove_subscription = self._event_callbacks.add(callback, event_filter)
 
-    async def async_connect(self) -> None:
+        def remove() -> None:
+            """Remove the callback."""
+            remove_subscription()
+            self.callback_executor.forget(callback)
+
+        return remove
+
+    def events(
+        self,
+        *,
+        maxsize: int = DEFAULT_EVENT_STREAM_MAXSIZE,
+        overflow: EventStreamOverflow | str = EventStreamOverflow.DROP_OLDEST,
+        event_filter: EventFilter | None = None,
+    ) -> EventStream:
+        """Get a stream of the events received from now on.
+
+        Each stream queues events for its consumer in a queue of its own; when the
+        queue is full, the ``overflow`` strategy decides what happens:
+
+        * ``block``: the listener waits until the consumer catches up (delaying every
+          other consumer, too).
+        * ``drop_oldest``: the oldest queued event is dropped.
+        * ``error``: the stream stops queueing events and the consumer's next read
+          raises :meth:`simplipy.errors.EventStreamOverflowError`.
+
+        Args:
+            maxsize: The maximum number of events to queue for the consumer.
+            overflow: What to do when the queue is full.
+            event_filter: The filter that events must match (defaults to every event;
+                see :meth:`simplipy.util.subscriptions.EventFilter`).
+
+        Returns:
+            An async iterator of events (which is closed by calling its ``close``
+            method or by leaving its ``async with`` block).
+        """
+        stream = EventStream(
+            maxsize=maxsize,
+            overflow=EventStreamOverflow(overflow),
+            on_close=self._event_streams.remove,
+        )
+        self._event_streams.add(stream, event_filter)
+        return stream
+
+    async def async_connect(self, *, timeout: float = DEFAULT_CONNECT_TIMEOUT) -> None:
         """Connect to the websocket server.
 
+        Args:
+            timeout: The number of seconds to wait for the connection.
+
         Raises:
             CannotConnectError: Raises when we cannot connect to the websocket.
         """
@@ -414,9 +818,14 @@ class WebsocketClient:
             return
 
         try:
-            self._client = await self._api.session.ws_connect(
-                WEBSOCKET_SERVER_URL, heartbeat=55
+            self._client = await asyncio.wait_for(
+                self._api.session.ws_connect(WEBSOCKET_SERVER_URL, heartbeat=55),
+                timeout,
             )
+        except asyncio.TimeoutError as err:
+            raise CannotConnectError(
+                f"Timed out after {timeout} seconds while connecting"
+            ) from err
         except ClientError as err:
             raise CannotConnectError(err) from err
 
@@ -425,10 +834,12 @@ class WebsocketClient:
         self._watchdog.trigger()
 
         for callback in self._connect_callbacks:
-            execute_callback(callback)
+            self.callback_executor.execute(callback)
 
     async def async_disconnect(self) -> None:
         """Disconnect from the websocket server."""
+        self._cancel_backfill()
+
         if not self.connected:
             return
 
@@ -436,46 +847,127 @@ class WebsocketClient:
 
         LOGGER.info("Disconnected from websocket server")
 
-    async def async_listen(self) -> None:
-        """Start listening to the websocket server."""
+    async def _async_identify(self) -> None:
+        """Identify to the websocket server with the current access token."""
         now = utcnow()
         now_ts = round(now.timestamp() * 1000)
         now_utc_iso = f"{now.strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3]}Z"
 
-        try:
-            await self._async_send_json(
-                {
-                    "datacontenttype": "application/json",
-                    "type": "com.simplisafe.connection.identify",
-                    "time": now_utc_iso,
-                    "id": f"ts:{now_ts}",
-                    "specversion": "1.0",
-                    "source": DEFAULT_USER_AGENT,
-                    "data": {
-                        "auth": {
-                            "schema": "bearer",
-                            "token": self._api.access_token,
-                        },
-                        "join": [f"uid:{self._api.user_id}"],
+        await self._async_send_json(
+            {
+                "datacontenttype": "application/json",
+                "type": "com.simplisafe.connection.identify",
+                "time": now_utc_iso,
+                "id": f"ts:{now_ts}",
+                "specversion": "1.0",
+                "source": DEFAULT_USER_AGENT,
+                "data": {
+                    "auth": {
+                        "schema": "bearer",
+                        "token": self._api.access_token,
                     },
-                }
-            )
+                    "join": [f"uid:{self._api.user_id}"],
+                },
+            }
+        )
+
+    async def async_listen(self) -> None:
+        """Start listening to the websocket server."""
+        try:
+            await self._async_identify()
+
+            if disconnected_at := self._disconnected_at:
+                self._disconnected_at = None
+                # Backfill alongside the listener, so that live messages are read (and
+                # delivered) while the missed events are fetched:
+                self._cancel_backfill()
+                self._backfill_task = asyncio.create_task(
+                    self._async_backfill(disconnected_at)
+                )
 
             while not self._client.closed:
                 message = await self._async_receive_json()
-                self._parse_payload(message)
+                await self._async_parse_payload(message)
         except ConnectionClosedError:
             pass
         finally:
             LOGGER.debug("Listen completed; cleaning up")
 
+            self._disconnected_at = self._disconnected_at or utcnow()
             self._watchdog.cancel()
 
             for callback in self._disconnect_callbacks:
-                execute_callback(callback)
+                self.callback_executor.execute(callback)
+
+    async def async_reauthenticate(self) -> None:
+        """Re-identify to the websocket server (e.g., after an access token refresh).
+
+        This keeps the existing connection (and listener) in place.
+        """
+        await self._async_identify()
 
     async def async_reconnect(self) -> None:
-        """Reconnect (and re-listen, if appropriate) to the websocket."""
+        """Reconnect (and re-listen, if appropriate) to the websocket.
+
+        If the websocket is supervised (see
+        :meth:`simplipy.websocket.WebsocketClient.async_run`), this only drops the
+        connection; the supervisor then reconnects and re-listens.
+        """
         await self.async_disconnect()
+
+        if self.health.state != WebsocketState.STOPPED:
+            return
+
         await asyncio.sleep(1)
         await self.async_connect()
+
+    async def async_run(self, *, policy: ReconnectPolicy | None = None) -> None:
+        """Connect, listen, and reconnect (with backoff) until canceled.
+
+        Each connection is identified and listened to; whenever the connection can't be
+        established or is lost (whatever the error), the supervisor backs off (see
+        :meth:`simplipy.websocket.ReconnectPolicy`) and tries again. Progress is
+        reported in :meth:`simplipy.websocket.WebsocketClient.health`. Canceling the
+        task that runs this coroutine stops the supervisor and disconnects.
+
+        Args:
+            policy: The reconnect policy to use (defaults to
+                :meth:`simplipy.websocket.ReconnectPolicy` with default values).
+        """
+        policy = policy or ReconnectPolicy()
+
+        try:
+            while True:
+                self.health.state = WebsocketState.CONNECTING
+                connected_at: float | None = None
+
+                try:
+                    await self.async_connect()
+                    connected_at = monotonic()
+                    self.health.connects += 1
+                    self.health.connected_since = utcnow()
+                    self.health.state = WebsocketState.CONNECTED
+                    await self.async_listen()
+                except WebsocketError as err:
+                    LOGGER.warning("Websocket error: %s", err)
+                    self.health.last_error = str(err)
+                except Exception as err:  # pylint: disable=broad-except
+                    LOGGER.exception("Unexpected websocket error: %s", err)
+                    self.health.last_error = str(err)
+
+                if (
+                    connected_at is not None
+                    and monotonic() - connected_at >= policy.stable_after
+                ):
+                    self.health.failures = 0
+                self.health.failures += 1
+                self.health.connected_since = None
+                self.health.state = WebsocketState.BACKING_OFF
+
+                delay = policy.get_delay(self.health.failures)
+                LOGGER.info("Reconnecting to the websocket in %.1f seconds", delay)
+                await asyncio.sleep(delay)
+        finally:
+            self.health.state = WebsocketState.STOPPED
+            self.health.connected_since = None
+            await self.async_disconnect()
@@ -15,6 +15,7 @@ import pytest_asyncio
 from aresponses import ResponsesMockServer
 
 from simplipy.api import API
+from simplipy.util.codec import STDLIB_CODEC
 from tests.common import (
     TEST_SUBSCRIPTION_ID,
     TEST_USER_ID,
@@ -192,6 +193,7 @@ def mock_api_fixture(ws_client_session: AsyncMock) -> Mock:
     """
     mock_api = Mock(API)
     mock_api.access_token = "12345"  # noqa: S105
+    mock_api.json_codec = STDLIB_CODEC
     mock_api.session = ws_client_session
     mock_api.user_id = 98765
     return mock_api
@@ -1,6 +1,9 @@
 """Define tests for v2 System objects."""
 
+import asyncio
+from copy import deepcopy
 from typing import Any
+from unittest.mock import patch
 
 import aiohttp
 import pytest
@@ -8,6 +11,8 @@ from aresponses import ResponsesMockServer
 
 from simplipy import API
 from simplipy.system import SystemStates
+from simplipy.util.changes import ChangeTracker
+from simplipy.util.dt import utcnow
 from tests.common import (
     TEST_AUTHORIZATION_CODE,
     TEST_CODE_VERIFIER,
@@ -90,6 +95,49 @@ async def test_get_pins(
     aresponses.assert_plan_strictly_followed()
 
 
+@pytest.mark.asyncio
+async def test_get_pins_concurrently(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v2: ResponsesMockServer,
+    v2_pins_response: dict[str, Any],
+) -> None:
+    """Test getting the PINs of a V2 system from concurrent (coalesced) calls.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server_v2: A authenticated API connection.
+        v2_pins_response: An API response payload.
+    """
+    async with authenticated_simplisafe_server_v2:
+        authenticated_simplisafe_server_v2.add(
+            "api.simplisafe.com",
+            f"/v1/subscriptions/{TEST_SUBSCRIPTION_ID}/pins",
+            "get",
+            response=aiohttp.web_response.json_response(v2_pins_response, status=200),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            systems = await simplisafe.async_get_systems()
+            system = systems[TEST_SYSTEM_ID]
+            results = await asyncio.gather(
+                system.async_get_pins(), system.async_get_pins()
+            )
+
+            assert simplisafe.request_coalescer.stats.coalesced == 1
+            for pins in results:
+                assert pins == {
+                    "master": "1234",
+                    "duress": "9876",
+                    "Mother": "3456",
+                    "Father": "4567",
+                }
+
+    aresponses.assert_plan_strictly_followed()
+
+
 @pytest.mark.asyncio
 async def test_async_get_systems(
     aresponses: ResponsesMockServer,
@@ -288,3 +336,94 @@ async def test_update_system_data(
             await system.async_update()
 
     aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_websocket_state_updates(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v2: ResponsesMockServer,
+    ws_message_event: dict[str, Any],
+) -> None:
+    """Test that websocket events don't change the state of V2 devices.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server_v2: A authenticated API connection.
+        ws_message_event: A websocket event payload.
+    """
+    async with authenticated_simplisafe_server_v2, aiohttp.ClientSession() as session:
+        simplisafe = await API.async_from_auth(
+            TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+        )
+        systems = await simplisafe.async_get_systems()
+        system = systems[TEST_SYSTEM_ID]
+        assert simplisafe.websocket
+        simplisafe.enable_websocket_state_updates()
+
+        sensor_data = deepcopy(system.sensor_data["195"])
+        payload = deepcopy(ws_message_event)
+        payload["data"]["eventCid"] = 1381
+        payload["data"]["sensorSerial"] = "195"
+        payload["data"]["eventTimestamp"] = utcnow().timestamp() + 1
+        await simplisafe.websocket._async_parse_payload(payload)
+        assert system.sensor_data["195"] == sensor_data
+        assert system.get_update_delay() == 0
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_update_without_sensors(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v2: ResponsesMockServer,
+    v2_settings_response: dict[str, Any],
+) -> None:
+    """Test that only an explicitly empty sensor list retires a v2 system's sensors.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server_v2: A authenticated API connection.
+        v2_settings_response: An API response payload.
+    """
+    missing_sensors_response = deepcopy(v2_settings_response)
+    del missing_sensors_response["settings"]["sensors"]
+    empty_sensors_response = deepcopy(v2_settings_response)
+    empty_sensors_response["settings"]["sensors"] = []
+
+    async with authenticated_simplisafe_server_v2:
+        for response in (missing_sensors_response, empty_sensors_response):
+            authenticated_simplisafe_server_v2.add(
+                "api.simplisafe.com",
+                f"/v1/subscriptions/{TEST_SUBSCRIPTION_ID}/settings",
+                "get",
+                response=aiohttp.web_response.json_response(response, status=200),
+            )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            simplisafe.change_tracker = tracker = ChangeTracker()
+            systems = await simplisafe.async_get_systems()
+            system = systems[TEST_SYSTEM_ID]
+            sensors = dict(system.sensors)
+            assert len(sensors) == 35
+
+            removed_devices: list[Any] = []
+            remove = system.add_device_removed_callback(removed_devices.append)
+
+            await system.async_update(include_subscription=False)
+            assert system.sensors == sensors
+            assert not removed_devices
+
+            with patch.object(tracker, "forget", wraps=tracker.forget) as forget:
+                await system.async_update(include_subscription=False)
+            assert not system.sensors
+            assert removed_devices == list(sensors.values())
+            assert forget.call_count == 35
+            forget.assert_any_call(TEST_SYSTEM_ID, "195")
+
+            remove()
+            assert not system._device_removed_callbacks
+
+    aresponses.assert_plan_strictly_followed()
@@ -1,16 +1,20 @@
 """Define tests for v3 System objects."""
 
-# pylint: disable=too-many-lines
+# pylint: disable=protected-access,too-many-lines
+import asyncio
 import logging
+from copy import deepcopy
 from datetime import datetime, timedelta, timezone
 from typing import Any, cast
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock, patch
 
 import aiohttp
 import pytest
 from aresponses import ResponsesMockServer
 
 from simplipy import API
+from simplipy.device.lock import LockRecord, LockStates
+from simplipy.device.sensor.v3 import SensorV3, SensorV3Record
 from simplipy.errors import (
     EndpointUnavailableError,
     InvalidCredentialsError,
@@ -20,11 +24,18 @@ from simplipy.errors import (
     SimplipyError,
 )
 from simplipy.system import SystemStates
-from simplipy.system.v3 import SystemV3, Volume
+from simplipy.system.v3 import SystemV3, SystemV3Record, Volume
+from simplipy.util.cache import ResponseCache
+from simplipy.util.changes import Change, ChangeTracker
 from simplipy.util.dt import utcnow
+from simplipy.util.index import DeviceFlags
+from simplipy.util.polling import PollingPolicy
+from simplipy.websocket import websocket_event_from_payload
 from tests.common import (
     TEST_AUTHORIZATION_CODE,
+    TEST_CAMERA_ID,
     TEST_CODE_VERIFIER,
+    TEST_LOCK_ID,
     TEST_SUBSCRIPTION_ID,
     TEST_SYSTEM_ID,
     TEST_SYSTEM_SERIAL_NO,
@@ -899,6 +910,76 @@ async def test_alarm_state(
     aresponses.assert_plan_strictly_followed()
 
 
+@pytest.mark.asyncio
+async def test_change_tracking(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+    subscriptions_response: dict[str, Any],
+    v3_sensors_response: dict[str, Any],
+    v3_settings_response: dict[str, Any],
+) -> None:
+    """Test detecting which system and device properties change between updates."""
+    subscriptions_response["subscriptions"][0]["location"]["system"]["alarmState"] = (
+        "AWAY"
+    )
+    v3_sensors_response = deepcopy(v3_sensors_response)
+    for sensor in v3_sensors_response["sensors"]:
+        if sensor["serial"] == "825":
+            sensor["status"]["triggered"] = True
+
+    async with authenticated_simplisafe_server_v3:
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/users/{TEST_USER_ID}/subscriptions",
+            "get",
+            response=aiohttp.web_response.json_response(
+                subscriptions_response, status=200
+            ),
+        )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/settings/normal",
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_settings_response, status=200
+            ),
+        )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/sensors",
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_sensors_response, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            simplisafe.change_tracker = tracker = ChangeTracker()
+
+            changes: list[Change] = []
+            remove = tracker.add_callback(changes.extend)
+
+            # Hydrating the system establishes a baseline:
+            systems = await simplisafe.async_get_systems()
+            system = systems[TEST_SYSTEM_ID]
+            assert changes == []
+
+            await system.async_update()
+            assert changes == [
+                Change(
+                    TEST_SYSTEM_ID, None, "state", SystemStates.OFF, SystemStates.AWAY
+                ),
+                Change(TEST_SYSTEM_ID, "825", "triggered", False, True),
+            ]
+
+            remove()
+
+    aresponses.assert_plan_strictly_followed()
+
+
 @pytest.mark.asyncio
 async def test_clear_notifications(
     aresponses: ResponsesMockServer,
@@ -1000,8 +1081,10 @@ async def test_async_get_systems(
         simplisafe = await API.async_from_auth(
             TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
         )
+        assert simplisafe.systems == {}
         systems = await simplisafe.async_get_systems()
         assert len(systems) == 1
+        assert simplisafe.systems == systems
 
         system = systems[TEST_SYSTEM_ID]
         assert system.serial == TEST_SYSTEM_SERIAL_NO
@@ -1011,6 +1094,220 @@ async def test_async_get_systems(
     aresponses.assert_plan_strictly_followed()
 
 
+@pytest.mark.asyncio
+async def test_deferred_update(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+    subscriptions_response: dict[str, Any],
+    v3_sensors_response: dict[str, Any],
+    v3_settings_response: dict[str, Any],
+    v3_state_response: dict[str, Any],
+) -> None:
+    """Test that updates inside the lock state change window share one later update."""
+    v3_state_response["state"] = "AWAY"
+
+    async with authenticated_simplisafe_server_v3:
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/state/away",
+            "post",
+            response=aiohttp.web_response.json_response(v3_state_response, status=200),
+        )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/users/{TEST_USER_ID}/subscriptions",
+            "get",
+            response=aiohttp.web_response.json_response(
+                subscriptions_response, status=200
+            ),
+        )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/settings/normal",
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_settings_response, status=200
+            ),
+        )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/sensors",
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_sensors_response, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            systems = await simplisafe.async_get_systems()
+            system = systems[TEST_SYSTEM_ID]
+
+            with patch(
+                "simplipy.system.v3.DEFAULT_LOCK_STATE_CHANGE_WINDOW",
+                timedelta(seconds=0.1),
+            ):
+                await system.async_set_away()
+                updates = [
+                    asyncio.create_task(
+                        system.async_update(include_subscription=False, defer=True)
+                    ),
+                    asyncio.create_task(
+                        system.async_update(include_settings=False, defer=True)
+                    ),
+                ]
+                await asyncio.sleep(0.05)
+                assert not any(update.done() for update in updates)
+
+                await asyncio.gather(*updates)
+                assert system.get_update_delay() == 0
+                assert system._deferred_update is None
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_subscription_snapshot_reuse(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+    subscriptions_response: dict[str, Any],
+    v3_sensors_response: dict[str, Any],
+    v3_settings_response: dict[str, Any],
+    v3_state_response: dict[str, Any],
+) -> None:
+    """Test that a recent subscription snapshot is reused until a write happens."""
+    async with authenticated_simplisafe_server_v3:
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/users/{TEST_USER_ID}/subscriptions",
+            "get",
+            response=aiohttp.web_response.json_response(
+                subscriptions_response, status=200
+            ),
+        )
+        for _ in range(2):
+            authenticated_simplisafe_server_v3.add(
+                "api.simplisafe.com",
+                f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/settings/normal",
+                "get",
+                response=aiohttp.web_response.json_response(
+                    v3_settings_response, status=200
+                ),
+            )
+            authenticated_simplisafe_server_v3.add(
+                "api.simplisafe.com",
+                f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/sensors",
+                "get",
+                response=aiohttp.web_response.json_response(
+                    v3_sensors_response, status=200
+                ),
+            )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/state/away",
+            "post",
+            response=aiohttp.web_response.json_response(v3_state_response, status=200),
+        )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/users/{TEST_USER_ID}/subscriptions",
+            "get",
+            response=aiohttp.web_response.json_response(
+                subscriptions_response, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            simplisafe.subscription_max_age = 5
+            systems = await simplisafe.async_get_systems()
+            system = systems[TEST_SYSTEM_ID]
+            snapshot_dt = simplisafe.subscription_data_dt
+
+            # The snapshot stored by async_get_systems is still fresh:
+            await system.async_update()
+            assert simplisafe.subscription_epoch == 1
+            assert system.last_poll_dt == snapshot_dt
+
+            # ...unless the caller asks for a new one:
+            await system.async_update(
+                include_settings=False, include_devices=False, reuse_subscription=False
+            )
+            assert simplisafe.subscription_epoch == 2
+
+            # A write makes the snapshot stale:
+            with patch(
+                "simplipy.system.v3.DEFAULT_LOCK_STATE_CHANGE_WINDOW", timedelta(0)
+            ):
+                await system.async_set_away()
+                assert simplisafe.subscription_data_dt is None
+                await system.async_update(include_settings=False, include_devices=False)
+                assert simplisafe.subscription_epoch == 3
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_device_reconciliation(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+    v3_sensors_response: dict[str, Any],
+    v3_settings_response: dict[str, Any],
+) -> None:
+    """Test that device objects are reconciled (rather than regenerated) on update."""
+    v3_sensors_response = deepcopy(v3_sensors_response)
+    removed = next(
+        sensor for sensor in v3_sensors_response["sensors"] if sensor["serial"] == "825"
+    )
+    v3_sensors_response["sensors"].remove(removed)
+    v3_sensors_response["sensors"].append({**removed, "serial": "999"})
+
+    async with authenticated_simplisafe_server_v3:
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/settings/normal",
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_settings_response, status=200
+            ),
+        )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/sensors",
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_sensors_response, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            systems = await simplisafe.async_get_systems()
+            system: SystemV3 = cast(SystemV3, systems[TEST_SYSTEM_ID])
+            removed_sensor = system.sensors["825"]
+            kept_sensor = system.sensors["14"]
+            lock = system.locks[TEST_LOCK_ID]
+
+            removed_devices: list[Any] = []
+            system.add_device_removed_callback(removed_devices.append)
+
+            await system.async_update(include_subscription=False)
+            assert removed_devices == [removed_sensor]
+            assert removed_sensor.serial == "825"
+            assert "825" not in system.sensors
+            assert system.sensors["999"].name == "Fire Door"
+            assert system.sensors["14"] is kept_sensor
+            assert system.locks[TEST_LOCK_ID] is lock
+
+    aresponses.assert_plan_strictly_followed()
+
+
 @pytest.mark.asyncio
 async def test_empty_events(
     aresponses: ResponsesMockServer,
@@ -1069,8 +1366,10 @@ async def test_lock_state_update_bug(
             systems = await simplisafe.async_get_systems()
             system = systems[TEST_SYSTEM_ID]
 
+            assert system.get_update_delay() == 0
             await system.async_set_away()
             assert system.state == SystemStates.AWAY
+            assert 0 < system.get_update_delay() <= 15
 
             await system.async_update()
             assert any("Skipping system update" in e.message for e in caplog.records)
@@ -1149,6 +1448,135 @@ async def test_no_state_change_on_failure(
     aresponses.assert_plan_strictly_followed()
 
 
+@pytest.mark.asyncio
+async def test_polling(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+) -> None:
+    """Test refreshing systems in the background."""
+    async with authenticated_simplisafe_server_v3, aiohttp.ClientSession() as session:
+        simplisafe = await API.async_from_auth(
+            TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+        )
+        systems = await simplisafe.async_get_systems()
+        assert simplisafe.websocket
+
+        with patch.object(SystemV3, "async_update", AsyncMock()) as mock_update:
+            simplisafe.enable_polling(
+                PollingPolicy(active_interval=0.01, idle_interval=0.01, jitter=0)
+            )
+            assert len(simplisafe.websocket._event_handlers) == 1
+            await asyncio.sleep(0.05)
+            assert mock_update.await_count > 1
+
+            simplisafe.disable_polling()
+            assert len(simplisafe.websocket._event_handlers) == 0
+            await asyncio.sleep(0)
+            calls = mock_update.await_count
+            await asyncio.sleep(0.03)
+            assert mock_update.await_count == calls
+
+            # Closing the API stops polling, too:
+            simplisafe.enable_polling(PollingPolicy(idle_interval=0.01, jitter=0))
+            poller = simplisafe._poller
+            assert poller is not None
+            tasks = [task for _, task in poller._tasks.values()]
+            await simplisafe.async_close()
+            assert simplisafe._poller is None
+            assert len(simplisafe.websocket._event_handlers) == 0
+            assert all(task.done() for task in tasks)
+
+        assert systems[TEST_SYSTEM_ID].get_update_delay() == 0
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_polling_wakes_on_events(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+    ws_message_event: dict[str, Any],
+) -> None:
+    """Test that a websocket event triggers a refresh of its system.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server_v3: A authenticated API connection.
+        ws_message_event: A websocket event payload.
+    """
+    async with authenticated_simplisafe_server_v3, aiohttp.ClientSession() as session:
+        simplisafe = await API.async_from_auth(
+            TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+        )
+        await simplisafe.async_get_systems()
+        assert simplisafe.websocket
+
+        with patch.object(SystemV3, "async_update", AsyncMock()) as mock_update:
+            simplisafe.enable_polling(
+                PollingPolicy(active_interval=0.01, idle_interval=60, jitter=0)
+            )
+            await asyncio.sleep(0.03)
+            mock_update.assert_not_awaited()
+
+            await simplisafe.websocket._async_deliver_event(
+                websocket_event_from_payload(ws_message_event)
+            )
+            await asyncio.sleep(0.05)
+            mock_update.assert_awaited_once_with(defer=True)
+
+            await simplisafe.async_close()
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_polling_tracks_systems(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+    subscriptions_response: dict[str, Any],
+) -> None:
+    """Test that polling starts and stops as systems come and go.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server_v3: A authenticated API connection.
+        subscriptions_response: An API response payload.
+    """
+    async with authenticated_simplisafe_server_v3:
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/users/{TEST_USER_ID}/subscriptions",
+            "get",
+            response=aiohttp.web_response.json_response(
+                {**subscriptions_response, "subscriptions": []}, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            simplisafe.enable_polling()
+            poller = simplisafe._poller
+            assert poller is not None
+            assert not poller._tasks
+
+            # A new system starts being refreshed:
+            await simplisafe.async_get_systems()
+            assert list(poller._tasks) == [TEST_SYSTEM_ID]
+            _, task = poller._tasks[TEST_SYSTEM_ID]
+
+            # A system that disappears stops being refreshed:
+            await simplisafe.async_get_systems()
+            assert not poller._tasks
+            await asyncio.gather(task, return_exceptions=True)
+            assert task.cancelled()
+
+            await simplisafe.async_close()
+
+    aresponses.assert_plan_strictly_followed()
+
+
 @pytest.mark.asyncio
 async def test_properties(
     aresponses: ResponsesMockServer,
@@ -1691,6 +2119,67 @@ async def test_system_notifications(
     aresponses.assert_plan_strictly_followed()
 
 
+@pytest.mark.asyncio
+async def test_typed_decoding(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+    v3_settings_response: dict[str, Any],
+) -> None:
+    """Test decoding system and device payloads into typed records."""
+    async with authenticated_simplisafe_server_v3:
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/settings/normal",
+            "post",
+            response=aiohttp.web_response.json_response(
+                v3_settings_response, status=200
+            ),
+        )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/doorlock/{TEST_SUBSCRIPTION_ID}/{TEST_LOCK_ID}/state",
+            "post",
+            response=aresponses.Response(text=None, status=200),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            assert simplisafe.typed_decoding is False
+            systems = await simplisafe.async_get_systems()
+            system: SystemV3 = cast(SystemV3, systems[TEST_SYSTEM_ID])
+            raw_dict = system.as_dict()
+            assert system._record is None
+
+            simplisafe.typed_decoding = True
+            # mypy doesn't know that the setter replaced the record, so read it anew:
+            record: Any = system._record
+            assert isinstance(record, SystemV3Record)
+            assert isinstance(system.sensors["825"]._record, SensorV3Record)
+            assert isinstance(system.locks[TEST_LOCK_ID]._record, LockRecord)
+            assert system.as_dict() == raw_dict
+
+            # Properties read the record, not the raw payload:
+            system.settings_data["basestationStatus"]["wifiRssi"] = -80
+            system.sensor_data["825"]["status"]["triggered"] = True
+            assert system.wifi_strength == -49
+            assert system.sensors["825"].triggered is False
+
+            # Changes made by the library itself are decoded right away:
+            await system.async_set_properties({"alarm_duration": 240})
+            assert system.wifi_strength == -49
+            lock = system.locks[TEST_LOCK_ID]
+            await lock.async_unlock()
+            assert lock.state == LockStates.UNLOCKED
+
+            simplisafe.typed_decoding = False
+            assert system._record is None
+            assert system.sensors["825"].as_dict()["triggered"] is True
+
+    aresponses.assert_plan_strictly_followed()
+
+
 @pytest.mark.asyncio
 async def test_unavailable_endpoint(
     aresponses: ResponsesMockServer,
@@ -1774,6 +2263,60 @@ async def test_update_system_data(
     aresponses.assert_plan_strictly_followed()
 
 
+@pytest.mark.asyncio
+async def test_update_system_data_concurrently(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+    subscriptions_response: dict[str, Any],
+    v3_sensors_response: dict[str, Any],
+    v3_settings_response: dict[str, Any],
+) -> None:
+    """Test getting updated data for a v3 system with concurrent fetches."""
+    async with authenticated_simplisafe_server_v3:
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/users/{TEST_USER_ID}/subscriptions",
+            "get",
+            response=aiohttp.web_response.json_response(
+                subscriptions_response, status=200
+            ),
+        )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/settings/normal",
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_settings_response, status=200
+            ),
+        )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/sensors",
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_sensors_response, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            systems = await simplisafe.async_get_systems()
+            system: SystemV3 = cast(SystemV3, systems[TEST_SYSTEM_ID])
+            system.sensor_data = {}
+            system.settings_data = {}
+
+            await system.async_update(concurrent=True)
+
+            assert system.state == SystemStates.OFF
+            assert system.wifi_ssid == "MY_WIFI"
+            assert len(system.sensor_data) == 28
+            assert len(system.camera_data) == 3
+
+    aresponses.assert_plan_strictly_followed()
+
+
 @pytest.mark.asyncio
 async def test_update_error(
     aresponses: ResponsesMockServer,
@@ -1822,3 +2365,196 @@ async def test_update_error(
                 await system.async_update()
 
     aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_last_poll_dt_follows_snapshot(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+    subscriptions_response: dict[str, Any],
+    ws_message_event: dict[str, Any],
+) -> None:
+    """Test that a system's state is dated by the snapshot it comes from.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server_v3: A authenticated API connection.
+        subscriptions_response: An API response payload.
+        ws_message_event: A websocket event payload.
+    """
+    async with authenticated_simplisafe_server_v3:
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/users/{TEST_USER_ID}/subscriptions",
+            "get",
+            response=aiohttp.web_response.json_response(
+                subscriptions_response, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            systems = await simplisafe.async_get_systems()
+            system = systems[TEST_SYSTEM_ID]
+            assert simplisafe.websocket
+            assert system.last_poll_dt == simplisafe.subscription_data_dt
+
+            # A fresh fetch is dated by when it was requested:
+            simplisafe.response_cache = ResponseCache()
+            await system.async_update(include_settings=False, include_devices=False)
+            fetched_dt = system.last_poll_dt
+            assert fetched_dt is not None
+            assert fetched_dt == simplisafe.subscription_data_dt
+
+            # A cached response (or an update that doesn't fetch subscription data at
+            # all) is only as recent as the original fetch:
+            await asyncio.sleep(0.01)
+            await system.async_update(include_settings=False, include_devices=False)
+            assert system.last_poll_dt == fetched_dt
+            await system.async_update(
+                include_subscription=False,
+                include_settings=False,
+                include_devices=False,
+            )
+            assert system.last_poll_dt == fetched_dt
+            assert (
+                await simplisafe.async_get_subscription_data()
+                == simplisafe.subscription_data
+            )
+
+            # ...so an event that happened since then is still applied:
+            simplisafe.enable_websocket_state_updates()
+            payload = deepcopy(ws_message_event)
+            payload["data"]["eventTimestamp"] = fetched_dt.timestamp() + 0.005
+            await simplisafe.websocket._async_deliver_event(
+                websocket_event_from_payload(payload)
+            )
+            assert system.last_event_dt is not None
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_websocket_state_updates(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+    ws_message_event: dict[str, Any],
+) -> None:
+    """Test applying websocket events to system and device state.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server_v3: A authenticated API connection.
+        ws_message_event: A websocket event payload.
+    """
+
+    def get_payload(event_cid: int, serial: str, *, stale: bool = False) -> Any:
+        """Get a websocket event payload.
+
+        Args:
+            event_cid: A SimpliSafe code for a particular event.
+            serial: The serial number of the device the event is about.
+            stale: Whether the event should predate the last system update.
+
+        Returns:
+            A websocket event payload.
+        """
+        payload = deepcopy(ws_message_event)
+        payload["data"]["eventCid"] = event_cid
+        payload["data"]["sensorSerial"] = serial
+        if not stale:
+            payload["data"]["eventTimestamp"] = utcnow().timestamp() + 1
+        return payload
+
+    async with authenticated_simplisafe_server_v3, aiohttp.ClientSession() as session:
+        simplisafe = await API.async_from_auth(
+            TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+        )
+        systems = await simplisafe.async_get_systems()
+        system = cast(SystemV3, systems[TEST_SYSTEM_ID])
+        assert simplisafe.websocket
+        assert system.last_event_dt is None
+        assert system.last_poll_dt is not None
+
+        simplisafe.enable_websocket_state_updates()
+        # State is updated on the event loop, even if user callbacks run in threads:
+        simplisafe.websocket.callback_executor.run_sync_in_executor = True
+        state = system.state
+
+        # Events that predate the last update are ignored:
+        await simplisafe.websocket._async_parse_payload(
+            get_payload(1110, "129", stale=True)
+        )
+        assert system.state == state
+        assert system.last_event_dt is None
+
+        # Collect the state after each event (rather than asserting on it in between),
+        # so that mypy doesn't narrow a property across events that change it:
+        lock = system.locks[TEST_LOCK_ID]
+        lock_states = []
+        for event_cid in (9700, 9703, 9701):
+            await simplisafe.websocket._async_parse_payload(
+                get_payload(event_cid, TEST_LOCK_ID)
+            )
+            jammed = simplisafe.device_index.get_devices(flag=DeviceFlags.LOCK_JAMMED)
+            lock_states.append((lock.state, lock in jammed))
+        assert lock_states == [
+            (LockStates.UNLOCKED, False),
+            (LockStates.JAMMED, True),
+            (LockStates.LOCKED, False),
+        ]
+        # (For the same reason, read the system through the dict it came from:)
+        assert systems[TEST_SYSTEM_ID].last_event_dt is not None
+
+        sensor = cast(SensorV3, system.sensors["825"])
+        offline = []
+        for event_cid in (1381, 3381):
+            await simplisafe.websocket._async_parse_payload(
+                get_payload(event_cid, "825")
+            )
+            offline.append(sensor.offline)
+        assert offline == [True, False]
+
+        assert system.get_update_delay() == 0
+        await simplisafe.websocket._async_parse_payload(get_payload(1110, "129"))
+        assert system.state == SystemStates.ALARM
+        assert system.sensors["129"].triggered is True
+        assert simplisafe.device_index.get_devices(flag=DeviceFlags.TRIGGERED) == [
+            system.sensors["129"]
+        ]
+        # Only arming/disarming via the API opens the lock state change window:
+        assert system.get_update_delay() == 0
+
+        # A backfilled event that is older than the last event doesn't undo it:
+        payload = get_payload(1400, "129")
+        payload["data"]["eventTimestamp"] -= 0.5
+        await simplisafe.websocket._async_deliver_event(
+            websocket_event_from_payload(payload, backfilled=True)
+        )
+        assert system.state == SystemStates.ALARM
+
+        # Events that don't apply to a device leave it alone:
+        camera_data = deepcopy(system.camera_data[TEST_CAMERA_ID])
+        await simplisafe.websocket._async_parse_payload(
+            get_payload(1170, TEST_CAMERA_ID)
+        )
+        assert system.camera_data[TEST_CAMERA_ID] == camera_data
+        sensor_data = deepcopy(system.sensor_data["825"])
+        await simplisafe.websocket._async_parse_payload(get_payload(1601, "825"))
+        assert system.sensor_data["825"] == sensor_data
+        assert system.state == SystemStates.ALARM
+
+        # Events for unknown systems are ignored:
+        payload = get_payload(1400, "129")
+        payload["data"]["sid"] = 98765
+        await simplisafe.websocket._async_parse_payload(payload)
+        assert system.state == SystemStates.ALARM
+
+        simplisafe.disable_websocket_state_updates()
+        assert len(simplisafe.websocket._event_handlers) == 0
+        await simplisafe.websocket._async_parse_payload(get_payload(1400, "129"))
+        assert system.state == SystemStates.ALARM
+
+    aresponses.assert_plan_strictly_followed()
@@ -4,8 +4,9 @@
 from __future__ import annotations
 
 import asyncio
+import re
 from datetime import timedelta
-from typing import Any
+from typing import Any, cast
 from unittest.mock import AsyncMock, Mock, patch
 
 import aiohttp
@@ -13,8 +14,23 @@ import pytest
 from aresponses import ResponsesMockServer
 
 from simplipy import API
-from simplipy.errors import InvalidCredentialsError, RequestError, SimplipyError
+from simplipy.errors import (
+    CircuitOpenError,
+    InvalidCredentialsError,
+    RequestError,
+    RequestTimeoutError,
+    SimplipyError,
+    WebsocketError,
+)
+from simplipy.system.v3 import SystemV3
+from simplipy.util.cache import ResponseCache
+from simplipy.util.circuit_breaker import CircuitBreaker, CircuitState
+from simplipy.util.coalesce import get_request_key
+from simplipy.util.codec import STDLIB_CODEC
 from simplipy.util.dt import utcnow
+from simplipy.util.rate_limit import RateLimit, RateLimiter
+from simplipy.util.retry import RetryPolicy
+from simplipy.util.scheduler import RequestPriority, RequestScheduler, request_priority
 
 from .common import (
     TEST_ACCESS_TOKEN,
@@ -22,6 +38,7 @@ from .common import (
     TEST_CODE_VERIFIER,
     TEST_REFRESH_TOKEN,
     TEST_SUBSCRIPTION_ID,
+    TEST_USER_ID,
 )
 
 
@@ -221,10 +238,14 @@ async def test_client_async_from_authorization_code(
 
     async with aiohttp.ClientSession() as session:
         simplisafe = await API.async_from_auth(
-            TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            TEST_AUTHORIZATION_CODE,
+            TEST_CODE_VERIFIER,
+            session=session,
+            json_codec=STDLIB_CODEC,
         )
         assert simplisafe.access_token == TEST_ACCESS_TOKEN
         assert simplisafe.refresh_token == TEST_REFRESH_TOKEN
+        assert simplisafe.json_codec is STDLIB_CODEC
 
     aresponses.assert_plan_strictly_followed()
 
@@ -293,10 +314,11 @@ async def test_client_async_from_refresh_token(
 
     async with aiohttp.ClientSession() as session:
         simplisafe = await API.async_from_refresh_token(
-            TEST_REFRESH_TOKEN, session=session
+            TEST_REFRESH_TOKEN, session=session, json_codec=STDLIB_CODEC
         )
         assert simplisafe.access_token == TEST_ACCESS_TOKEN
         assert simplisafe.refresh_token == TEST_REFRESH_TOKEN
+        assert simplisafe.json_codec is STDLIB_CODEC
 
     aresponses.assert_plan_strictly_followed()
 
@@ -514,3 +536,909 @@ async def test_string_response(aresponses: ResponsesMockServer) -> None:
             )
 
     aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_request_coalescing(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server: ResponsesMockServer,
+    subscriptions_response: dict[str, Any],
+) -> None:
+    """Test that concurrent, identical GET requests share one in-flight request.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server: A authenticated API connection.
+        subscriptions_response: An API response payload.
+    """
+    async with authenticated_simplisafe_server:
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com",
+            f"/v1/users/{TEST_SUBSCRIPTION_ID}/subscriptions",
+            "get",
+            response=aiohttp.web_response.json_response(
+                subscriptions_response, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+
+            results = await asyncio.gather(
+                *[
+                    simplisafe.async_request(
+                        "get",
+                        f"users/{TEST_SUBSCRIPTION_ID}/subscriptions",
+                        params={"activeOnly": "true"},
+                    )
+                    for _ in range(3)
+                ]
+            )
+
+            # Every caller gets an equal, but separate, response:
+            assert all(result == subscriptions_response for result in results)
+            assert len({id(result) for result in results}) == 3
+            stats = simplisafe.request_coalescer.stats
+            assert stats.requests == 3
+            assert stats.coalesced == 2
+            assert stats.in_flight == 0
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_request_coalescing_per_budget_and_priority(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server: ResponsesMockServer,
+    subscriptions_response: dict[str, Any],
+) -> None:
+    """Test that only requests with the same time budget and priority are coalesced.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server: A authenticated API connection.
+        subscriptions_response: An API response payload.
+    """
+    async with authenticated_simplisafe_server:
+        for _ in range(3):
+            authenticated_simplisafe_server.add(
+                "api.simplisafe.com",
+                f"/v1/users/{TEST_SUBSCRIPTION_ID}/subscriptions",
+                "get",
+                response=aiohttp.web_response.json_response(
+                    subscriptions_response, status=200
+                ),
+            )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            endpoint = f"users/{TEST_SUBSCRIPTION_ID}/subscriptions"
+
+            async def async_background_request() -> dict[str, Any]:
+                """Make the request as a background read.
+
+                Returns:
+                    An API response payload.
+                """
+                with request_priority(RequestPriority.BACKGROUND):
+                    return await simplisafe.async_request("get", endpoint)
+
+            await asyncio.gather(
+                simplisafe.async_request("get", endpoint),
+                simplisafe.async_request("get", endpoint, timeout=30),
+                async_background_request(),
+            )
+
+            stats = simplisafe.request_coalescer.stats
+            assert stats.requests == 3
+            assert stats.coalesced == 0
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.parametrize(
+    ("method", "kwargs", "coalescable"),
+    [
+        ("get", {"params": {"activeOnly": "true"}}, True),
+        ("get", {"headers": {"Host": "auth.simplisafe.com"}}, False),
+        ("get", {"params": {"ids": ["1", "2"]}}, False),
+        ("post", {}, False),
+    ],
+)
+def test_request_key(method: str, kwargs: dict[str, Any], coalescable: bool) -> None:
+    """Test which requests can be coalesced.
+
+    Args:
+        method: An HTTP method.
+        kwargs: Additional request kwargs.
+        coalescable: Whether the request should be coalescable.
+    """
+    assert (get_request_key(method, "api/authCheck", kwargs) is not None) is coalescable
+
+
+@pytest.mark.asyncio
+async def test_request_coalescing_skips_writes(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server: ResponsesMockServer,
+    v3_state_response: dict[str, Any],
+) -> None:
+    """Test that non-GET requests are never coalesced.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server: A authenticated API connection.
+        v3_state_response: An API response payload.
+    """
+    async with authenticated_simplisafe_server:
+        for _ in range(2):
+            authenticated_simplisafe_server.add(
+                "api.simplisafe.com",
+                f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/state/away",
+                "post",
+                response=aiohttp.web_response.json_response(
+                    v3_state_response, status=200
+                ),
+            )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+
+            await asyncio.gather(
+                *[
+                    simplisafe.async_request(
+                        "post", f"ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/state/away"
+                    )
+                    for _ in range(2)
+                ]
+            )
+
+            assert simplisafe.request_coalescer.stats.requests == 0
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_response_cache(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+    subscriptions_response: dict[str, Any],
+    v3_sensors_response: dict[str, Any],
+    v3_settings_response: dict[str, Any],
+) -> None:
+    """Test that the response cache serves reads and is invalidated by writes.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server_v3: A authenticated API connection.
+        subscriptions_response: An API response payload.
+        v3_sensors_response: An API response payload.
+        v3_settings_response: An API response payload.
+    """
+    async with authenticated_simplisafe_server_v3:
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/settings/normal",
+            "post",
+            response=aiohttp.web_response.json_response(
+                v3_settings_response, status=200
+            ),
+        )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/users/{TEST_USER_ID}/subscriptions",
+            "get",
+            response=aiohttp.web_response.json_response(
+                subscriptions_response, status=200
+            ),
+        )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/sensors",
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_sensors_response, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+
+            simplisafe.response_cache = cache = ResponseCache()
+            systems = await simplisafe.async_get_systems()
+            system: SystemV3 = cast(SystemV3, systems[TEST_SUBSCRIPTION_ID])
+
+            # Everything this update needs is already cached:
+            await system.async_update()
+            cache_stats = cache.stats
+            assert cache_stats.hits == 3
+            assert cache_stats.entries == 3
+
+            # Writing settings should invalidate every entry for the system (as well
+            # as the subscription data), so the next update hits the network again
+            # (except for settings, which aren't requested):
+            await system.async_set_properties({"alarm_duration": 30})
+            assert cache_stats.invalidations == 3
+            await system.async_update(include_settings=False)
+            assert cache_stats.entries == 2
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_response_cache_skips_forced_requests(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+    v3_sensors_response: dict[str, Any],
+    v3_settings_response: dict[str, Any],
+) -> None:
+    """Test that requests for fresh data are never served from the response cache.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server_v3: A authenticated API connection.
+        v3_sensors_response: An API response payload.
+        v3_settings_response: An API response payload.
+    """
+    async with authenticated_simplisafe_server_v3:
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/settings/normal",
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_settings_response, status=200
+            ),
+        )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/sensors",
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_sensors_response, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+
+            simplisafe.response_cache = cache = ResponseCache()
+            systems = await simplisafe.async_get_systems()
+            system: SystemV3 = cast(SystemV3, systems[TEST_SUBSCRIPTION_ID])
+
+            # Both reads go to the cloud (with forceUpdate=true), even though their
+            # cached counterparts are fresh:
+            await system.async_update(include_subscription=False, cached=False)
+            assert cache.stats.hits == 0
+
+            # A caller modifying its response doesn't change the cached copy:
+            endpoint = f"ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/sensors"
+            params = {"forceUpdate": "false"}
+            sensors = await simplisafe.async_request("get", endpoint, params=params)
+            sensors["sensors"].clear()
+            sensors = await simplisafe.async_request("get", endpoint, params=params)
+            assert sensors == v3_sensors_response
+            assert cache.stats.hits == 2
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_get_systems_concurrency(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server: ResponsesMockServer,
+    subscriptions_response: dict[str, Any],
+) -> None:
+    """Test that systems are hydrated concurrently (within the limit).
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server: A authenticated API connection.
+        subscriptions_response: An API response payload.
+    """
+    subscription = subscriptions_response["subscriptions"][0]
+    subscriptions_response["subscriptions"] = [
+        {**subscription, "sid": sid} for sid in range(1, 7)
+    ]
+
+    async with authenticated_simplisafe_server:
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com",
+            f"/v1/users/{TEST_USER_ID}/subscriptions",
+            "get",
+            response=aiohttp.web_response.json_response(
+                subscriptions_response, status=200
+            ),
+        )
+
+        active = 0
+        max_active = 0
+
+        async def mock_update(**_: Any) -> None:
+            """Mock a slow system update."""
+            nonlocal active, max_active
+            active += 1
+            max_active = max(max_active, active)
+            await asyncio.sleep(0.1)
+            active -= 1
+
+        with patch(
+            "simplipy.system.v3.SystemV3.async_update",
+            AsyncMock(side_effect=mock_update),
+        ), patch("simplipy.system.v3.SystemV3.generate_device_objects"):
+            async with aiohttp.ClientSession() as session:
+                simplisafe = await API.async_from_auth(
+                    TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+                )
+                systems = await simplisafe.async_get_systems(max_concurrency=3)
+
+        assert list(systems) == [1, 2, 3, 4, 5, 6]
+        assert max_active == 3
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_get_systems_partial_failure(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server: ResponsesMockServer,
+    subscriptions_response: dict[str, Any],
+) -> None:
+    """Test that a single system failure doesn't abort the others.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server: A authenticated API connection.
+        subscriptions_response: An API response payload.
+    """
+    subscription = subscriptions_response["subscriptions"][0]
+    subscriptions_response["subscriptions"] = [
+        {**subscription, "sid": sid} for sid in (1, 2)
+    ]
+
+    async with authenticated_simplisafe_server:
+        for _ in range(2):
+            authenticated_simplisafe_server.add(
+                "api.simplisafe.com",
+                f"/v1/users/{TEST_USER_ID}/subscriptions",
+                "get",
+                response=aiohttp.web_response.json_response(
+                    subscriptions_response, status=200
+                ),
+            )
+
+        failing_sids: set[int] = {1}
+
+        async def mock_update(system: Any, **_: Any) -> None:
+            """Mock a system update that fails for some systems."""
+            if system.system_id in failing_sids:
+                raise RequestError("Gateway Timeout")
+
+        with patch(
+            "simplipy.system.v3.SystemV3.async_update", autospec=True
+        ) as mock_async_update, patch(
+            "simplipy.system.v3.SystemV3.generate_device_objects"
+        ):
+            mock_async_update.side_effect = mock_update
+
+            async with aiohttp.ClientSession() as session:
+                simplisafe = await API.async_from_auth(
+                    TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+                )
+
+                systems = await simplisafe.async_get_systems()
+                assert list(systems) == [2]
+                assert isinstance(simplisafe.system_errors[1], RequestError)
+
+                # If every system fails, the error is raised:
+                failing_sids.add(2)
+                with pytest.raises(RequestError):
+                    await simplisafe.async_get_systems()
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_update_all_systems(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server: ResponsesMockServer,
+    subscriptions_response: dict[str, Any],
+    v3_sensors_response: dict[str, Any],
+    v3_settings_response: dict[str, Any],
+) -> None:
+    """Test that updating all systems fetches subscription data exactly once.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server: A authenticated API connection.
+        subscriptions_response: An API response payload.
+        v3_sensors_response: An API response payload.
+        v3_settings_response: An API response payload.
+    """
+    subscription = subscriptions_response["subscriptions"][0]
+    subscriptions_response["subscriptions"] = [
+        {**subscription, "sid": sid} for sid in (1, 2)
+    ]
+
+    async with authenticated_simplisafe_server:
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com",
+            f"/v1/users/{TEST_USER_ID}/subscriptions",
+            "get",
+            response=aiohttp.web_response.json_response(
+                subscriptions_response, status=200
+            ),
+        )
+
+        # Simulate a camera being removed upstream before the second fetch:
+        subscription["location"]["system"]["cameras"] = []
+
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com",
+            f"/v1/users/{TEST_USER_ID}/subscriptions",
+            "get",
+            response=aiohttp.web_response.json_response(
+                subscriptions_response, status=200
+            ),
+            repeat=2,
+        )
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com",
+            re.compile(r"/v1/ss3/subscriptions/\d+/settings/normal"),
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_settings_response, status=200
+            ),
+            repeat=6,
+        )
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com",
+            re.compile(r"/v1/ss3/subscriptions/\d+/sensors"),
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_sensors_response, status=200
+            ),
+            repeat=6,
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            simplisafe.request_scheduler = RequestScheduler(max_concurrency=2)
+
+            systems = await simplisafe.async_get_systems()
+            assert simplisafe.subscription_epoch == 1
+            for system in systems.values():
+                assert len(cast(SystemV3, system).camera_data) == 3
+
+            await simplisafe.async_update_all_systems()
+            assert simplisafe.subscription_epoch == 2
+            assert simplisafe.subscription_data_dt is not None
+            assert simplisafe.system_errors == {}
+            for system in systems.values():
+                assert cast(SystemV3, system).camera_data == {}
+
+            # Reads made by the fleet-wide update are scheduled as background work
+            # (unless the caller asks for a different priority):
+            stats = simplisafe.request_scheduler.stats
+            assert stats[RequestPriority.INTERACTIVE].requests == 5
+            assert stats[RequestPriority.BACKGROUND].requests == 5
+            assert stats[RequestPriority.CRITICAL].requests == 0
+
+            await simplisafe.async_update_all_systems(
+                priority=RequestPriority.INTERACTIVE
+            )
+            assert stats[RequestPriority.INTERACTIVE].requests == 10
+            assert stats[RequestPriority.BACKGROUND].requests == 5
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_proactive_token_refresh(
+    api_token_response: dict[str, Any],
+    aresponses: ResponsesMockServer,
+    auth_check_response: dict[str, Any],
+    caplog: Mock,
+) -> None:
+    """Test that the access token is refreshed before it expires.
+
+    Args:
+        api_token_response: An API response payload.
+        aresponses: An aresponses server.
+        auth_check_response: An API response payload.
+        caplog: A mocked logging utility.
+    """
+    api_token_response["expires_in"] = 0.2
+    aresponses.add(
+        "auth.simplisafe.com",
+        "/oauth/token",
+        "post",
+        response=aiohttp.web_response.json_response(api_token_response, status=200),
+    )
+    aresponses.add(
+        "api.simplisafe.com",
+        "/v1/api/authCheck",
+        "get",
+        response=aiohttp.web_response.json_response(auth_check_response, status=200),
+    )
+
+    api_token_response["access_token"] = "jjhhgg66"  # noqa: S105
+    api_token_response["refresh_token"] = "aabbcc11"  # noqa: S105
+    api_token_response["expires_in"] = 3600
+    aresponses.add(
+        "auth.simplisafe.com",
+        "/oauth/token",
+        "post",
+        response=aiohttp.web_response.json_response(api_token_response, status=200),
+    )
+    aresponses.add(
+        "auth.simplisafe.com",
+        "/oauth/token",
+        "post",
+        response=aresponses.Response(text="Gateway Timeout", status=504),
+    )
+
+    mock_callback = Mock()
+
+    async with aiohttp.ClientSession() as session:
+        simplisafe = await API.async_from_auth(
+            TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+        )
+        simplisafe.add_refresh_token_callback(mock_callback)
+        simplisafe.websocket = Mock(
+            connected=True,
+            async_reauthenticate=AsyncMock(side_effect=WebsocketError("Not connected")),
+        )
+
+        def is_refresh_scheduled() -> bool:
+            """Return whether a proactive refresh is scheduled.
+
+            Returns:
+                Whether a refresh is scheduled.
+            """
+            return simplisafe._token_refresh_timer is not None
+
+        # Proactive refreshes are opt-in; turning them on schedules a refresh of the
+        # current token:
+        assert not simplisafe.proactive_token_refresh
+        assert not is_refresh_scheduled()
+        simplisafe.proactive_token_refresh = True
+        assert is_refresh_scheduled()
+
+        # The token expires in 0.2 seconds, so the refresh happens at 0.1 seconds:
+        await asyncio.sleep(0.3)
+        assert simplisafe.access_token == "jjhhgg66"  # noqa: S105
+        mock_callback.assert_called_once_with("aabbcc11")
+        simplisafe.websocket.async_reauthenticate.assert_awaited_once()
+        assert "Error while re-identifying with the websocket" in caplog.text
+
+        # The new token's refresh is scheduled far in the future:
+        assert is_refresh_scheduled()
+
+        # A failed proactive refresh is logged (and the reactive flow takes over):
+        simplisafe._start_proactive_token_refresh()
+        assert not is_refresh_scheduled()
+        task = simplisafe._token_refresh_task
+        assert task is not None
+        await asyncio.gather(task, return_exceptions=True)
+        assert "Error while proactively refreshing access token" in caplog.text
+
+        simplisafe.proactive_token_refresh = True
+        assert is_refresh_scheduled()
+        # Turning proactive refreshes off cancels the scheduled refresh:
+        simplisafe.proactive_token_refresh = False
+        assert not is_refresh_scheduled()
+        simplisafe._schedule_token_refresh(0.1)
+        assert not is_refresh_scheduled()
+
+        # A refresh that was scheduled before proactive refreshes were turned off
+        # doesn't start:
+        simplisafe._start_proactive_token_refresh()
+        assert simplisafe._token_refresh_task is task
+
+        simplisafe.proactive_token_refresh = True
+        simplisafe._schedule_token_refresh(3600)
+        assert is_refresh_scheduled()
+
+        # Closing the API cancels the scheduled refresh:
+        await simplisafe.async_close()
+        assert not is_refresh_scheduled()
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_refresh_access_token_single_flight(
+    api_token_response: dict[str, Any],
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server: ResponsesMockServer,
+) -> None:
+    """Test that concurrent token refreshes share a single request.
+
+    Args:
+        api_token_response: An API response payload.
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server: A authenticated API connection.
+    """
+    async with authenticated_simplisafe_server:
+        api_token_response["access_token"] = "jjhhgg66"  # noqa: S105
+        authenticated_simplisafe_server.add(
+            "auth.simplisafe.com",
+            "/oauth/token",
+            "post",
+            response=aiohttp.web_response.json_response(api_token_response, status=200),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            await asyncio.gather(
+                *(simplisafe.async_refresh_access_token() for _ in range(5))
+            )
+            assert simplisafe.access_token == "jjhhgg66"  # noqa: S105
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_rate_limiting(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server: ResponsesMockServer,
+    v3_sensors_response: dict[str, Any],
+) -> None:
+    """Test that requests are queued once they exceed a rate limit budget.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server: A authenticated API connection.
+        v3_sensors_response: An API response payload.
+    """
+    async with authenticated_simplisafe_server:
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/sensors",
+            "get",
+            response=aiohttp.web_response.json_response(v3_sensors_response),
+            repeat=3,
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            simplisafe.rate_limiter = limiter = RateLimiter(
+                family_limits={"sensors": RateLimit(20.0, 1)}
+            )
+            for _ in range(3):
+                await simplisafe.async_request(
+                    "get", f"ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/sensors"
+                )
+
+            stats = limiter.stats
+            assert stats["global"].requests == 3
+            assert stats["sensors"].requests == 3
+            assert stats["sensors"].delayed == 2
+            assert stats["sensors"].total_wait > 0
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server: ResponsesMockServer,
+    v3_sensors_response: dict[str, Any],
+) -> None:
+    """Test that an endpoint family fails fast once its circuit opens.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server: A authenticated API connection.
+        v3_sensors_response: An API response payload.
+    """
+    endpoint = f"ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/sensors"
+
+    async with authenticated_simplisafe_server:
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com",
+            f"/v1/{endpoint}",
+            "get",
+            response=aresponses.Response(text="Service Unavailable", status=503),
+            repeat=2,
+        )
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com",
+            f"/v1/{endpoint}",
+            "get",
+            response=aiohttp.web_response.json_response(v3_sensors_response),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            mock_callback = Mock()
+            simplisafe.disable_request_retries()
+            simplisafe.circuit_breaker = breaker = CircuitBreaker(
+                failure_threshold=2, recovery_timeout=0.1, on_state_change=mock_callback
+            )
+            simplisafe.rate_limiter = RateLimiter(global_limit=RateLimit(0.01, 2))
+
+            for _ in range(2):
+                with pytest.raises(RequestError):
+                    await simplisafe.async_request("get", endpoint)
+
+            # The circuit is now open, so this never reaches the server:
+            with pytest.raises(CircuitOpenError):
+                await simplisafe.async_request("get", endpoint)
+            assert breaker.states == {"sensors": CircuitState.OPEN}
+
+            await asyncio.sleep(0.1)
+
+            # A probe that is canceled while it waits for the rate limiter (here, an
+            # uncoalesced POST) doesn't block the next one:
+            probe = asyncio.create_task(simplisafe.async_request("post", endpoint))
+            await asyncio.sleep(0)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+            assert breaker.states == {"sensors": CircuitState.HALF_OPEN}
+
+            simplisafe.rate_limiter = None
+            await simplisafe.async_request("get", endpoint)
+            assert breaker.states == {"sensors": CircuitState.CLOSED}
+            assert [call.args for call in mock_callback.call_args_list] == [
+                ("sensors", CircuitState.OPEN),
+                ("sensors", CircuitState.HALF_OPEN),
+                ("sensors", CircuitState.CLOSED),
+            ]
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_retry_policy(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server: ResponsesMockServer,
+    v3_sensors_response: dict[str, Any],
+) -> None:
+    """Test honoring Retry-After headers and per-call retry policies.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server: A authenticated API connection.
+        v3_sensors_response: An API response payload.
+    """
+    endpoint = f"ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/sensors"
+
+    async with authenticated_simplisafe_server:
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com",
+            f"/v1/{endpoint}",
+            "get",
+            response=aresponses.Response(
+                text="Too Many Requests", status=429, headers={"Retry-After": "0"}
+            ),
+        )
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com",
+            f"/v1/{endpoint}",
+            "get",
+            response=aiohttp.web_response.json_response(v3_sensors_response),
+        )
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com",
+            f"/v1/{endpoint}",
+            "get",
+            response=aresponses.Response(
+                text="Service Unavailable", status=503, headers={"Retry-After": "60"}
+            ),
+        )
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com",
+            f"/v1/{endpoint}",
+            "get",
+            response=aresponses.Response(text="Conflict", status=409),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+
+            # The 429 asks for an immediate retry, so this doesn't back off:
+            start = asyncio.get_running_loop().time()
+            await simplisafe.async_request("get", endpoint)
+            assert asyncio.get_running_loop().time() - start < 1
+
+            # Waiting as long as the 503 asks would exceed the deadline:
+            with pytest.raises(RequestTimeoutError):
+                await simplisafe.async_request(
+                    "get", endpoint, retry_policy=RetryPolicy(deadline=10)
+                )
+
+            # A per-call policy is used even while retries are disabled globally:
+            simplisafe.disable_request_retries()
+            with pytest.raises(RequestError):
+                await simplisafe.async_request(
+                    "get", endpoint, retry_policy=RetryPolicy(max_tries=1)
+                )
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_request_timeouts(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server: ResponsesMockServer,
+    v3_sensors_response: dict[str, Any],
+) -> None:
+    """Test per-attempt timeouts and total request time budgets.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server: A authenticated API connection.
+        v3_sensors_response: An API response payload.
+    """
+    endpoint = f"ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/sensors"
+
+    async def hung_response(_: aiohttp.web.Request) -> aiohttp.web.Response:
+        """Respond after a long delay.
+
+        Returns:
+            A JSON response.
+        """
+        await asyncio.sleep(1)
+        return aiohttp.web_response.json_response(v3_sensors_response)
+
+    async with authenticated_simplisafe_server:
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com", f"/v1/{endpoint}", "get", response=hung_response
+        )
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com", f"/v1/{endpoint}", "post", response=hung_response
+        )
+        authenticated_simplisafe_server.add(
+            "api.simplisafe.com",
+            f"/v1/{endpoint}",
+            "get",
+            response=aresponses.Response(
+                text="Service Unavailable", status=503, headers={"Retry-After": "60"}
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+
+            # The total time budget runs out:
+            with pytest.raises(RequestTimeoutError):
+                await simplisafe.async_request("get", endpoint, timeout=0.1)
+
+            # A single attempt runs out of time (and isn't retried):
+            with (
+                patch("simplipy.api.DEFAULT_TIMEOUT", 0.1),
+                pytest.raises(RequestTimeoutError),
+            ):
+                await simplisafe.async_request("post", endpoint)
+
+            # Let the abandoned (but shared) GET from above finish:
+            await asyncio.sleep(1)
+
+            # A retry that can't finish within the time budget isn't attempted:
+            with pytest.raises(RequestTimeoutError):
+                await simplisafe.async_request("get", endpoint, timeout=5)
+
+    aresponses.assert_plan_strictly_followed()
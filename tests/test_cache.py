@@ -0,0 +1,138 @@
+"""Define tests for the response cache."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from simplipy.util.cache import ResponseCache
+from simplipy.util.dt import utcnow
+from simplipy.util.endpoint import get_endpoint_family, get_system_id
+
+
+@pytest.mark.parametrize(
+    ("endpoint", "family", "system_id"),
+    [
+        ("api/authCheck", "other", None),
+        ("doorlock/12345/987/state", "doorlock", 12345),
+        ("oauth/token", "auth", None),
+        ("ss3/subscriptions/12345/sensors", "sensors", 12345),
+        ("ss3/subscriptions/12345/settings/normal", "settings", 12345),
+        ("ss3/subscriptions/12345/settings/pins", "pins", 12345),
+        ("ss3/subscriptions/12345/state/away", "state", 12345),
+        ("subscriptions/12345/events", "events", 12345),
+        ("users/12345/subscriptions", "subscriptions", None),
+    ],
+)
+def test_endpoint_classification(
+    endpoint: str, family: str, system_id: int | None
+) -> None:
+    """Test classifying endpoints by family and system ID.
+
+    Args:
+        endpoint: A relative API endpoint.
+        family: The expected endpoint family.
+        system_id: The expected system ID.
+    """
+    assert get_endpoint_family(endpoint) == family
+    assert get_system_id(endpoint) == system_id
+
+
+@pytest.mark.parametrize(
+    ("endpoint", "params", "servable"),
+    [
+        ("ss3/subscriptions/12345/sensors", None, True),
+        ("ss3/subscriptions/12345/sensors", {"forceUpdate": "false"}, True),
+        ("ss3/subscriptions/12345/sensors", {"forceUpdate": "true"}, False),
+        ("subscriptions/12345/settings", {"cached": "true"}, True),
+        ("subscriptions/12345/settings", {"cached": "false"}, False),
+        ("subscriptions/12345/events", None, False),
+    ],
+)
+def test_can_serve(
+    endpoint: str, params: dict[str, str] | None, servable: bool
+) -> None:
+    """Test which requests may be served from the cache.
+
+    Args:
+        endpoint: A relative API endpoint.
+        params: The request's query parameters.
+        servable: Whether the request should be servable.
+    """
+    assert ResponseCache().can_serve(endpoint, params) is servable
+
+
+def test_copies() -> None:
+    """Test that modifying a stored or returned response doesn't change the cache."""
+    cache = ResponseCache()
+    data = {"sensors": [{"serial": "825"}]}
+
+    cache.set("key", "ss3/subscriptions/12345/sensors", data)
+    data["sensors"].clear()
+
+    cached = cache.get("key")
+    assert cached == {"sensors": [{"serial": "825"}]}
+    cached["sensors"].clear()
+    assert cache.get("key") == {"sensors": [{"serial": "825"}]}
+
+
+def test_expiration() -> None:
+    """Test that entries expire after their TTL."""
+    cache = ResponseCache(ttls={"sensors": 5})
+
+    fetched_dt = utcnow()
+
+    with patch("simplipy.util.cache.monotonic", return_value=100.0):
+        cache.set("key", "ss3/subscriptions/12345/sensors", {"sensors": []}, fetched_dt)
+        assert cache.get("key") == {"sensors": []}
+        assert cache.get_fetched_dt("key") == fetched_dt
+
+    with patch("simplipy.util.cache.monotonic", return_value=105.0):
+        assert cache.get_fetched_dt("key") is None
+        assert cache.get("key") is None
+
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+    assert cache.stats.entries == 0
+
+
+def test_lru_eviction() -> None:
+    """Test that the least recently used entries are evicted first."""
+    cache = ResponseCache(max_entries=2)
+
+    cache.set("a", "ss3/subscriptions/1/sensors", {"sensors": []})
+    cache.set("b", "ss3/subscriptions/2/sensors", {"sensors": []})
+    assert cache.get("a") is not None
+    cache.set("c", "ss3/subscriptions/3/sensors", {"sensors": []})
+
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert cache.stats.evictions == 1
+
+
+def test_max_bytes() -> None:
+    """Test that entries are evicted by (approximate) size."""
+    cache = ResponseCache(max_bytes=40)
+
+    cache.set("a", "ss3/subscriptions/1/sensors", {"sensors": ["1234567890"]})
+    cache.set("b", "ss3/subscriptions/2/sensors", {"sensors": ["1234567890"]})
+    assert cache.stats.entries == 1
+    assert cache.stats.evictions == 1
+    assert cache.get("b") is not None
+
+    # A single entry larger than the limit is never cached:
+    cache.set("c", "ss3/subscriptions/3/sensors", {"sensors": ["1" * 100]})
+    assert cache.get("c") is None
+
+    # Re-setting an existing key replaces it:
+    cache.set("b", "ss3/subscriptions/2/sensors", {"sensors": []})
+    assert cache.stats.entries == 1
+
+
+def test_uncached_family() -> None:
+    """Test that endpoint families without a TTL are never cached."""
+    cache = ResponseCache()
+    cache.set("key", "subscriptions/12345/events", {"events": []})
+    assert cache.stats.entries == 0
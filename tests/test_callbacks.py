@@ -0,0 +1,277 @@
+"""Define tests for the callback executor."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from simplipy.util import execute_callback
+from simplipy.util.callbacks import CallbackExecutor
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit() -> None:
+    """Test that no more than the maximum number of callbacks run at once."""
+    executor = CallbackExecutor(max_concurrency=2)
+    release = asyncio.Event()
+    finished: list[int] = []
+
+    async def async_callback(value: int) -> None:
+        """Define a callback that waits to be released.
+
+        Args:
+            value: A value to record once finished.
+        """
+        await release.wait()
+        finished.append(value)
+
+    for value in range(5):
+        executor.execute(async_callback, value)
+
+    await asyncio.sleep(0)
+    assert executor.running == 2
+    assert executor.pending == 3
+
+    release.set()
+    await executor.async_drain()
+    assert sorted(finished) == [0, 1, 2, 3, 4]
+    assert executor.running == 0
+    assert executor.pending == 0
+    assert executor.stats[async_callback].calls == 5
+
+
+@pytest.mark.asyncio
+async def test_coroutine_check_cached() -> None:
+    """Test that a callback is checked for being a coroutine function only once."""
+    executor = CallbackExecutor()
+
+    async def async_callback() -> None:
+        """Define a callback that does nothing."""
+
+    with patch(
+        "simplipy.util.callbacks.asyncio.iscoroutinefunction",
+        Mock(wraps=asyncio.iscoroutinefunction),
+    ) as mock_check:
+        for _ in range(3):
+            executor.execute(async_callback)
+        await executor.async_drain()
+        assert mock_check.call_count == 1
+
+        # A forgotten callback is checked again:
+        executor.forget(async_callback)
+        executor.execute(async_callback)
+        await executor.async_drain()
+        assert mock_check.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_drain_timeout(caplog: Mock) -> None:
+    """Test that draining cancels callbacks that outlast the timeout.
+
+    Args:
+        caplog: A mocked logging utility.
+    """
+    executor = CallbackExecutor(max_concurrency=1)
+
+    async def async_callback() -> None:
+        """Define a callback that never finishes."""
+        await asyncio.Event().wait()
+
+    executor.execute(async_callback)
+    executor.execute(async_callback)
+    await asyncio.sleep(0)
+
+    await executor.async_drain(timeout=0.01)
+    assert executor.running == 0
+    assert executor.pending == 0
+    assert any(
+        "Canceling 1 running callback(s) and discarding 1 waiting one(s)" in e.message
+        for e in caplog.records
+    )
+
+
+@pytest.mark.asyncio
+async def test_errors(caplog: Mock) -> None:
+    """Test that exceptions raised by callbacks are logged and counted.
+
+    Args:
+        caplog: A mocked logging utility.
+    """
+    executor = CallbackExecutor()
+
+    async def async_callback() -> None:
+        """Define a callback that fails.
+
+        Raises:
+            ValueError: Always.
+        """
+        raise ValueError("async failure")
+
+    def callback() -> None:
+        """Define a callback that fails.
+
+        Raises:
+            ValueError: Always.
+        """
+        raise ValueError("sync failure")
+
+    executor.execute(async_callback)
+    executor.execute(callback)
+    await executor.async_drain()
+
+    assert executor.stats[async_callback].errors == 1
+    assert executor.stats[callback].errors == 1
+    assert (
+        len([e for e in caplog.records if e.message.startswith("Error in callback")])
+        == 2
+    )
+
+
+@pytest.mark.asyncio
+async def test_slow_callback(caplog: Mock) -> None:
+    """Test that slow callbacks are logged and counted.
+
+    Args:
+        caplog: A mocked logging utility.
+    """
+    caplog.set_level(logging.WARNING)
+    executor = CallbackExecutor(slow_callback_threshold=0.01)
+
+    async def async_callback() -> None:
+        """Define a slow callback."""
+        await asyncio.sleep(0.02)
+
+    executor.execute(async_callback)
+    await executor.async_drain()
+
+    stats = executor.stats[async_callback]
+    assert stats.slow == 1
+    assert stats.max_time >= 0.02
+    assert any(
+        "Callback test_slow_callback.<locals>.async_callback took" in e.message
+        for e in caplog.records
+    )
+
+
+@pytest.mark.asyncio
+async def test_sync_callbacks() -> None:
+    """Test running synchronous callbacks inline and in a thread pool."""
+    executor = CallbackExecutor()
+    mock_callback = Mock()
+
+    executor.execute(mock_callback, 1)
+    mock_callback.assert_called_once_with(1)
+    assert executor.running == 0
+
+    threads: list[threading.Thread] = []
+
+    def callback() -> None:
+        """Define a callback that records the thread it runs in."""
+        threads.append(threading.current_thread())
+
+    executor.run_sync_in_executor = True
+    executor.execute(callback)
+    assert executor.running == 1
+    await executor.async_drain()
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_stats_per_callback() -> None:
+    """Test that callbacks that share a name keep separate stats."""
+
+    class Listener:  # pylint: disable=too-few-public-methods
+        """Define a listener with a callback method."""
+
+        def __init__(self, *, fail: bool) -> None:
+            """Initialize.
+
+            Args:
+                fail: Whether the callback should fail.
+            """
+            self.fail = fail
+
+        def callback(self) -> None:
+            """Define a callback that can fail.
+
+            Raises:
+                ValueError: If the listener should fail.
+            """
+            if self.fail:
+                raise ValueError("failure")
+
+    executor = CallbackExecutor()
+    healthy = Listener(fail=False)
+    failing = Listener(fail=True)
+    executor.execute(healthy.callback)
+    executor.execute(failing.callback)
+    executor.execute(failing.callback)
+
+    assert executor.stats[healthy.callback].errors == 0
+    assert executor.stats[failing.callback].calls == 2
+    assert executor.stats[failing.callback].errors == 2
+
+
+def test_forget() -> None:
+    """Test that a forgotten callback's stats are dropped."""
+    executor = CallbackExecutor()
+    mock_callback = Mock()
+
+    executor.execute(mock_callback)
+    assert executor.stats[mock_callback].calls == 1
+
+    executor.forget(mock_callback)
+    assert mock_callback not in executor.stats
+
+
+@pytest.mark.asyncio
+async def test_max_pending(caplog: Mock) -> None:
+    """Test that the oldest waiting calls are dropped once too many are waiting.
+
+    Args:
+        caplog: A mocked logging utility.
+    """
+    caplog.set_level(logging.WARNING)
+    executor = CallbackExecutor(max_concurrency=1, max_pending=2)
+    release = asyncio.Event()
+    finished: list[int] = []
+
+    async def async_callback(value: int) -> None:
+        """Define a callback that waits to be released.
+
+        Args:
+            value: A value to record once finished.
+        """
+        await release.wait()
+        finished.append(value)
+
+    for value in range(5):
+        executor.execute(async_callback, value)
+
+    assert executor.running == 1
+    assert executor.pending == 2
+    assert executor.stats[async_callback].dropped == 2
+    assert len([e for e in caplog.records if "dropping the oldest" in e.message]) == 1
+
+    release.set()
+    await executor.async_drain()
+    assert finished == [0, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_execute_callback_deprecated() -> None:
+    """Test that the fire-and-forget helper still works, but is deprecated."""
+    mock_callback = Mock()
+    mock_async_callback = AsyncMock()
+
+    with pytest.deprecated_call():
+        execute_callback(mock_callback, 1)
+    mock_callback.assert_called_once_with(1)
+
+    with pytest.deprecated_call():
+        execute_callback(mock_async_callback, 2)
+    await asyncio.sleep(0)
+    mock_async_callback.assert_awaited_once_with(2)
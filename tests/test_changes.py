@@ -0,0 +1,77 @@
+"""Define tests for change detection."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from unittest.mock import Mock
+
+from simplipy.util.changes import Change, ChangeTracker
+
+
+@dataclass(frozen=True, slots=True)
+class WidgetRecord:
+    """Define a typed record of a widget's properties."""
+
+    color: str
+    size: int
+
+
+@dataclass(frozen=True, slots=True)
+class GadgetRecord:
+    """Define a typed record of a gadget's properties."""
+
+    color: str
+
+
+def test_check() -> None:
+    """Test detecting whether a raw payload changed."""
+    tracker = ChangeTracker(dumps=json.dumps)
+    assert tracker.check(1, "abc", {"color": "red"}) is True
+    assert tracker.check(1, "abc", {"color": "red"}) is False
+    assert tracker.check(1, "def", {"color": "red"}) is True
+    assert tracker.check(1, "abc", {"color": "blue"}) is True
+
+    tracker.forget(1, "abc")
+    assert tracker.check(1, "abc", {"color": "blue"}) is True
+
+
+def test_diff() -> None:
+    """Test detecting which properties changed."""
+    tracker = ChangeTracker(dumps=json.dumps)
+
+    # The first snapshot only establishes a baseline:
+    assert tracker.diff(1, "abc", WidgetRecord("red", 1)) == []
+    assert tracker.diff(1, "abc", WidgetRecord("red", 1)) == []
+    assert tracker.diff(1, "abc", WidgetRecord("blue", 2)) == [
+        Change(1, "abc", "color", "red", "blue"),
+        Change(1, "abc", "size", 1, 2),
+    ]
+
+    # Snapshots that can't be compared don't produce changes:
+    assert tracker.diff(1, "abc", None) == []
+    assert tracker.diff(1, "abc", WidgetRecord("red", 1)) == []
+    assert tracker.diff(1, "abc", GadgetRecord("blue")) == []
+
+    tracker.forget(1, "abc")
+    assert tracker.diff(1, "abc", GadgetRecord("red")) == []
+
+
+def test_publish() -> None:
+    """Test that only non-empty batches of changes are published."""
+    callback = Mock()
+    executor = Mock()
+    tracker = ChangeTracker()
+    remove = tracker.add_callback(callback)
+
+    tracker.publish([], executor)
+    executor.execute.assert_not_called()
+
+    changes = [Change(1, None, "temperature", 67, 68)]
+    tracker.publish(changes, executor)
+    executor.execute.assert_called_once_with(callback, changes)
+
+    remove()
+    executor.forget.assert_called_once_with(callback)
+    tracker.publish(changes, executor)
+    assert executor.execute.call_count == 1
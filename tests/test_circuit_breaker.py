@@ -0,0 +1,103 @@
+"""Define tests for the circuit breaker."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+from aiohttp import ClientConnectionError, ClientResponseError
+
+from simplipy.errors import CircuitOpenError, RequestError
+from simplipy.util.circuit_breaker import (
+    CircuitBreaker,
+    CircuitState,
+    is_circuit_failure,
+)
+
+
+def _response_error(status: int) -> ClientResponseError:
+    """Create an HTTP error with a particular status.
+
+    Args:
+        status: The HTTP status code.
+
+    Returns:
+        An HTTP error.
+    """
+    return ClientResponseError(Mock(), (), status=status)
+
+
+@pytest.mark.parametrize(
+    ("err", "failure"),
+    [
+        (_response_error(401), False),
+        (_response_error(409), False),
+        (_response_error(429), True),
+        (_response_error(503), True),
+        (ClientConnectionError(), True),
+        (asyncio.TimeoutError(), True),
+        (RequestError(), False),
+    ],
+)
+def test_circuit_failures(err: BaseException, failure: bool) -> None:
+    """Test which errors count against a circuit.
+
+    Args:
+        err: The error raised by a request.
+        failure: Whether the error should count as a failure.
+    """
+    assert is_circuit_failure(err) is failure
+
+
+def test_circuit_lifecycle() -> None:
+    """Test that a circuit opens, probes, and closes again."""
+    on_state_change = Mock()
+    breaker = CircuitBreaker(
+        failure_threshold=2, recovery_timeout=30, on_state_change=on_state_change
+    )
+
+    with patch("simplipy.util.circuit_breaker.monotonic", return_value=100.0):
+        for _ in range(2):
+            breaker.before_request("sensors")
+            breaker.record_outcome("sensors", _response_error(503))
+
+        assert breaker.states == {"sensors": CircuitState.OPEN}
+        on_state_change.assert_called_once_with("sensors", CircuitState.OPEN)
+
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request("sensors")
+
+        # Other endpoint families are unaffected:
+        breaker.before_request("settings")
+        breaker.record_outcome("settings")
+
+    with patch("simplipy.util.circuit_breaker.monotonic", return_value=130.0):
+        # Only a single probe is let through:
+        breaker.before_request("sensors")
+        assert breaker.states.get("sensors") == CircuitState.HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request("sensors")
+
+        # A failed probe opens the circuit again:
+        breaker.record_outcome("sensors", _response_error(500))
+        assert breaker.states.get("sensors") == CircuitState.OPEN
+
+    with patch("simplipy.util.circuit_breaker.monotonic", return_value=160.0):
+        # A cancelled probe doesn't count either way:
+        breaker.before_request("sensors")
+        breaker.record_outcome("sensors", asyncio.CancelledError())
+        assert breaker.states.get("sensors") == CircuitState.HALF_OPEN
+
+        # ...but a successful one closes the circuit:
+        breaker.before_request("sensors")
+        breaker.record_outcome("sensors", _response_error(401))
+        assert breaker.states.get("sensors") == CircuitState.CLOSED
+
+    assert [call.args[1] for call in on_state_change.call_args_list] == [
+        CircuitState.OPEN,
+        CircuitState.HALF_OPEN,
+        CircuitState.OPEN,
+        CircuitState.HALF_OPEN,
+        CircuitState.CLOSED,
+    ]
@@ -0,0 +1,112 @@
+"""Define tests for JSON codecs."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from types import ModuleType
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from simplipy.util.codec import STDLIB_CODEC, get_codec
+
+from .common import load_fixture
+
+
+def _fake_modules() -> dict[str, ModuleType]:
+    """Create fake (stdlib-backed) orjson and msgspec packages.
+
+    Returns:
+        A mapping of module name to module.
+    """
+
+    class Decoder:  # pylint: disable=too-few-public-methods
+        """Define a fake decoder."""
+
+        def decode(self, data: bytes | str) -> Any:
+            """Decode JSON.
+
+            Args:
+                data: The JSON to decode.
+
+            Returns:
+                The decoded object.
+            """
+            return json.loads(data)
+
+    class Encoder:  # pylint: disable=too-few-public-methods
+        """Define a fake encoder."""
+
+        def encode(self, obj: Any) -> bytes:
+            """Encode JSON.
+
+            Args:
+                obj: The object to encode.
+
+            Returns:
+                The encoded JSON.
+            """
+            return json.dumps(obj).encode()
+
+    msgspec = ModuleType("msgspec")
+    msgspec_json = ModuleType("msgspec.json")
+    msgspec_json.Decoder = Decoder  # type: ignore[attr-defined]
+    msgspec_json.Encoder = Encoder  # type: ignore[attr-defined]
+
+    orjson = ModuleType("orjson")
+    orjson.loads = Decoder().decode  # type: ignore[attr-defined]
+    orjson.dumps = Encoder().encode  # type: ignore[attr-defined]
+
+    return {"msgspec": msgspec, "msgspec.json": msgspec_json, "orjson": orjson}
+
+
+@pytest.mark.parametrize(
+    ("name", "modules"),
+    [
+        ("json", {}),
+        ("msgspec", _fake_modules()),
+        ("orjson", _fake_modules()),
+        pytest.param(
+            "orjson",
+            {},
+            marks=pytest.mark.skipif(
+                importlib.util.find_spec("orjson") is None,
+                reason="orjson isn't installed",
+            ),
+        ),
+    ],
+)
+def test_codec_round_trip(name: str, modules: dict[str, ModuleType]) -> None:
+    """Test that every codec decodes and encodes payloads identically.
+
+    Args:
+        name: The name of the codec to test.
+        modules: Fake modules to install while getting the codec.
+    """
+    with patch.dict(sys.modules, modules):
+        codec = get_codec(name)
+
+    raw = load_fixture("v3_sensors_response.json")
+    data = codec.loads(raw.encode())
+    assert data == json.loads(raw)
+    assert json.loads(codec.dumps(data)) == data
+
+    with pytest.raises(ValueError):
+        codec.loads(b"{Boom")
+
+
+def test_codec_selection() -> None:
+    """Test choosing the fastest installed codec."""
+    with patch.dict(sys.modules, {"orjson": None, "msgspec": None}):
+        assert get_codec() is STDLIB_CODEC
+        with pytest.raises(ValueError):
+            get_codec("orjson")
+
+    with patch.dict(sys.modules, {**_fake_modules(), "orjson": None}):
+        assert get_codec().name == "msgspec"
+
+    with pytest.raises(ValueError):
+        get_codec("yaml")
@@ -0,0 +1,43 @@
+"""Define tests for duplicate suppression."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from simplipy.util.dedup import DedupWindow
+
+
+def test_max_age() -> None:
+    """Test that keys are forgotten once they age out."""
+    window = DedupWindow(max_age=10)
+
+    with patch("simplipy.util.dedup.monotonic", return_value=100.0):
+        assert window.check("a") is True
+    with patch("simplipy.util.dedup.monotonic", return_value=105.0):
+        assert window.check("b") is True
+        assert window.check("a") is False
+    with patch("simplipy.util.dedup.monotonic", return_value=110.0):
+        assert window.check("b") is False
+        assert window.check("a") is True
+
+    assert window.stats.checked == 5
+    assert window.stats.suppressed == 2
+    assert window.stats.evictions == 1
+    assert window.stats.entries == 2
+
+
+def test_max_entries() -> None:
+    """Test that the oldest keys are forgotten once there are too many."""
+    window = DedupWindow(max_entries=2)
+
+    assert window.check("a") is True
+    assert window.check("b") is True
+    assert window.check("c") is True
+    assert window.check("b") is False
+    assert window.check("a") is True
+    assert window.stats.evictions == 2
+    assert window.stats.entries == 2
+
+    window.clear()
+    assert window.check("a") is True
+    assert window.stats.entries == 1
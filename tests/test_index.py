@@ -0,0 +1,167 @@
+"""Define tests for device indexes."""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import Any, cast
+
+import aiohttp
+import pytest
+from aresponses import ResponsesMockServer
+
+from simplipy import API
+from simplipy.device import DeviceTypes
+from simplipy.system.v3 import SystemV3
+from simplipy.util.index import DeviceFlags, get_device_flags
+
+from .common import (
+    TEST_AUTHORIZATION_CODE,
+    TEST_CODE_VERIFIER,
+    TEST_LOCK_ID,
+    TEST_LOCK_ID_2,
+    TEST_USER_ID,
+    TEST_SUBSCRIPTION_ID,
+    TEST_SYSTEM_ID,
+)
+
+
+@pytest.mark.asyncio
+async def test_device_index(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+    v3_sensors_response: dict[str, Any],
+    v3_settings_response: dict[str, Any],
+) -> None:
+    """Test querying devices by serial number, type, and status flag.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server_v3: A authenticated API connection.
+        v3_sensors_response: An API response payload.
+        v3_settings_response: An API response payload.
+    """
+    v3_sensors_response = deepcopy(v3_sensors_response)
+    for sensor in v3_sensors_response["sensors"]:
+        if sensor["serial"] == "129":
+            sensor["status"]["triggered"] = True
+        elif sensor["serial"] == TEST_LOCK_ID:
+            sensor["status"]["lockLowBattery"] = True
+    v3_sensors_response["sensors"] = [
+        sensor for sensor in v3_sensors_response["sensors"] if sensor["serial"] != "975"
+    ]
+
+    async with authenticated_simplisafe_server_v3:
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/settings/normal",
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_settings_response, status=200
+            ),
+        )
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/ss3/subscriptions/{TEST_SUBSCRIPTION_ID}/sensors",
+            "get",
+            response=aiohttp.web_response.json_response(
+                v3_sensors_response, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            index = simplisafe.device_index
+            assert index.get_device("825") is None
+
+            systems = await simplisafe.async_get_systems()
+            system = systems[TEST_SYSTEM_ID]
+
+            assert index.get_device("825") == (system, system.sensors["825"])
+            assert (
+                index.get_system_device(TEST_SYSTEM_ID, "825") is system.sensors["825"]
+            )
+            assert index.get_system_device(98765, "825") is None
+            assert {
+                device.serial
+                for device in index.get_devices(device_type=DeviceTypes.LEAK)
+            } == {"129", "382", "975"}
+            assert (
+                index.get_devices(
+                    device_type=DeviceTypes.LEAK, flag=DeviceFlags.TRIGGERED
+                )
+                == []
+            )
+            assert [
+                device.serial
+                for device in index.get_devices(flag=DeviceFlags.LOCK_JAMMED)
+            ] == [TEST_LOCK_ID_2]
+            assert [
+                device.serial for device in index.get_devices(flag=DeviceFlags.OFFLINE)
+            ] == ["00000000"]
+            # Without a filter, every device is returned:
+            system_v3 = cast(SystemV3, system)
+            devices = {**system_v3.sensors, **system_v3.locks, **system_v3.cameras}
+            assert len(index.get_devices()) == len(devices)
+
+            await system.async_update(include_subscription=False)
+
+            assert index.get_device("975") is None
+            assert {
+                device.serial
+                for device in index.get_devices(device_type=DeviceTypes.LEAK)
+            } == {"129", "382"}
+            assert index.get_devices(
+                device_type=DeviceTypes.LEAK, flag=DeviceFlags.TRIGGERED
+            ) == [system.sensors["129"]]
+            assert TEST_LOCK_ID in {
+                device.serial
+                for device in index.get_devices(flag=DeviceFlags.LOW_BATTERY)
+            }
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_device_index_removes_systems(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+    subscriptions_response: dict[str, Any],
+) -> None:
+    """Test that systems that disappear are removed from the index.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server_v3: A authenticated API connection.
+        subscriptions_response: An API response payload.
+    """
+    async with authenticated_simplisafe_server_v3:
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/users/{TEST_USER_ID}/subscriptions",
+            "get",
+            response=aiohttp.web_response.json_response(
+                {**subscriptions_response, "subscriptions": []}, status=200
+            ),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            index = simplisafe.device_index
+            systems = await simplisafe.async_get_systems()
+            system = cast(SystemV3, systems[TEST_SYSTEM_ID])
+            lock = system.locks[TEST_LOCK_ID]
+            assert index.get_device(TEST_LOCK_ID) is not None
+
+            # A device whose data can't be read doesn't set any flags:
+            del system.sensor_data[TEST_LOCK_ID]["status"]["lockLowBattery"]
+            assert get_device_flags(lock) == frozenset()
+
+            assert await simplisafe.async_get_systems() == {}
+            assert index.get_device(TEST_LOCK_ID) is None
+            assert index.get_devices() == []
+
+    aresponses.assert_plan_strictly_followed()
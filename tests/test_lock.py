@@ -16,6 +16,7 @@ from simplipy.device.lock import LockStates
 from simplipy.errors import InvalidCredentialsError
 from simplipy.system.v3 import SystemV3
 from simplipy.util.dt import utcnow
+from simplipy.util.index import DeviceFlags
 
 from .common import (
     TEST_AUTHORIZATION_CODE,
@@ -71,9 +72,12 @@ async def test_lock_unlock(
 
             state = lock.state
             assert state == LockStates.LOCKED
+            raw_data = system.sensor_data[TEST_LOCK_ID]
             await lock.async_unlock()
             state = lock.state
             assert state == LockStates.UNLOCKED
+            # The raw data is copied on write, rather than changed in place:
+            assert raw_data["status"]["lockState"] == 1
             await lock.async_lock()
             state = lock.state
             assert state == LockStates.LOCKED
@@ -104,6 +108,43 @@ async def test_jammed(
     aresponses.assert_plan_strictly_followed()
 
 
+@pytest.mark.asyncio
+async def test_lock_command_reindexes(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+) -> None:
+    """Test that locking/unlocking updates the device index right away.
+
+    Args:
+        aresponses: An aresponses server.
+        authenticated_simplisafe_server_v3: A authenticated API connection.
+    """
+    async with authenticated_simplisafe_server_v3:
+        authenticated_simplisafe_server_v3.add(
+            "api.simplisafe.com",
+            f"/v1/doorlock/{TEST_SUBSCRIPTION_ID}/{TEST_LOCK_ID_2}/state",
+            "post",
+            response=aresponses.Response(text=None, status=200),
+        )
+
+        async with aiohttp.ClientSession() as session:
+            simplisafe = await API.async_from_auth(
+                TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+            )
+            systems = await simplisafe.async_get_systems()
+            system: SystemV3 = cast(SystemV3, systems[TEST_SYSTEM_ID])
+            lock = system.locks[TEST_LOCK_ID_2]
+            assert simplisafe.device_index.get_devices(
+                flag=DeviceFlags.LOCK_JAMMED
+            ) == [lock]
+
+            await lock.async_unlock()
+            assert lock.state is LockStates.UNLOCKED
+            assert not simplisafe.device_index.get_devices(flag=DeviceFlags.LOCK_JAMMED)
+
+    aresponses.assert_plan_strictly_followed()
+
+
 @pytest.mark.asyncio
 async def test_no_state_change_on_failure(
     aresponses: ResponsesMockServer,
@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Any
+from unittest.mock import patch
 
 import aiohttp
 import pytest
 from aresponses import ResponsesMockServer
 
 from simplipy import API
-from simplipy.errors import SimplipyError
+from simplipy.errors import CircuitOpenError, RequestTimeoutError, SimplipyError
+from simplipy.util.circuit_breaker import CircuitBreaker
+from simplipy.util.retry import RetryPolicy
 
 from .common import TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER
 
@@ -132,3 +136,121 @@ async def test_media_file_enabe_disable_retires(
         assert res == content
 
     aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_media_circuit_breaker(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+) -> None:
+    """Test that media fetching fails fast once its circuit opens."""
+    authenticated_simplisafe_server_v3.add(
+        "remix.us-east-1.prd.cam.simplisafe.com",
+        "/v1/preview/normal",
+        "get",
+        aresponses.Response(body=b"image", status=200),
+    )
+    authenticated_simplisafe_server_v3.add(
+        "remix.us-east-1.prd.cam.simplisafe.com",
+        "/v1/preview/normal",
+        "get",
+        aresponses.Response(status=503),
+    )
+
+    async with authenticated_simplisafe_server_v3, aiohttp.ClientSession() as session:
+        simplisafe = await API.async_from_auth(
+            TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+        )
+        simplisafe.circuit_breaker = CircuitBreaker(failure_threshold=1)
+
+        url = "https://remix.us-east-1.prd.cam.simplisafe.com/v1/preview/normal"
+        assert await simplisafe.async_media(url=url) == b"image"
+
+        with pytest.raises(SimplipyError):
+            await simplisafe.async_media(url=url)
+
+        # The circuit is now open, so this never reaches the server:
+        with pytest.raises(CircuitOpenError):
+            await simplisafe.async_media(url=url)
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_media_timeout(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+) -> None:
+    """Test that a media fetch that exceeds its time budget raises."""
+
+    async def hung_response(_: Any) -> aresponses.Response:
+        """Respond after a long delay."""
+        await asyncio.sleep(1)
+        return aresponses.Response(body=b"image", status=200)
+
+    authenticated_simplisafe_server_v3.add(
+        "remix.us-east-1.prd.cam.simplisafe.com",
+        "/v1/preview/normal",
+        "get",
+        response=hung_response,
+    )
+
+    async with authenticated_simplisafe_server_v3, aiohttp.ClientSession() as session:
+        simplisafe = await API.async_from_auth(
+            TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+        )
+
+        with pytest.raises(RequestTimeoutError):
+            await simplisafe.async_media(
+                url="https://remix.us-east-1.prd.cam.simplisafe.com/v1/preview/normal",
+                timeout=0.1,
+            )
+
+    aresponses.assert_plan_strictly_followed()
+
+
+@pytest.mark.asyncio
+async def test_media_attempt_timeout(
+    aresponses: ResponsesMockServer,
+    authenticated_simplisafe_server_v3: ResponsesMockServer,
+) -> None:
+    """Test that a slow media download isn't limited by the API request timeout."""
+
+    async def slow_response(_: Any) -> aresponses.Response:
+        """Respond after a short delay."""
+        await asyncio.sleep(0.3)
+        return aresponses.Response(body=b"image", status=200)
+
+    for _ in range(2):
+        authenticated_simplisafe_server_v3.add(
+            "remix.us-east-1.prd.cam.simplisafe.com",
+            "/v1/preview/normal",
+            "get",
+            response=slow_response,
+        )
+
+    async with authenticated_simplisafe_server_v3, aiohttp.ClientSession() as session:
+        simplisafe = await API.async_from_auth(
+            TEST_AUTHORIZATION_CODE, TEST_CODE_VERIFIER, session=session
+        )
+
+        with patch("simplipy.api.DEFAULT_TIMEOUT", 0.1):
+            assert (
+                await simplisafe.async_media(
+                    url="https://remix.us-east-1.prd.cam.simplisafe.com/v1/preview/normal"
+                )
+                == b"image"
+            )
+
+        # A caller-provided attempt timeout is used instead:
+        with pytest.raises(RequestTimeoutError):
+            await simplisafe.async_media(
+                url="https://remix.us-east-1.prd.cam.simplisafe.com/v1/preview/normal",
+                retry_policy=RetryPolicy(max_tries=1),
+                attempt_timeout=aiohttp.ClientTimeout(total=0.1),
+            )
+
+        # Let the abandoned response finish:
+        await asyncio.sleep(0.3)
+
+    aresponses.assert_plan_strictly_followed()
@@ -0,0 +1,155 @@
+"""Define tests for the adaptive polling scheduler."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from aiohttp import ClientConnectionError
+
+from simplipy.errors import RequestError
+from simplipy.system import SystemStates
+from simplipy.util.polling import Poller, PollingPolicy
+
+POLICY = PollingPolicy(
+    active_interval=5,
+    idle_interval=60,
+    quiet_interval=900,
+    quiet_after=300,
+    max_error_interval=1800,
+)
+
+
+def _mock_system(system_id: int = 12345) -> Mock:
+    """Create a mock system.
+
+    Args:
+        system_id: The system ID.
+
+    Returns:
+        A mock system.
+    """
+    return Mock(system_id=system_id, state=SystemStates.OFF, async_update=AsyncMock())
+
+
+@pytest.mark.parametrize(
+    ("state", "errors", "websocket_connected", "idle_for", "interval"),
+    [
+        (SystemStates.OFF, 0, False, None, 60),
+        (SystemStates.ENTRY_DELAY, 0, False, None, 5),
+        (SystemStates.ALARM, 0, True, None, 5),
+        (SystemStates.AWAY, 0, True, None, 900),
+        (SystemStates.AWAY, 0, True, 30, 60),
+        (SystemStates.AWAY, 0, True, 300, 900),
+        (SystemStates.ALARM, 1, True, None, 60),
+        (SystemStates.OFF, 3, False, None, 240),
+        (SystemStates.OFF, 10, False, None, 1800),
+    ],
+)
+def test_polling_intervals(
+    state: SystemStates,
+    errors: int,
+    websocket_connected: bool,
+    idle_for: float | None,
+    interval: float,
+) -> None:
+    """Test that polling intervals adapt to a system's circumstances.
+
+    Args:
+        state: The current state of the system.
+        errors: The number of consecutive failed refreshes.
+        websocket_connected: Whether the websocket is connected.
+        idle_for: The number of seconds since the last websocket event.
+        interval: The expected interval.
+    """
+    assert (
+        POLICY.get_interval(
+            state=state,
+            errors=errors,
+            websocket_connected=websocket_connected,
+            idle_for=idle_for,
+        )
+        == interval
+    )
+
+
+@pytest.mark.asyncio
+async def test_poller_refreshes_systems() -> None:
+    """Test that tracked systems are refreshed until they stop being tracked."""
+    poller = Poller(
+        policy=PollingPolicy(idle_interval=0.01, jitter=0),
+        is_websocket_connected=lambda: False,
+    )
+    system = _mock_system()
+
+    poller.track({system.system_id: system})
+    await asyncio.sleep(0.1)
+    assert system.async_update.await_count > 2
+    system.async_update.assert_awaited_with(defer=True)
+
+    poller.stop()
+    await asyncio.sleep(0)
+    calls = system.async_update.await_count
+    await asyncio.sleep(0.05)
+    assert system.async_update.await_count == calls
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "error", [RequestError("Gateway Timeout"), ClientConnectionError("Reset")]
+)
+async def test_poller_backs_off_on_errors(error: Exception) -> None:
+    """Test that the poller waits longer after consecutive errors.
+
+    Args:
+        error: The error that every refresh raises.
+    """
+    poller = Poller(
+        policy=PollingPolicy(idle_interval=0.03, jitter=0),
+        is_websocket_connected=lambda: False,
+    )
+    system = _mock_system()
+    system.async_update.side_effect = error
+
+    poller.track({system.system_id: system})
+    # Refreshes happen after 0.03, 0.06, 0.12, and 0.24 seconds:
+    await asyncio.sleep(0.18)
+    poller.stop()
+    assert system.async_update.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_poller_wakes_on_events() -> None:
+    """Test that a websocket event triggers a refresh of its system."""
+    poller = Poller(
+        policy=PollingPolicy(active_interval=0.01, jitter=0),
+        is_websocket_connected=lambda: True,
+    )
+    system = _mock_system()
+    other_system = _mock_system(system_id=67890)
+
+    poller.track({system.system_id: system, other_system.system_id: other_system})
+    await asyncio.sleep(0)
+    poller.record_event(system.system_id)
+    await asyncio.sleep(0.05)
+    poller.stop()
+
+    system.async_update.assert_awaited_once()
+    other_system.async_update.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_poller_async_stop() -> None:
+    """Test that stopping the poller waits for its refresh tasks to finish."""
+    poller = Poller(policy=POLICY, is_websocket_connected=lambda: False)
+    system = _mock_system()
+    other_system = _mock_system(system_id=67890)
+
+    poller.track({system.system_id: system, other_system.system_id: other_system})
+    tasks = [task for _, task in poller._tasks.values()]
+    poller.track({system.system_id: system})
+    await poller.async_stop()
+
+    assert all(task.done() for task in tasks)
+    assert not poller._canceled_tasks
@@ -0,0 +1,71 @@
+"""Define tests for the client-side rate limiter."""
+
+# pylint: disable=protected-access
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from simplipy.util.rate_limit import RateLimit, RateLimiter, TokenBucket
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_burst_and_queueing() -> None:
+    """Test that a bucket allows a burst and then queues requests in order."""
+    bucket = TokenBucket(RateLimit(20.0, 2))
+    order: list[int] = []
+
+    async def acquire(index: int) -> None:
+        """Acquire a token and record the order in which that happened.
+
+        Args:
+            index: The index of the request.
+        """
+        await bucket.async_acquire()
+        order.append(index)
+
+    await asyncio.gather(*(acquire(index) for index in range(5)))
+
+    assert order == [0, 1, 2, 3, 4]
+    assert bucket.stats.requests == 5
+    assert bucket.stats.delayed == 3
+    assert bucket.stats.max_queue_depth == 3
+    assert bucket.stats.queue_depth == 0
+    assert bucket.stats.max_wait == pytest.approx(0.15, abs=0.02)
+    assert bucket.stats.total_wait == pytest.approx(0.3, abs=0.03)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_cancellation() -> None:
+    """Test that a cancelled request gives its token back."""
+    bucket = TokenBucket(RateLimit(1.0, 1))
+    await bucket.async_acquire()
+
+    task = asyncio.create_task(bucket.async_acquire())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert bucket.stats.queue_depth == 0
+    assert bucket._reserve() == pytest.approx(1.0, abs=0.05)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_budgets() -> None:
+    """Test that requests count against their family's budget and the global one."""
+    limiter = RateLimiter(
+        global_limit=RateLimit(100.0, 100), family_limits={"sensors": RateLimit(1, 1)}
+    )
+
+    await limiter.async_acquire("ss3/subscriptions/12345/sensors")
+    await limiter.async_acquire("users/12345/subscriptions")
+
+    stats = limiter.stats
+    assert stats["global"].requests == 2
+    assert stats["sensors"].requests == 1
+    assert "subscriptions" not in stats
+
+    assert "subscriptions" in RateLimiter().stats
@@ -0,0 +1,144 @@
+"""Define tests for typed records."""
+
+# pylint: disable=protected-access
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+import pytest
+
+from simplipy.util.changes import Change, ChangeTracker
+from simplipy.util.records import Decodable, from_record
+
+
+@dataclass(frozen=True, slots=True)
+class WidgetRecord:
+    """Define a typed record of a widget's properties."""
+
+    color: str
+    size: int | None
+
+
+class Widget(Decodable):
+    """Define a widget backed by a raw payload."""
+
+    _record_type: ClassVar[type | None] = WidgetRecord
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        """Initialize.
+
+        Args:
+            data: A raw payload.
+        """
+        self.data = data
+        self.reads = 0
+
+    def _get_payload(self) -> Any:
+        """Get the raw payload that this widget's properties read.
+
+        Returns:
+            The raw payload.
+        """
+        return self.data
+
+    @property
+    @from_record
+    def color(self) -> str:
+        """Return the widget color.
+
+        Returns:
+            The color.
+        """
+        self.reads += 1
+        return str(self.data["appearance"]["color"])
+
+    @property
+    @from_record
+    def size(self) -> int | None:
+        """Return the widget size (if known).
+
+        Returns:
+            The size.
+        """
+        self.reads += 1
+        return self.data.get("size")
+
+
+def test_decoding() -> None:
+    """Test that properties read a decoded record instead of the raw payload."""
+    widget = Widget({"appearance": {"color": "red"}, "size": 3})
+    widget._update_record(True)
+    assert widget._record == WidgetRecord(color="red", size=3)
+    assert widget.reads == 2
+
+    widget.data["appearance"]["color"] = "blue"
+    assert widget.color == "red"
+    assert widget.size == 3
+    assert widget.reads == 2
+
+    # Decoding again picks up the changes:
+    widget._update_record(True)
+    assert widget.color == "blue"
+
+
+def test_decoding_disabled() -> None:
+    """Test that properties read the raw payload when decoding is disabled."""
+    widget = Widget({"appearance": {"color": "red"}})
+    widget._update_record(True)
+    widget._update_record(False)
+    assert widget._record is None
+
+    widget.data["appearance"]["color"] = "blue"
+    assert widget.color == "blue"
+    assert widget.size is None
+
+
+def test_decoding_incomplete_payload() -> None:
+    """Test that an incomplete payload isn't decoded."""
+    widget = Widget({"size": 3})
+    widget._update_record(True)
+    assert widget._record is None
+    assert widget.size == 3
+
+
+def test_no_record_type() -> None:
+    """Test that an object without a record type is never decoded."""
+    decodable = Decodable()
+    decodable._update_record(True)
+    assert decodable._record is None
+
+
+def test_missing_property() -> None:
+    """Test that a record field without a matching property fails loudly."""
+
+    @dataclass(frozen=True, slots=True)
+    class GadgetRecord:
+        """Define a record with a field that a widget doesn't have."""
+
+        color: str
+        weight: float
+
+    class Gadget(Widget):
+        """Define a widget whose record type doesn't match its properties."""
+
+        _record_type = GadgetRecord
+
+    gadget = Gadget({"appearance": {"color": "red"}})
+    with pytest.raises(AttributeError, match="record field 'weight'"):
+        gadget._update_record(True)
+
+
+def test_snapshot() -> None:
+    """Test that change tracking diffs the decoded record."""
+    tracker = ChangeTracker()
+    widget = Widget({"appearance": {"color": "red"}, "size": 3})
+    assert widget._refresh_record(True, tracker, 1, "widget") == []
+    assert widget.reads == 2
+
+    widget.data["appearance"]["color"] = "blue"
+    assert widget._refresh_record(True, tracker, 1, "widget") == [
+        Change(1, "widget", "color", "red", "blue")
+    ]
+    # The snapshot is the record that was just decoded (not a second decoding):
+    assert widget.reads == 4
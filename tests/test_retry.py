@@ -0,0 +1,91 @@
+"""Define tests for retry policies."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from email.utils import format_datetime
+from unittest.mock import Mock, patch
+
+import pytest
+from aiohttp import ClientResponseError
+from multidict import CIMultiDict
+
+from simplipy import API
+from simplipy.util.dt import utcnow
+from simplipy.util.retry import RetryPolicy, get_retry_after
+
+
+def _response_error(status: int, retry_after: str | None = None) -> ClientResponseError:
+    """Create an HTTP error.
+
+    Args:
+        status: The HTTP status code.
+        retry_after: An optional Retry-After header value.
+
+    Returns:
+        An HTTP error.
+    """
+    headers = None if retry_after is None else CIMultiDict({"Retry-After": retry_after})
+    return ClientResponseError(Mock(), (), status=status, headers=headers)
+
+
+@pytest.mark.parametrize(
+    ("err", "retry_after"),
+    [
+        (_response_error(429, "7"), 7.0),
+        (_response_error(503, "-3"), 0.0),
+        (_response_error(409, "soon"), None),
+        (_response_error(503), None),
+        (_response_error(500, "7"), None),
+        (ClientResponseError(Mock(), (), status=429, headers=CIMultiDict()), None),
+    ],
+)
+def test_get_retry_after(err: ClientResponseError, retry_after: float | None) -> None:
+    """Test parsing Retry-After headers.
+
+    Args:
+        err: An HTTP error.
+        retry_after: The expected delay.
+    """
+    assert get_retry_after(err) == retry_after
+
+
+def test_get_retry_after_http_date() -> None:
+    """Test parsing a Retry-After header that contains an HTTP date."""
+    retry_at = format_datetime(utcnow() + timedelta(seconds=30), usegmt=True)
+    assert get_retry_after(_response_error(429, retry_at)) == pytest.approx(30, abs=2)
+
+
+def test_retry_policy() -> None:
+    """Test the retry policy's delays and retriable statuses."""
+    policy = RetryPolicy(base_delay=2, max_delay=5)
+
+    with patch("simplipy.util.retry.random.random", return_value=0.5):
+        assert policy.get_delay(1, _response_error(500)) == 2.5
+        assert policy.get_delay(2, _response_error(500)) == 4.5
+        assert policy.get_delay(5, _response_error(500)) == 5.5
+        assert policy.get_delay(5, _response_error(429, "1")) == 1
+        assert policy.get_delay(5, _response_error(429, "3600")) == 300
+        assert (
+            RetryPolicy(max_retry_after=10).get_delay(1, _response_error(429, "60"))
+            == 10
+        )
+
+    assert policy.is_retriable(_response_error(401))
+    assert policy.is_retriable(_response_error(429))
+    assert policy.is_retriable(_response_error(503))
+    assert not policy.is_retriable(_response_error(400))
+    assert not policy.is_retriable(_response_error(404))
+
+
+@pytest.mark.parametrize(
+    ("status", "fatal"), [(401, False), (404, False), (400, True), (500, False)]
+)
+def test_is_fatal_error(status: int, fatal: bool) -> None:
+    """Test the legacy fatal error check.
+
+    Args:
+        status: The HTTP status code.
+        fatal: Whether an error with that status should be fatal.
+    """
+    assert API.is_fatal_error([401, 404])(_response_error(status)) is fatal
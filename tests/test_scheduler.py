@@ -0,0 +1,126 @@
+"""Define tests for the priority-aware request scheduler."""
+
+# pylint: disable=protected-access
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from simplipy.util.scheduler import (
+    RequestPriority,
+    RequestScheduler,
+    get_request_priority,
+    request_priority,
+)
+
+
+async def _async_run_queued(
+    scheduler: RequestScheduler, priorities: list[RequestPriority]
+) -> list[RequestPriority]:
+    """Queue requests behind a busy scheduler and return the order they are served.
+
+    Args:
+        scheduler: The scheduler to use.
+        priorities: The priority of each queued request (in the order it was queued).
+
+    Returns:
+        The priorities in the order that they were served.
+    """
+    served: list[RequestPriority] = []
+
+    async def request(priority: RequestPriority) -> None:
+        """Make a request.
+
+        Args:
+            priority: The priority class of the request.
+        """
+        await scheduler.async_acquire(priority)
+        served.append(priority)
+        scheduler.release()
+
+    # Occupy the only slot so that everything else has to queue:
+    await scheduler.async_acquire(RequestPriority.CRITICAL)
+    tasks = [asyncio.create_task(request(priority)) for priority in priorities]
+    await asyncio.sleep(0)
+    scheduler.release()
+    await asyncio.gather(*tasks)
+    return served
+
+
+@pytest.mark.asyncio
+async def test_priority_order() -> None:
+    """Test that queued requests are served by priority."""
+    scheduler = RequestScheduler(max_concurrency=1)
+    served = await _async_run_queued(
+        scheduler,
+        [
+            RequestPriority.BACKGROUND,
+            RequestPriority.INTERACTIVE,
+            RequestPriority.CRITICAL,
+        ],
+    )
+
+    assert served == [
+        RequestPriority.CRITICAL,
+        RequestPriority.INTERACTIVE,
+        RequestPriority.BACKGROUND,
+    ]
+    assert scheduler.stats[RequestPriority.CRITICAL].requests == 2
+    assert scheduler.stats[RequestPriority.BACKGROUND].requests == 1
+    assert scheduler.stats[RequestPriority.BACKGROUND].queue_depth == 0
+    assert scheduler.stats[RequestPriority.BACKGROUND].max_wait > 0
+
+
+@pytest.mark.asyncio
+async def test_bounded_starvation() -> None:
+    """Test that a lower priority class is only passed over a bounded number of times."""
+    scheduler = RequestScheduler(max_concurrency=1, max_starvation=2)
+    served = await _async_run_queued(
+        scheduler, [RequestPriority.BACKGROUND] + [RequestPriority.CRITICAL] * 4
+    )
+
+    assert served.index(RequestPriority.BACKGROUND) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancellation() -> None:
+    """Test that cancelled requests don't leak slots."""
+    scheduler = RequestScheduler(max_concurrency=1)
+    await scheduler.async_acquire(RequestPriority.CRITICAL)
+
+    # Cancel a request while it is still queued:
+    task = asyncio.create_task(scheduler.async_acquire(RequestPriority.BACKGROUND))
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert not scheduler._waiters[RequestPriority.BACKGROUND]
+
+    # Cancel a request right after it was granted a slot:
+    task = asyncio.create_task(scheduler.async_acquire(RequestPriority.BACKGROUND))
+    await asyncio.sleep(0)
+    scheduler.release()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert scheduler._active == 0
+
+
+@pytest.mark.asyncio
+async def test_request_priority_context() -> None:
+    """Test how the priority of a request is determined."""
+    assert get_request_priority("get") == RequestPriority.INTERACTIVE
+    assert get_request_priority("post") == RequestPriority.CRITICAL
+
+    with request_priority(RequestPriority.BACKGROUND):
+        assert get_request_priority("get") == RequestPriority.BACKGROUND
+        assert get_request_priority("delete") == RequestPriority.CRITICAL
+
+        # Work spawned within the block inherits its priority:
+        assert (
+            await asyncio.to_thread(get_request_priority, "get")
+            == RequestPriority.BACKGROUND
+        )
+
+    assert get_request_priority("get") == RequestPriority.INTERACTIVE
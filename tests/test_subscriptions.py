@@ -0,0 +1,108 @@
+"""Define tests for event filters and subscription indexes."""
+
+from __future__ import annotations
+
+from copy import deepcopy
+from typing import Any
+
+from simplipy.device import DeviceTypes
+from simplipy.util.subscriptions import EventFilter, SubscriptionIndex
+from simplipy.websocket import (
+    EVENT_ARMED_AWAY_BY_KEYPAD,
+    EVENT_DISARMED_BY_KEYPAD,
+    WebsocketEvent,
+    websocket_event_from_payload,
+)
+
+
+def get_event(
+    ws_message_event: dict[str, Any],
+    *,
+    event_cid: int = 1400,
+    sensor_serial: str = "abcdef12",
+    system_id: int = 12345,
+) -> WebsocketEvent:
+    """Get a websocket event.
+
+    Args:
+        ws_message_event: A websocket event payload.
+        event_cid: The SimpliSafe code for the event.
+        sensor_serial: The serial number of the sensor the event is about.
+        system_id: The ID of the system the event belongs to.
+
+    Returns:
+        A websocket event.
+    """
+    payload = deepcopy(ws_message_event)
+    payload["data"]["eventCid"] = event_cid
+    payload["data"]["sensorSerial"] = sensor_serial
+    payload["data"]["sid"] = system_id
+    return websocket_event_from_payload(payload)
+
+
+def test_event_filter(ws_message_event: dict[str, Any]) -> None:
+    """Test matching events against filters.
+
+    Args:
+        ws_message_event: A websocket event payload.
+    """
+    event = get_event(ws_message_event)
+
+    assert EventFilter().matches(event)
+    assert EventFilter(event_types=EVENT_DISARMED_BY_KEYPAD).matches(event)
+    assert EventFilter(
+        event_types=[EVENT_ARMED_AWAY_BY_KEYPAD, EVENT_DISARMED_BY_KEYPAD],
+        sensor_types=DeviceTypes.KEYPAD,
+        system_ids=12345,
+    ).matches(event)
+    assert not EventFilter(event_types=EVENT_ARMED_AWAY_BY_KEYPAD).matches(event)
+    assert not EventFilter(
+        event_types=EVENT_DISARMED_BY_KEYPAD, system_ids={23456}
+    ).matches(event)
+    assert not EventFilter(sensor_serials=["987"]).matches(event)
+
+
+def test_subscription_index(ws_message_event: dict[str, Any]) -> None:
+    """Test finding the subscribers whose filters match an event.
+
+    Args:
+        ws_message_event: A websocket event payload.
+    """
+    index: SubscriptionIndex[str] = SubscriptionIndex()
+    index.add("everything")
+    remove_system = index.add("system", EventFilter(system_ids=[12345, 23456]))
+    index.add("other system", EventFilter(system_ids=34567))
+    index.add(
+        "disarms in system",
+        EventFilter(event_types=EVENT_DISARMED_BY_KEYPAD, system_ids=12345),
+    )
+    index.add("arms", EventFilter(event_types=EVENT_ARMED_AWAY_BY_KEYPAD))
+    index.add("sensor", EventFilter(sensor_serials="987"))
+    index.add("keypads", EventFilter(sensor_types=DeviceTypes.KEYPAD))
+    assert len(index) == 7
+
+    assert index.get_subscribers(get_event(ws_message_event)) == [
+        "everything",
+        "system",
+        "disarms in system",
+        "keypads",
+    ]
+    assert index.get_subscribers(
+        get_event(
+            ws_message_event, event_cid=3401, sensor_serial="987", system_id=34567
+        )
+    ) == ["everything", "other system", "arms", "sensor", "keypads"]
+
+    remove_system()
+    remove_system()
+    index.remove("keypads")
+    assert list(index) == [
+        "everything",
+        "other system",
+        "disarms in system",
+        "arms",
+        "sensor",
+    ]
+    assert index.get_subscribers(get_event(ws_message_event, system_id=23456)) == [
+        "everything"
+    ]
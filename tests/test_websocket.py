@@ -3,15 +3,18 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from collections import deque
+from copy import deepcopy
 from datetime import datetime, timedelta, timezone
 from time import time
 from typing import Any
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 from aiohttp.client_exceptions import (
+    ClientConnectionError,
     ClientError,
     ServerDisconnectedError,
     WSServerHandshakeError,
@@ -24,17 +27,23 @@ from simplipy.device import DeviceTypes
 from simplipy.errors import (
     CannotConnectError,
     ConnectionFailedError,
+    EventStreamOverflowError,
     InvalidMessageError,
     WebsocketError,
 )
+from simplipy.util.subscriptions import EventFilter
 from simplipy.websocket import (
     EVENT_DISARMED_BY_KEYPAD,
+    EventStreamOverflow,
+    ReconnectPolicy,
     Watchdog,
     WebsocketClient,
+    WebsocketEvent,
+    WebsocketState,
     websocket_event_from_payload,
 )
 
-from .common import create_ws_message
+from .common import create_ws_message, load_fixture
 
 
 @pytest.mark.asyncio
@@ -178,6 +187,333 @@ def test_create_motion_event_flv(ws_motion_event_flv: dict[str, Any]) -> None:
     assert event.media_urls["flv_url"] == "https://flv-url"
 
 
+@pytest.mark.asyncio
+async def test_backfill(
+    caplog: Mock, mock_api: Mock, ws_message_event: dict[str, Any]
+) -> None:
+    """Test delivering the events that were missed while disconnected.
+
+    Args:
+        caplog: A mocked logging utility.
+        mock_api: A mocked API client.
+        ws_message_event: A websocket event payload.
+    """
+    # Other tests modify the session-scoped fixture, so load a fresh copy:
+    events_response = json.loads(load_fixture("events_response.json"))
+    system = Mock(system_id=12345)
+    system.async_get_events = AsyncMock(return_value=events_response["events"])
+    quiet_system = Mock(system_id=23456)
+    quiet_system.async_get_events = AsyncMock(return_value=events_response["events"])
+    broken_system = Mock(system_id=34567)
+    broken_system.async_get_events = AsyncMock(
+        side_effect=ClientConnectionError("Down")
+    )
+    mock_api.systems = {
+        12345: system,
+        23456: quiet_system,
+        34567: broken_system,
+    }
+
+    client = WebsocketClient(mock_api)
+    client._client = Mock(closed=True)
+    events: list[WebsocketEvent] = []
+    client.add_event_callback(events.append)
+
+    payload = deepcopy(ws_message_event)
+    payload["data"]["eventTimestamp"] = 1534700000
+    await client._async_parse_payload(payload)
+
+    with patch.object(client, "_async_identify", AsyncMock()):
+        await client.async_listen()
+        assert system.async_get_events.await_count == 0
+
+        # The backfill runs alongside the listener (rather than ahead of it):
+        await client.async_listen()
+        assert client._backfill_task
+        await client._backfill_task
+
+    system.async_get_events.assert_awaited_once_with(
+        from_datetime=datetime(2018, 8, 19, 17, 33, 20, tzinfo=timezone.utc)
+    )
+    assert quiet_system.async_get_events.await_count == 1
+    assert [(event.info, event.backfilled) for event in events] == [
+        ("System Disarmed by Master PIN", False),
+        ("System Disarmed by Master PIN", True),
+        ("System Armed (Away) by Keypad Garage Keypad", True),
+    ]
+    assert any(
+        "Unable to backfill events for system 34567: Down" in e.message
+        for e in caplog.records
+    )
+
+
+@pytest.mark.asyncio
+async def test_backfill_canceled(mock_api: Mock) -> None:
+    """Test that disconnecting cancels a backfill that is in progress.
+
+    Args:
+        mock_api: A mocked API client.
+    """
+    started = asyncio.Event()
+
+    async def async_get_events(**_: Any) -> list[dict[str, Any]]:
+        """Start fetching events that never arrive.
+
+        Returns:
+            An empty list (once the wait, which never ends, is over).
+        """
+        started.set()
+        await asyncio.Event().wait()
+        return []
+
+    system = Mock(system_id=12345, async_get_events=async_get_events)
+    mock_api.systems = {12345: system}
+
+    client = WebsocketClient(mock_api)
+    client._client = Mock(closed=True)
+
+    with patch.object(client, "_async_identify", AsyncMock()):
+        await client.async_listen()
+        await client.async_listen()
+
+    task = client._backfill_task
+    assert task is not None
+    await started.wait()
+
+    await client.async_disconnect()
+    assert client._backfill_task is None
+    await asyncio.gather(task, return_exceptions=True)
+    assert task.cancelled()
+
+
+def get_event_payload(ws_message_event: dict[str, Any], event_id: int) -> Any:
+    """Get a copy of a websocket event payload with a particular event ID.
+
+    Args:
+        ws_message_event: A websocket event payload.
+        event_id: The event ID to use.
+
+    Returns:
+        A websocket event payload.
+    """
+    payload = deepcopy(ws_message_event)
+    payload["data"]["eventId"] = event_id
+    payload["data"]["eventTimestamp"] += event_id
+    payload["data"]["info"] = f"Event {event_id}"
+    return payload
+
+
+@pytest.mark.asyncio
+async def test_duplicate_events(
+    mock_api: Mock, ws_message_event: dict[str, Any]
+) -> None:
+    """Test that events delivered more than once are suppressed.
+
+    Args:
+        mock_api: A mocked API client.
+        ws_message_event: A websocket event payload.
+    """
+    client = WebsocketClient(mock_api)
+    events: list[WebsocketEvent] = []
+    client.add_event_callback(events.append)
+
+    await client._async_parse_payload(get_event_payload(ws_message_event, 1))
+    await client._async_parse_payload(get_event_payload(ws_message_event, 1))
+    await client._async_parse_payload(get_event_payload(ws_message_event, 2))
+
+    # The same event, fetched after a reconnect:
+    await client._async_deliver_event(
+        websocket_event_from_payload(
+            get_event_payload(ws_message_event, 2), backfilled=True
+        )
+    )
+
+    assert [event.info for event in events] == ["Event 1", "Event 2"]
+    assert client.dedup_window.stats.suppressed == 2
+
+
+@pytest.mark.asyncio
+async def test_event_handler_error(
+    caplog: Mock, mock_api: Mock, ws_message_event: dict[str, Any]
+) -> None:
+    """Test that an error in one of the library's own handlers is contained.
+
+    Args:
+        caplog: A mocked logging utility.
+        mock_api: A mocked API client.
+        ws_message_event: A websocket event payload.
+    """
+    client = WebsocketClient(mock_api)
+    client._add_event_handler(Mock(side_effect=ValueError("Broken")))
+    handler = Mock()
+    client._add_event_handler(handler)
+    events: list[WebsocketEvent] = []
+    client.add_event_callback(events.append)
+
+    await client._async_parse_payload(get_event_payload(ws_message_event, 1))
+
+    handler.assert_called_once()
+    assert [event.info for event in events] == ["Event 1"]
+    assert any("Error while handling event" in e.message for e in caplog.records)
+
+
+@pytest.mark.asyncio
+async def test_event_stream_block(
+    mock_api: Mock, ws_message_event: dict[str, Any]
+) -> None:
+    """Test an event stream that blocks the listener until its consumer catches up.
+
+    Args:
+        mock_api: A mocked API client.
+        ws_message_event: A websocket event payload.
+    """
+    client = WebsocketClient(mock_api)
+    stream = client.events(maxsize=1, overflow="block")
+    assert stream.overflow == EventStreamOverflow.BLOCK
+
+    await client._async_parse_payload(get_event_payload(ws_message_event, 1))
+    task = asyncio.create_task(
+        client._async_parse_payload(get_event_payload(ws_message_event, 2))
+    )
+    await asyncio.sleep(0)
+    assert not task.done()
+
+    assert (await stream.__anext__()).info == "Event 1"
+    await asyncio.sleep(0)
+    assert task.done()
+    assert (await stream.__anext__()).info == "Event 2"
+
+    # Closing the stream unblocks the listener:
+    await client._async_parse_payload(get_event_payload(ws_message_event, 3))
+    task = asyncio.create_task(
+        client._async_parse_payload(get_event_payload(ws_message_event, 4))
+    )
+    await asyncio.sleep(0)
+    assert not task.done()
+    stream.close()
+    await asyncio.sleep(0)
+    assert task.done()
+    assert [event async for event in stream] == []
+    assert stream.stats.dropped == 0
+
+    # Closing the stream again is a no-op:
+    stream.close()
+    assert [event async for event in stream] == []
+
+
+@pytest.mark.asyncio
+async def test_event_stream_drop_oldest(
+    mock_api: Mock, ws_message_event: dict[str, Any]
+) -> None:
+    """Test an event stream that drops the oldest event when its queue is full.
+
+    Args:
+        mock_api: A mocked API client.
+        ws_message_event: A websocket event payload.
+    """
+    client = WebsocketClient(mock_api)
+    mock_event_callback = Mock()
+    client.add_event_callback(mock_event_callback)
+
+    async with client.events(maxsize=2) as stream:
+        other_stream = client.events(maxsize=5)
+        for event_id in range(1, 4):
+            await client._async_parse_payload(
+                get_event_payload(ws_message_event, event_id)
+            )
+
+        assert mock_event_callback.call_count == 3
+        assert stream.stats.lag == 2
+        assert stream.stats.dropped == 1
+
+        events = [await stream.__anext__(), await stream.__anext__()]
+        assert [event.info for event in events] == ["Event 2", "Event 3"]
+        assert stream.stats.delivered == 2
+        assert stream.stats.lag == 0
+        assert stream.stats.max_lag == 2
+
+        assert (await other_stream.__anext__()).info == "Event 1"
+        assert other_stream.stats.lag == 2
+        assert other_stream.stats.dropped == 0
+
+    assert stream.closed
+    assert list(client._event_streams) == [other_stream]
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+
+    # A consumer waiting for an event stops when the stream is closed:
+    assert [(await other_stream.__anext__()).info for _ in range(2)] == [
+        "Event 2",
+        "Event 3",
+    ]
+    task = asyncio.create_task(other_stream.__anext__())
+    await asyncio.sleep(0)
+    other_stream.close()
+    with pytest.raises(StopAsyncIteration):
+        await task
+    assert len(client._event_streams) == 0
+
+
+@pytest.mark.asyncio
+async def test_event_stream_error(
+    mock_api: Mock, ws_message_event: dict[str, Any]
+) -> None:
+    """Test an event stream that errors when its consumer falls too far behind.
+
+    Args:
+        mock_api: A mocked API client.
+        ws_message_event: A websocket event payload.
+    """
+    client = WebsocketClient(mock_api)
+    stream = client.events(maxsize=1, overflow=EventStreamOverflow.ERROR)
+
+    for event_id in range(1, 4):
+        await client._async_parse_payload(get_event_payload(ws_message_event, event_id))
+    assert stream.stats.dropped == 1
+
+    with pytest.raises(EventStreamOverflowError):
+        async for _ in stream:
+            pass
+
+    assert stream.closed
+    assert len(client._event_streams) == 0
+
+
+@pytest.mark.asyncio
+async def test_filtered_subscriptions(
+    mock_api: Mock, ws_message_event: dict[str, Any]
+) -> None:
+    """Test that filtered callbacks and streams only receive matching events.
+
+    Args:
+        mock_api: A mocked API client.
+        ws_message_event: A websocket event payload.
+    """
+    client = WebsocketClient(mock_api)
+    mock_disarm_callback = Mock()
+    mock_other_system_callback = Mock()
+    client.add_event_callback(
+        mock_disarm_callback, EventFilter(event_types=EVENT_DISARMED_BY_KEYPAD)
+    )
+    client.add_event_callback(
+        mock_other_system_callback, EventFilter(system_ids=[23456])
+    )
+    stream = client.events(
+        event_filter=EventFilter(sensor_types=DeviceTypes.KEYPAD, system_ids=12345)
+    )
+
+    await client._async_parse_payload(get_event_payload(ws_message_event, 1))
+    payload = get_event_payload(ws_message_event, 2)
+    payload["data"]["sid"] = 23456
+    await client._async_parse_payload(payload)
+
+    assert mock_disarm_callback.call_count == 2
+    assert mock_other_system_callback.call_count == 1
+    assert mock_other_system_callback.call_args.args[0].system_id == 23456
+    assert stream.stats.lag == 1
+    assert (await stream.__anext__()).info == "Event 1"
+
+
 @pytest.mark.asyncio
 async def test_listen_invalid_message_data(
     mock_api: Mock, ws_message_event: dict[str, Any], ws_messages: deque
@@ -195,7 +531,7 @@ async def test_listen_invalid_message_data(
     assert client.connected
 
     ws_message = create_ws_message(ws_message_event)
-    ws_message.json.side_effect = ValueError("Boom")
+    ws_message.data = "{Boom"
     ws_messages.append(ws_message)
 
     with pytest.raises(InvalidMessageError):
@@ -310,6 +646,114 @@ async def test_reconnect(mock_api: Mock) -> None:
     await client.async_reconnect()
 
 
+def test_reconnect_policy() -> None:
+    """Test that reconnect delays back off exponentially (with full jitter)."""
+    policy = ReconnectPolicy(base_delay=1.0, max_delay=10.0)
+
+    with patch("random.uniform", side_effect=lambda _, high: high):
+        assert [policy.get_delay(failures) for failures in range(1, 6)] == [
+            1.0,
+            2.0,
+            4.0,
+            8.0,
+            10.0,
+        ]
+
+    assert all(0 <= policy.get_delay(3) <= 4.0 for _ in range(100))
+
+
+@pytest.mark.asyncio
+async def test_run(mock_api: Mock) -> None:
+    """Test supervising the websocket connection.
+
+    Args:
+        mock_api: A mocked API client.
+    """
+    client = WebsocketClient(mock_api)
+    listened = asyncio.Event()
+
+    async def async_listen() -> None:
+        """Define a listener whose connection drops right away."""
+        listened.set()
+
+    with (
+        patch.object(
+            client,
+            "async_connect",
+            AsyncMock(side_effect=[CannotConnectError, RuntimeError("Down"), None]),
+        ) as mock_connect,
+        patch.object(
+            client, "async_listen", AsyncMock(side_effect=async_listen)
+        ) as mock_listen,
+        patch.object(client, "async_disconnect", AsyncMock()) as mock_disconnect,
+    ):
+        task = asyncio.create_task(
+            client.async_run(policy=ReconnectPolicy(base_delay=0.01, max_delay=0.01))
+        )
+        await listened.wait()
+        await asyncio.sleep(0)
+
+        assert mock_connect.await_count == 3
+        assert mock_listen.await_count == 1
+        assert client.health.connects == 1
+        assert client.health.failures == 3
+        assert client.health.last_error == "Down"
+        # Collect the states to compare at the end, so that mypy doesn't narrow the
+        # state across the cancellation that changes it:
+        states = [client.health.state]
+
+        # The watchdog only drops a supervised connection (and lets the supervisor
+        # reconnect):
+        await client.async_reconnect()
+        assert mock_connect.await_count == 3
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    states.append(client.health.state)
+    assert states == [WebsocketState.BACKING_OFF, WebsocketState.STOPPED]
+    assert mock_disconnect.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_run_stable_connection(mock_api: Mock) -> None:
+    """Test that a stable connection resets the supervisor's backoff.
+
+    Args:
+        mock_api: A mocked API client.
+    """
+    client = WebsocketClient(mock_api)
+    client.health.failures = 5
+    connected = asyncio.Event()
+
+    async def async_listen() -> None:
+        """Define a listener that stays connected for a while."""
+        connected.set()
+        await asyncio.sleep(0.02)
+
+    with (
+        patch.object(client, "async_connect", AsyncMock()),
+        patch.object(client, "async_listen", AsyncMock(side_effect=async_listen)),
+        patch.object(client, "async_disconnect", AsyncMock()),
+    ):
+        task = asyncio.create_task(
+            client.async_run(policy=ReconnectPolicy(base_delay=10, stable_after=0.01))
+        )
+        await connected.wait()
+        states = [client.health.state]
+        assert client.health.connected_since is not None
+
+        await asyncio.sleep(0.03)
+        states.append(client.health.state)
+        assert states == [WebsocketState.CONNECTED, WebsocketState.BACKING_OFF]
+        assert client.health.failures == 1
+
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
 @pytest.mark.asyncio
 async def test_remove_callback_callback(mock_api: Mock) -> None:
     """Test that a removed callback doesn't get executed.
@@ -320,7 +764,24 @@ async def test_remove_callback_callback(mock_api: Mock) -> None:
     mock_callback = Mock()
     client = WebsocketClient(mock_api)
     remove = client.add_connect_callback(mock_callback)
-    remove()
+    client.callback_executor.execute(mock_callback)
+    assert mock_callback in client.callback_executor.stats
+    with patch.object(
+        client.callback_executor,
+        "forget",
+        Mock(wraps=client.callback_executor.forget),
+    ) as mock_forget:
+        remove()
+        mock_forget.assert_called_once_with(mock_callback)
+    assert mock_callback not in client.callback_executor.stats
+    mock_callback.reset_mock()
+
+    # Removing an event callback forgets it, too:
+    mock_event_callback = Mock()
+    remove_event_callback = client.add_event_callback(mock_event_callback)
+    client.callback_executor.execute(mock_event_callback)
+    remove_event_callback()
+    assert mock_event_callback not in client.callback_executor.stats
 
     await client.async_connect()
     assert client.connected
@@ -444,3 +905,47 @@ async def test_watchdog_sync_trigger(caplog: Mock) -> None:
     await asyncio.sleep(1)
     assert any("Websocket watchdog expired" in e.message for e in caplog.records)
     assert mock_trigger.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_reauthenticate(mock_api: Mock, ws_client: AsyncMock) -> None:
+    """Test re-identifying to the websocket server with a new access token.
+
+    Args:
+        mock_api: A mocked API client.
+        ws_client: A mocked websocket client.
+    """
+    client = WebsocketClient(mock_api)
+
+    await client.async_connect()
+    assert client.connected
+
+    mock_api.access_token = "67890"  # noqa: S105
+    await client.async_reauthenticate()
+    assert client.connected
+
+    payload = ws_client.send_json.call_args[0][0]
+    assert payload["type"] == "com.simplisafe.connection.identify"
+    assert payload["data"]["auth"]["token"] == "67890"  # noqa: S105
+
+
+@pytest.mark.asyncio
+async def test_connect_timeout(mock_api: Mock, ws_client_session: AsyncMock) -> None:
+    """Test giving up on a websocket connection that takes too long.
+
+    Args:
+        mock_api: A mocked API client.
+        ws_client_session: A mocked websocket client session.
+    """
+
+    async def hung_connect(*_: Any, **__: Any) -> None:
+        """Never finish connecting."""
+        await asyncio.sleep(10)
+
+    ws_client_session.ws_connect.side_effect = hung_connect
+    client = WebsocketClient(mock_api)
+
+    with pytest.raises(CannotConnectError):
+        await client.async_connect(timeout=0.1)
+
+    assert not client.connected